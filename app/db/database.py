@@ -13,9 +13,84 @@ logger = logging.getLogger(__name__)
 DB_PATH = Path(__file__).resolve().parent / "news.db"
 
 
+# Límite conservador de parámetros por sentencia (SQLITE_MAX_VARIABLE_NUMBER)
+_MAX_SQL_PARAMS = 900
+
+
+def _chunks(items: list, size: int = _MAX_SQL_PARAMS):
+    """Divide una lista en bloques de tamaño fijo."""
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+class NameIdCache:
+    """
+    Cache nombre -> id para una tabla de nombres (keywords o topics).
+
+    Se carga completa una sola vez por conexión. Los nombres nuevos se
+    insertan y resuelven en bloque; si la transacción se revierte hay que
+    llamar a descartar() para olvidar los ids que ya no existen.
+    """
+
+    def __init__(self, cursor, tabla: str):
+        self.tabla = tabla
+        cursor.execute(f"SELECT name, id FROM {tabla}")
+        self.ids = {row[0]: row[1] for row in cursor.fetchall()}
+        self._pendientes = []
+
+    def resolver(self, cursor, nombres: List[str]) -> dict:
+        """Retorna un dict nombre -> id, insertando los nombres que falten."""
+        nuevos = [n for n in dict.fromkeys(nombres) if n not in self.ids]
+        if nuevos:
+            cursor.executemany(
+                f"INSERT OR IGNORE INTO {self.tabla} (name) VALUES (?)",
+                [(nombre,) for nombre in nuevos]
+            )
+            for chunk in _chunks(nuevos):
+                placeholders = ",".join("?" * len(chunk))
+                cursor.execute(f"SELECT name, id FROM {self.tabla} WHERE name IN ({placeholders})", chunk)
+                self.ids.update({row[0]: row[1] for row in cursor.fetchall()})
+            self._pendientes.extend(nuevos)
+        return self.ids
+
+    def confirmar(self):
+        """Marca los nombres nuevos como persistidos."""
+        self._pendientes.clear()
+
+    def descartar(self):
+        """Olvida los nombres insertados desde el último confirmar()."""
+        for nombre in self._pendientes:
+            self.ids.pop(nombre, None)
+        self._pendientes.clear()
+
+
+class NewsConnection(sqlite3.Connection):
+    """Conexión SQLite que mantiene las caches de ids de keywords y topics."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._name_caches = {}
+
+    def name_cache(self, tabla: str) -> NameIdCache:
+        """Retorna (cargándola si hace falta) la cache de una tabla de nombres."""
+        if tabla not in self._name_caches:
+            self._name_caches[tabla] = NameIdCache(self.cursor(), tabla)
+        return self._name_caches[tabla]
+
+    def confirmar_caches(self):
+        """Confirma los nombres nuevos de todas las caches (tras commit/release)."""
+        for cache in self._name_caches.values():
+            cache.confirmar()
+
+    def descartar_caches(self):
+        """Descarta los nombres nuevos de todas las caches (tras rollback)."""
+        for cache in self._name_caches.values():
+            cache.descartar()
+
+
 def get_connection():
     """Obtiene una conexión a la base de datos."""
-    conn = sqlite3.connect(str(DB_PATH))
+    conn = sqlite3.connect(str(DB_PATH), factory=NewsConnection)
     conn.row_factory = sqlite3.Row  # Para acceder a columnas por nombre
     conn.execute("PRAGMA foreign_keys = ON")  # Habilitar foreign keys
     return conn
@@ -46,10 +121,17 @@ def init_database():
         ai_sentiment_score REAL,
         ai_sentiment_confidence REAL,
         ai_tone TEXT,
-        ai_main_topic TEXT
+        ai_main_topic TEXT,
+        
+        cluster_id TEXT
     )
     """)
     
+    # Columnas agregadas después de la versión inicial (BDs existentes)
+    columnas = {row[1] for row in cursor.execute("PRAGMA table_info(news)")}
+    if 'cluster_id' not in columnas:
+        cursor.execute("ALTER TABLE news ADD COLUMN cluster_id TEXT")
+    
     # Tabla de keywords
     cursor.execute("""
     CREATE TABLE IF NOT EXISTS keywords (
@@ -117,6 +199,7 @@ def init_database():
     # cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_actors_actor ON news_actors(actor_id)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_source ON news(source)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_published ON news(published_at)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_news_cluster ON news(cluster_id)")
 
     # Poblar tabla de topics con los permitidos
     from config.settings import get_allowed_topics
@@ -130,26 +213,43 @@ def init_database():
     logger.info("Base de datos inicializada correctamente")
 
 
+def _insert_relaciones(cursor, tabla_nombres: str, tabla_relacion: str,
+                       columna: str, relaciones: List[tuple]):
+    """
+    Inserta relaciones muchos a muchos resolviendo los ids con la cache
+    de la conexión y un único executemany.
+
+    Args:
+        cursor: Cursor activo
+        tabla_nombres: Tabla de nombres ('keywords' o 'topics')
+        tabla_relacion: Tabla de relación ('news_keywords' o 'news_topics')
+        columna: Columna FK en la tabla de relación ('keyword_id' o 'topic_id')
+        relaciones: Lista de tuplas (news_id, nombre)
+    """
+    if not relaciones:
+        return
+    cache = cursor.connection.name_cache(tabla_nombres)
+    ids = cache.resolver(cursor, [nombre for _, nombre in relaciones])
+    cursor.executemany(
+        f"INSERT OR IGNORE INTO {tabla_relacion} (news_id, {columna}) VALUES (?, ?)",
+        [(news_id, ids[nombre]) for news_id, nombre in relaciones]
+    )
+
+
 def _insert_keywords(cursor, news_id: int, keywords: List[str]):
     """Inserta keywords y sus relaciones con la noticia."""
     if not keywords:
         return
-    for keyword in keywords:
-        cursor.execute("INSERT OR IGNORE INTO keywords (name) VALUES (?)", (keyword,))
-        cursor.execute("SELECT id FROM keywords WHERE name = ?", (keyword,))
-        keyword_id = cursor.fetchone()[0]
-        cursor.execute("INSERT OR IGNORE INTO news_keywords (news_id, keyword_id) VALUES (?, ?)", (news_id, keyword_id))
+    _insert_relaciones(cursor, 'keywords', 'news_keywords', 'keyword_id',
+                       [(news_id, keyword) for keyword in keywords])
 
 
 def _insert_topics(cursor, news_id: int, topics: List[str]):
     """Inserta topics y sus relaciones con la noticia."""
     if not topics:
         return
-    for topic in topics:
-        cursor.execute("INSERT OR IGNORE INTO topics (name) VALUES (?)", (topic,))
-        cursor.execute("SELECT id FROM topics WHERE name = ?", (topic,))
-        topic_id = cursor.fetchone()[0]
-        cursor.execute("INSERT OR IGNORE INTO news_topics (news_id, topic_id) VALUES (?, ?)", (news_id, topic_id))
+    _insert_relaciones(cursor, 'topics', 'news_topics', 'topic_id',
+                       [(news_id, topic) for topic in topics])
 
 
 # def _insert_actors(cursor, news_id: int, actors: dict):
@@ -163,6 +263,37 @@ def _insert_topics(cursor, news_id: int, topics: List[str]):
     #     cursor.execute("INSERT OR IGNORE INTO news_actors (news_id, actor_id, role) VALUES (?, ?, ?)", (news_id, actor_id, role))
 
 
+def _news_row(noticia: Noticia) -> tuple:
+    """Convierte una noticia en la tupla de valores para la tabla news."""
+    return (
+        noticia.url,
+        noticia.source,
+        noticia.title,
+        noticia.subtitle,
+        noticia.body,
+        noticia.published_at.isoformat() if noticia.published_at else None,
+        noticia.scraped_at.isoformat(),
+        noticia.ai_relevance_score,
+        1 if noticia.ai_decision else (0 if noticia.ai_decision is not None else None),
+        noticia.ai_reasoning,
+        noticia.ai_sentiment,
+        noticia.ai_sentiment_score,
+        noticia.ai_sentiment_confidence,
+        noticia.ai_tone,
+        noticia.ai_main_topic,
+        noticia.cluster_id
+    )
+
+
+INSERT_NEWS_SQL = """
+INSERT INTO news (url, source, title, subtitle, body, published_at, scraped_at,
+                 ai_relevance_score, ai_decision, ai_reasoning,
+                 ai_sentiment, ai_sentiment_score, ai_sentiment_confidence,
+                 ai_tone, ai_main_topic, cluster_id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 def insert_noticia(noticia: Noticia) -> bool:
     """
     Inserta una noticia en la base de datos con todas sus relaciones.
@@ -173,29 +304,7 @@ def insert_noticia(noticia: Noticia) -> bool:
         cursor = conn.cursor()
         
         # Insertar noticia principal
-        cursor.execute("""
-        INSERT INTO news (url, source, title, subtitle, body, published_at, scraped_at,
-                         ai_relevance_score, ai_decision, ai_reasoning,
-                         ai_sentiment, ai_sentiment_score, ai_sentiment_confidence,
-                         ai_tone, ai_main_topic)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            noticia.url,
-            noticia.source,
-            noticia.title,
-            noticia.subtitle,
-            noticia.body,
-            noticia.published_at.isoformat() if noticia.published_at else None,
-            noticia.scraped_at.isoformat(),
-            noticia.ai_relevance_score,
-            1 if noticia.ai_decision else (0 if noticia.ai_decision is not None else None),
-            noticia.ai_reasoning,
-            noticia.ai_sentiment,
-            noticia.ai_sentiment_score,
-            noticia.ai_sentiment_confidence,
-            noticia.ai_tone,
-            noticia.ai_main_topic
-        ))
+        cursor.execute(INSERT_NEWS_SQL, _news_row(noticia))
         
         news_id = cursor.lastrowid
         
@@ -216,67 +325,129 @@ def insert_noticia(noticia: Noticia) -> bool:
         return False
 
 
+def _get_ids_por_url(cursor, urls: List[str]) -> dict:
+    """Retorna un dict url -> id para las URLs que existen en la tabla news."""
+    ids = {}
+    for chunk in _chunks(urls):
+        placeholders = ",".join("?" * len(chunk))
+        cursor.execute(f"SELECT id, url FROM news WHERE url IN ({placeholders})", chunk)
+        ids.update({row[1]: row[0] for row in cursor.fetchall()})
+    return ids
+
+
+def _insert_lote(cursor, noticias: List[Noticia]):
+    """
+    Inserta un lote completo con executemany (camino rápido).
+    Lanza excepción si alguna fila falla; el llamador debe hacer rollback.
+    """
+    cursor.executemany(INSERT_NEWS_SQL, [_news_row(n) for n in noticias])
+    ids = _get_ids_por_url(cursor, [n.url for n in noticias])
+
+    keywords = [(ids[n.url], k) for n in noticias for k in (n.ai_keywords_found or [])]
+    topics = [(ids[n.url], t) for n in noticias for t in (n.ai_topics or [])]
+    _insert_relaciones(cursor, 'keywords', 'news_keywords', 'keyword_id', keywords)
+    _insert_relaciones(cursor, 'topics', 'news_topics', 'topic_id', topics)
+
+
 def insert_noticias_bulk(noticias: List[Noticia]) -> dict:
     """
     Inserta múltiples noticias en la base de datos con sus relaciones.
+
+    Todo el lote se escribe en una sola transacción (un único commit).
+    Primero se descartan las URLs que ya existen en la BD o se repiten en
+    el lote, y el resto se inserta con executemany. Si el lote falla, se
+    reintenta fila por fila con un SAVEPOINT por noticia, de modo que una
+    fila inválida no deshace las demás.
     
     Returns:
         dict con estadísticas: {'insertadas': int, 'duplicadas': int, 'errores': int}
     """
     stats = {'insertadas': 0, 'duplicadas': 0, 'errores': 0}
+    if not noticias:
+        return stats
     
     conn = get_connection()
+    conn.isolation_level = None  # Control manual de transacciones
     cursor = conn.cursor()
     
-    for i, noticia in enumerate(noticias, 1):
+    try:
+        cursor.execute("BEGIN")
+        
+        # Descartar duplicadas (ya en BD o repetidas dentro del lote)
+        existentes = _get_ids_por_url(cursor, [n.url for n in noticias])
+        pendientes = []
+        urls_lote = set()
+        for i, noticia in enumerate(noticias, 1):
+            if noticia.url in existentes or noticia.url in urls_lote:
+                stats['duplicadas'] += 1
+                logger.debug(f"[{i}/{len(noticias)}] Duplicada: {noticia.url}")
+                continue
+            urls_lote.add(noticia.url)
+            pendientes.append(noticia)
+        
+        # Camino rápido: todo el lote con executemany
+        cursor.execute("SAVEPOINT lote")
         try:
-            # Insertar noticia principal
-            cursor.execute("""
-            INSERT INTO news (url, source, title, subtitle, body, published_at, scraped_at,
-                             ai_relevance_score, ai_decision, ai_reasoning,
-                             ai_sentiment, ai_sentiment_score, ai_sentiment_confidence,
-                             ai_tone, ai_main_topic)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                noticia.url,
-                noticia.source,
-                noticia.title,
-                noticia.subtitle,
-                noticia.body,
-                noticia.published_at.isoformat() if noticia.published_at else None,
-                noticia.scraped_at.isoformat(),
-                noticia.ai_relevance_score,
-                1 if noticia.ai_decision else (0 if noticia.ai_decision is not None else None),
-                noticia.ai_reasoning,
-                noticia.ai_sentiment,
-                noticia.ai_sentiment_score,
-                noticia.ai_sentiment_confidence,
-                noticia.ai_tone,
-                noticia.ai_main_topic
-            ))
-            
-            news_id = cursor.lastrowid
-            
-            # Insertar relaciones
-            _insert_keywords(cursor, news_id, noticia.ai_keywords_found)
-            _insert_topics(cursor, news_id, noticia.ai_topics)
-            # _insert_actors(cursor, news_id, noticia.ai_actors)
-            
-            conn.commit()
-            stats['insertadas'] += 1
-            
-        except sqlite3.IntegrityError:
-            stats['duplicadas'] += 1
-            logger.debug(f"[{i}/{len(noticias)}] Duplicada: {noticia.url}")
+            _insert_lote(cursor, pendientes)
+            cursor.execute("RELEASE lote")
+            conn.confirmar_caches()
+            stats['insertadas'] += len(pendientes)
         except Exception as e:
-            stats['errores'] += 1
-            logger.error(f"[{i}/{len(noticias)}] Error al insertar {noticia.url}: {e}")
-    
-    conn.close()
+            cursor.execute("ROLLBACK TO lote")
+            cursor.execute("RELEASE lote")
+            conn.descartar_caches()
+            logger.debug(f"Lote falló ({e}), reintentando fila por fila")
+            
+            # Camino lento: una noticia por SAVEPOINT
+            for i, noticia in enumerate(pendientes, 1):
+                cursor.execute("SAVEPOINT fila")
+                try:
+                    _insert_lote(cursor, [noticia])
+                    cursor.execute("RELEASE fila")
+                    conn.confirmar_caches()
+                    stats['insertadas'] += 1
+                except sqlite3.IntegrityError:
+                    cursor.execute("ROLLBACK TO fila")
+                    cursor.execute("RELEASE fila")
+                    conn.descartar_caches()
+                    stats['duplicadas'] += 1
+                    logger.debug(f"[{i}/{len(pendientes)}] Duplicada: {noticia.url}")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO fila")
+                    cursor.execute("RELEASE fila")
+                    conn.descartar_caches()
+                    stats['errores'] += 1
+                    logger.error(f"[{i}/{len(pendientes)}] Error al insertar {noticia.url}: {e}")
+        
+        cursor.execute("COMMIT")
+    except Exception as e:
+        if conn.in_transaction:
+            cursor.execute("ROLLBACK")
+        logger.error(f"Error en la transacción de inserción: {e}")
+        stats['errores'] += stats['insertadas']
+        stats['insertadas'] = 0
+    finally:
+        conn.close()
     
     return stats
 
 
+def get_urls_existentes(urls: List[str]) -> set:
+    """
+    Retorna el subconjunto de URLs que ya están guardadas en la tabla news.
+
+    Usa una consulta IN por bloque contra el índice único de news.url, de
+    modo que el costo es una sola ida a la BD por cada 900 URLs.
+    """
+    if not urls:
+        return set()
+    conn = get_connection()
+    try:
+        return set(_get_ids_por_url(conn.cursor(), list(dict.fromkeys(urls))))
+    finally:
+        conn.close()
+
+
 def get_noticias_count() -> int:
     """Retorna el número total de noticias en la base de datos."""
     conn = get_connection()
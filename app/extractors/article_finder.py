@@ -2,11 +2,181 @@
 Extractor de artículos desde páginas de portada.
 """
 import re
+from functools import lru_cache
 from urllib.parse import urljoin, urlparse
 from bs4 import BeautifulSoup
+from app.extractors.front_page_scanner import FrontPageScanner
 from config.settings import get_article_selectors, get_validation_config, get_url_patterns
 
 
+# Partes del path que indican que la URL no es un artículo (categorías,
+# tags, archivos, páginas institucionales, etc.)
+EXCLUDED_PATH_PATTERNS = [
+    '/category/', '/tag/', '/author/', '/page/', '/secciones/',
+    '/wp-content/', '/wp-admin/', '/feed/',
+    '/#', '/search', '/contacto', '/quienes-somos',
+    '/politica-de-privacidad', '/terminos',
+]
+
+_EXCLUIDOS = re.compile('|'.join(map(re.escape, EXCLUDED_PATH_PATTERNS)))
+
+# URLs que son solo fechas (ej: /2025/12/20/)
+_SOLO_FECHA = re.compile(r'^/\d{4}/\d{2}/\d{2}/?$')
+
+
+def _normalizar_dominio(domain: str) -> str:
+    """Normaliza un dominio quitando 'www.' si existe."""
+    return domain.lower().removeprefix('www.')
+
+
+@lru_cache(maxsize=8192)
+def _resolver_url(base: str, href: str) -> tuple[str, str, str]:
+    """
+    Resuelve un href contra la URL base (urljoin + un solo urlparse).
+
+    Las portadas repiten el mismo href varias veces (imagen, titular,
+    "leer más"), así que el resultado se cachea.
+
+    Returns:
+        Tupla (URL completa, dominio normalizado, path en minúsculas)
+    """
+    url_completa = urljoin(base, href)
+    partes = urlparse(url_completa)
+    return url_completa, _normalizar_dominio(partes.netloc), partes.path.lower()
+
+
+class UrlValidator:
+    """
+    Validador de URLs de artículos de un diario: el dominio se normaliza
+    una sola vez y las exclusiones se evalúan con regex precompiladas.
+    """
+
+    def __init__(self, source_url: str):
+        """
+        Inicializa el validador.
+
+        Args:
+            source_url: URL base del diario (para resolver URLs relativas
+                        y comparar dominios)
+        """
+        self.source_url = source_url
+        self.source_domain = _normalizar_dominio(urlparse(source_url).netloc)
+
+    def validar(self, href: str) -> str | None:
+        """
+        Valida y normaliza una URL de artículo.
+
+        Args:
+            href: URL o path relativo del enlace
+
+        Returns:
+            URL completa o None si no es válida
+        """
+        url_completa, news_domain, path = _resolver_url(self.source_url, href)
+
+        # Validaciones básicas
+        if '{{' in url_completa:  # Template no procesado
+            return None
+
+        # Comparar dominios normalizados (ignorar www)
+        if news_domain != self.source_domain:
+            return None
+
+        # Excluir páginas de categorías, archivos por fecha, tags, etc.
+        if _EXCLUIDOS.search(path) or _SOLO_FECHA.match(path):
+            return None
+
+        # Excluir la página principal y URLs muy cortas (probablemente no
+        # son artículos)
+        if len(path) < 5:
+            return None
+
+        return url_completa
+
+
+class SelectorMatcher:
+    """
+    Reglas (tag, parte de clase) compiladas para evaluarlas todas en un
+    solo recorrido del árbol.
+
+    Un elemento cumple una regla si su tag coincide y el texto de la
+    regla aparece en sus clases unidas por espacios (el mismo criterio
+    que el find_all con lambda que se usaba por selector).
+    """
+
+    def __init__(self, selectores: list[tuple[str, str]]):
+        """
+        Compila los selectores.
+
+        Args:
+            selectores: Lista de (tag, parte de clase) en orden de prioridad
+        """
+        self.selectores = list(selectores)
+        self._reglas = {}  # tag -> [(prioridad, parte de clase)]
+        for prioridad, (tag, class_name) in enumerate(self.selectores):
+            self._reglas.setdefault(tag, []).append((prioridad, class_name))
+        self.tags = list(self._reglas)
+        # Descarte rápido: una sola búsqueda en C para saber si alguna
+        # regla puede cumplirse antes de probarlas de a una
+        partes = sorted({class_name for _, class_name in self.selectores}, key=len, reverse=True)
+        self._alguna = re.compile('|'.join(map(re.escape, partes))) if partes else None
+
+    def buscar(self, soup: BeautifulSoup, incluir: str = None) -> list:
+        """
+        Recorre el árbol una vez y agrupa los elementos por regla.
+
+        Args:
+            soup: Árbol donde buscar
+            incluir: Tag cuyos elementos se juntan aparte, antes de las
+                     reglas (ej: 'article'), o None
+
+        Returns:
+            Lista con una lista de elementos por regla (en el orden de los
+            selectores, cada una en orden de documento), precedida por la
+            de `incluir` si se pidió
+        """
+        grupos = [[] for _ in self.selectores]
+        incluidos = []
+        tags = self.tags + [incluir] if incluir and incluir not in self._reglas else self.tags
+
+        for elem in soup.find_all(tags):
+            if elem.name == incluir:
+                incluidos.append(elem)
+            for prioridad in self.reglas_cumplidas(elem.name, elem.get('class')):
+                grupos[prioridad].append(elem)
+
+        return [incluidos] + grupos if incluir else grupos
+
+    def reglas_cumplidas(self, tag: str, clases) -> list[int]:
+        """
+        Reglas que cumple un elemento.
+
+        Args:
+            tag: Nombre del tag
+            clases: Atributo class (lista, como lo deja BeautifulSoup, o string)
+
+        Returns:
+            Prioridades de las reglas cumplidas (en orden)
+        """
+        reglas = self._reglas.get(tag)
+        if not reglas or not clases:
+            return []
+        if not isinstance(clases, str):
+            clases = ' '.join(clases)
+        if self._alguna is None or not self._alguna.search(clases):
+            return []
+        return [prioridad for prioridad, class_name in reglas if class_name in clases]
+
+
+def _agregar_enlace(enlaces: dict[str, str], url: str, texto: str, title: str | None):
+    """Agrega el texto de un enlace a su URL (juntándolo si ya estaba)."""
+    texto = ' '.join(filter(None, [texto, title]))
+    if url not in enlaces:
+        enlaces[url] = texto
+    elif texto:
+        enlaces[url] = f"{enlaces[url]} {texto}"
+
+
 class ArticleFinder:
     """
     Clase para encontrar y extraer URLs de artículos desde una portada.
@@ -16,7 +186,11 @@ class ArticleFinder:
     def __init__(self):
         """Inicializa el finder con la configuración."""
         self.article_selectors = get_article_selectors()
+        self.selector_matcher = SelectorMatcher(self.article_selectors)
         self.url_patterns = get_url_patterns()
+        # Todos los patrones en una sola búsqueda (misma semántica que
+        # `pattern in href.lower()` para cada uno)
+        self._url_pattern_re = re.compile('|'.join(map(re.escape, self.url_patterns))) if self.url_patterns else None
         self.config = get_validation_config()
     
     def encontrar_articulos(self, soup: BeautifulSoup) -> list:
@@ -30,23 +204,32 @@ class ArticleFinder:
         Returns:
             Lista de elementos BeautifulSoup que representan artículos
         """
+        # Un solo recorrido del árbol: primero todos los <article>
+        # (prioridad 1) y después lo que cumple cada selector, en el orden
+        # de ARTICLE_SELECTORS (prioridad 2, incluso si ya hay articles)
+        return self._combinar_contenedores(
+            self.selector_matcher.buscar(soup, incluir='article'),
+            lambda min_articles: self._buscar_por_url_patterns(soup, min_articles)
+        )
+    
+    def _combinar_contenedores(self, grupos: list, buscar_por_url) -> list:
+        """
+        Junta los contenedores de cada grupo (sin repetir) y, si no alcanzan,
+        agrega los del fallback por patrones de URL.
+        
+        Args:
+            grupos: Listas de contenedores en orden de prioridad
+            buscar_por_url: Función (min_articles) -> contenedores del fallback
+            
+        Returns:
+            Lista de contenedores, o vacía si no se llega al mínimo
+        """
         min_articles = self.config['min_articles_found']
         all_articles = []
         found_elements = set()  # Para evitar duplicados
         
-        # Prioridad 1: buscar todos los <article>
-        articles = soup.find_all('article')
-        for art in articles:
-            article_id = id(art)
-            if article_id not in found_elements:
-                all_articles.append(art)
-                found_elements.add(article_id)
-        
-        # Prioridad 2: Buscar por selectores específicos (incluso si ya encontramos articles)
-        for tag, class_name in self.article_selectors:
-            # Buscar clases que contengan el texto (coincidencia parcial)
-            found = soup.find_all(tag, class_=lambda x: x and class_name in ' '.join(x) if isinstance(x, list) else class_name in str(x))
-            for elem in found:
+        for grupo in grupos:
+            for elem in grupo:
                 elem_id = id(elem)
                 if elem_id not in found_elements:
                     all_articles.append(elem)
@@ -57,7 +240,7 @@ class ArticleFinder:
             return all_articles
         
         # Fallback: buscar por patrones de URL
-        url_articles = self._buscar_por_url_patterns(soup, min_articles)
+        url_articles = buscar_por_url(min_articles)
         for elem in url_articles:
             elem_id = id(elem)
             if elem_id not in found_elements:
@@ -77,15 +260,20 @@ class ArticleFinder:
         Returns:
             Lista de contenedores de artículos
         """
+        if self._url_pattern_re is None:
+            return []
+        
         all_links = soup.find_all('a', href=True)
         article_containers = []
+        vistos = set()  # ids de los contenedores ya agregados
         
         for link in all_links:
             href = link.get('href', '')
-            if any(pattern in href.lower() for pattern in self.url_patterns):
+            if self._url_pattern_re.search(href.lower()):
                 parent = link.find_parent(['article', 'div', 'li'])
-                if parent and parent not in article_containers:
+                if parent and id(parent) not in vistos:
                     article_containers.append(parent)
+                    vistos.add(id(parent))
         
         return article_containers if len(article_containers) > min_articles else []
     
@@ -102,94 +290,92 @@ class ArticleFinder:
         Returns:
             Lista de URLs únicas de artículos
         """
-        urls_procesadas = set()
-        urls_noticias = []
-        source_domain = urlparse(source_url).netloc
+        return list(self.extraer_enlaces(articles, source_url))
+    
+    def extraer_enlaces(self, articles: list, source_url: str) -> dict[str, str]:
+        """
+        Extrae las URLs de los artículos junto con el texto de sus enlaces.
+        
+        Mismo criterio y orden que extraer_urls(); si una URL aparece en
+        varios enlaces (ej: imagen y titular) se juntan sus textos.
+        
+        Args:
+            articles: Lista de elementos de artículo
+            source_url: URL base del diario
+            
+        Returns:
+            Dict URL -> texto de sus enlaces (incluye el atributo title)
+        """
+        enlaces = {}
+        validador = UrlValidator(source_url)
+        
+        def agregar(link):
+            url = validador.validar(link['href'])
+            if url:
+                _agregar_enlace(enlaces, url, link.get_text(' ', strip=True), link.get('title'))
         
         for article in articles:
             # Método 1: Buscar TODOS los enlaces dentro del contenedor
             links = article.find_all('a', href=True)
             for link in links:
-                url = self._validar_url(link['href'], source_url, source_domain)
-                if url and url not in urls_procesadas:
-                    urls_procesadas.add(url)
-                    urls_noticias.append(url)
+                agregar(link)
             
             # Método 2: Si no hay enlaces dentro, buscar en ancestros cercanos
             if not links:
                 # Verificar si el parent es un <a>
                 parent = article.parent
                 if parent and parent.name == 'a' and parent.get('href'):
-                    url = self._validar_url(parent['href'], source_url, source_domain)
-                    if url and url not in urls_procesadas:
-                        urls_procesadas.add(url)
-                        urls_noticias.append(url)
+                    agregar(parent)
                 # Verificar hermanos cercanos (siguiente elemento)
                 elif parent:
                     sibling_link = parent.find('a', href=True)
                     if sibling_link:
-                        url = self._validar_url(sibling_link['href'], source_url, source_domain)
-                        if url and url not in urls_procesadas:
-                            urls_procesadas.add(url)
-                            urls_noticias.append(url)
+                        agregar(sibling_link)
         
-        return urls_noticias
-    
-    def _normalizar_dominio(self, domain: str) -> str:
-        """Normaliza un dominio quitando 'www.' si existe."""
-        return domain.lower().removeprefix('www.')
+        return enlaces
     
-    def _validar_url(
-        self, 
-        href: str, 
-        source_url: str, 
-        source_domain: str
-    ) -> str | None:
+    def enlaces_de_portada(self, html: str, source_url: str) -> tuple[int, dict[str, str]]:
         """
-        Valida y normaliza una URL de artículo.
+        Encuentra los artículos y extrae sus enlaces sin construir el árbol.
+        
+        Equivale a encontrar_articulos() + extraer_enlaces() sobre
+        crear_soup(html, 'html.parser'), con un solo recorrido en streaming
+        (FrontPageScanner) que guarda solo los enlaces y sus contenedores.
         
         Args:
-            href: URL o path relativo del enlace
-            source_url: URL base para resolver URLs relativas
-            source_domain: Dominio del diario para validación
+            html: HTML decodificado de la portada
+            source_url: URL base del diario
             
         Returns:
-            URL completa o None si no es válida
+            Tupla (cantidad de artículos encontrados, dict URL -> texto de sus enlaces)
         """
-        url_completa = urljoin(source_url, href)
-        news_domain = urlparse(url_completa).netloc
+        escaneo = FrontPageScanner(self.selector_matcher, self._url_pattern_re).escanear(html)
+        articles = self._combinar_contenedores(
+            escaneo.grupos,
+            lambda min_articles: escaneo.por_url if len(escaneo.por_url) > min_articles else []
+        )
+        if not articles:
+            return 0, {}
         
-        # Validaciones básicas
-        if '{{' in url_completa:  # Template no procesado
-            return None
-        
-        # Comparar dominios normalizados (ignorar www)
-        if self._normalizar_dominio(source_domain) != self._normalizar_dominio(news_domain):
-            return None
+        enlaces = {}
+        validador = UrlValidator(source_url)
         
-        # Filtrar URLs que no son artículos
-        path = urlparse(url_completa).path.lower()
+        def agregar(link):
+            url = validador.validar(link.href)
+            if url:
+                _agregar_enlace(enlaces, url, ' '.join(link.partes), link.title)
         
-        # Excluir páginas de categorías, archivos por fecha, tags, etc.
-        excluded_patterns = [
-            '/category/', '/tag/', '/author/', '/page/', '/secciones/',
-            '/wp-content/', '/wp-admin/', '/feed/',
-            '/#', '/search', '/contacto', '/quienes-somos',
-            '/politica-de-privacidad', '/terminos',
-        ]
-        if any(pattern in path for pattern in excluded_patterns):
-            return None
-        
-        # Excluir URLs que son solo fechas (ej: /2025/12/20/)
-        if re.match(r'^/\d{4}/\d{2}/\d{2}/?$', path):
-            return None
-        
-        # Excluir la página principal
-        if path in ['/', '']:
-            return None
-        
-        # Excluir URLs muy cortas (probablemente no son artículos)
-        if len(path) < 5:
-            return None
+        # Mismo criterio que extraer_enlaces(), sobre los rangos de enlaces
+        for article in articles:
+            links = escaneo.enlaces[article.inicio:article.fin]
+            for link in links:
+                agregar(link)
+            
+            if not links:
+                parent = article.padre
+                if parent and parent.nombre == 'a' and parent.href:
+                    agregar(parent)
+                elif parent and parent.fin > parent.inicio:
+                    agregar(escaneo.enlaces[parent.inicio])
         
-        return url_completa
+        return len(articles), enlaces
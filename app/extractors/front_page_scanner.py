@@ -0,0 +1,204 @@
+"""
+Recorrido en streaming de una portada (sin construir el árbol).
+
+Para encontrar las URLs de artículos de una portada alcanza con los
+enlaces, el texto de cada enlace y el tag/clase de los elementos que los
+contienen. FrontPageScanner recibe los eventos del mismo HTMLParser que
+usa BeautifulSoup con html.parser (BeautifulSoupHTMLParser), implementando
+la interfaz de construcción del árbol que ese parser llama
+(handle_starttag, handle_endtag, handle_data, endData), pero en lugar de
+crear un Tag por elemento mantiene solo la pila de elementos abiertos y
+un registro liviano (_Marco) de los enlaces y de los contenedores.
+
+Como los eventos, el manejo de entidades y las reglas de anidamiento son
+los del parser real, la estructura que ve es la misma que tendría el
+árbol de crear_soup() con html.parser. Con otros backends (lxml,
+html5lib) el árbol puede diferir en HTML mal formado, así que este
+recorrido solo reemplaza al de html.parser.
+
+Los descendientes de un elemento son un tramo contiguo en orden de
+documento, así que cada marco guarda solo el rango [inicio, fin) de la
+lista de enlaces de la página: los enlaces dentro de un contenedor son
+enlaces[inicio:fin].
+
+BeautifulSoupHTMLParser es interno de bs4: requirements.txt acota las
+versiones probadas y tests/test_front_page_scanner.py compara este
+recorrido con el árbol sobre portadas fijas.
+"""
+import re
+from collections import Counter
+
+from bs4.builder import HTMLParserTreeBuilder
+from bs4.builder._htmlparser import BeautifulSoupHTMLParser
+from bs4.element import CData
+
+# Separación del atributo class en valores (como bs4)
+_VALORES = re.compile(r'\S+')
+
+# Contenedores que busca el fallback por patrones de URL (find_parent)
+_BLOQUES = frozenset(('article', 'div', 'li'))
+
+_RAIZ = '[document]'
+
+
+class _Marco:
+    """Elemento abierto (o registrado) durante el recorrido."""
+
+    __slots__ = ('nombre', 'padre', 'inicio', 'fin', 'href', 'title', 'partes',
+                 'bloque', 'especial', 'is_empty_element')
+
+    def __init__(self, nombre: str, padre: '_Marco | None', inicio: int):
+        self.nombre = nombre
+        self.padre = padre
+        self.inicio = inicio  # primer enlace descendiente
+        self.fin = None  # enlaces hasta acá (al cerrarse)
+        self.href = None
+        self.title = None
+        self.partes = None  # textos del enlace (solo <a href>)
+        self.bloque = None  # article/div/li más cercano (incluido este)
+        self.especial = False  # dentro de script, style, template, rt o rp
+        self.is_empty_element = False
+
+
+class FrontPageScanner:
+    """
+    Recorre el HTML de una portada una vez y junta lo que necesitan
+    ArticleFinder.encontrar_articulos() y extraer_enlaces().
+    """
+
+    def __init__(self, selector_matcher, url_pattern_re: re.Pattern | None):
+        """
+        Inicializa el scanner.
+
+        Args:
+            selector_matcher: SelectorMatcher con los selectores de artículos
+            url_pattern_re: Regex de patrones de URL del fallback (o None)
+        """
+        self.selector_matcher = selector_matcher
+        self.url_pattern_re = url_pattern_re
+        self.builder = HTMLParserTreeBuilder(store_line_numbers=False)
+        self._vacios = frozenset(self.builder.empty_element_tags)
+        self._especiales = frozenset(self.builder.string_containers)
+        self._tags_con_reglas = frozenset(selector_matcher.tags)
+        self._reiniciar()
+
+    def _reiniciar(self):
+        """Estado vacío para una página nueva."""
+        self.raiz = _Marco(_RAIZ, None, 0)
+        self._pila = [self.raiz]
+        self._abiertos = Counter()  # nombre -> elementos abiertos con ese nombre
+        self._textos = []  # datos pendientes del string actual
+        self._enlaces_abiertos = []  # <a href> abiertos (reciben el texto)
+        self.contains_replacement_characters = False
+
+        self.enlaces: list[_Marco] = []  # <a href> en orden de documento
+        self.grupos: list[list[_Marco]] = [[] for _ in range(len(self.selector_matcher.selectores) + 1)]
+        self.por_url: list[_Marco] = []
+        self._por_url_vistos = set()
+
+    def escanear(self, html: str) -> 'FrontPageScanner':
+        """
+        Recorre el HTML.
+
+        Deja en el scanner:
+        - grupos: <article> y elementos de cada selector, en el formato de
+          SelectorMatcher.buscar(soup, incluir='article')
+        - por_url: contenedores del fallback por patrones de URL, como
+          ArticleFinder._buscar_por_url_patterns() (sin el mínimo)
+        - enlaces: todos los <a href>, con su texto
+
+        Args:
+            html: HTML decodificado
+
+        Returns:
+            El mismo scanner
+        """
+        self._reiniciar()
+        args, kwargs = self.builder.parser_args
+        parser = BeautifulSoupHTMLParser(self, *args, **kwargs)
+        parser.feed(html)
+        parser.close()
+        # Igual que BeautifulSoup al terminar: cerrar lo que quedó abierto
+        self.endData()
+        while len(self._pila) > 1:
+            self._cerrar_ultimo()
+        self.raiz.fin = len(self.enlaces)
+        return self
+
+    # Interfaz de construcción del árbol que llama BeautifulSoupHTMLParser
+
+    def handle_starttag(self, name, namespace, nsprefix, attrs, sourceline=None,
+                        sourcepos=None, namespaces=None) -> _Marco:
+        self.endData()
+        padre = self._pila[-1]
+        marco = _Marco(name, padre, len(self.enlaces))
+        marco.is_empty_element = name in self._vacios
+        marco.bloque = marco if name in _BLOQUES else padre.bloque
+        marco.especial = padre.especial or name in self._especiales
+
+        if name == 'article':
+            self.grupos[0].append(marco)
+        clases = attrs.get('class') if name in self._tags_con_reglas else None
+        if clases:
+            for prioridad in self.selector_matcher.reglas_cumplidas(name, _VALORES.findall(clases)):
+                self.grupos[prioridad + 1].append(marco)
+
+        href = attrs.get('href') if name == 'a' else None
+        if href is not None:
+            marco.href = href
+            marco.title = attrs.get('title')
+            marco.partes = []
+            self.enlaces.append(marco)
+            self._enlaces_abiertos.append(marco)
+            marco.inicio = len(self.enlaces)
+            if self.url_pattern_re is not None and self.url_pattern_re.search(href.lower()):
+                contenedor = padre.bloque
+                if contenedor is not None and id(contenedor) not in self._por_url_vistos:
+                    self.por_url.append(contenedor)
+                    self._por_url_vistos.add(id(contenedor))
+
+        self._pila.append(marco)
+        self._abiertos[name] += 1
+        return marco
+
+    def handle_endtag(self, name, nsprefix=None):
+        self.endData()
+        # Mismo criterio que BeautifulSoup._popToTag: cerrar hasta el
+        # último elemento abierto con ese nombre (si no hay, nada)
+        if not self._abiertos[name]:
+            return
+        while self._cerrar_ultimo().nombre != name:
+            pass
+
+    def handle_data(self, data):
+        # Los datos se acumulan hasta el próximo tag (BeautifulSoup los
+        # une en un solo string)
+        self._textos.append(data)
+
+    def endData(self, containerClass=None):
+        if not self._textos:
+            return
+        texto = ''.join(self._textos)
+        self._textos = []
+        if not self._enlaces_abiertos:
+            return
+        # get_text() solo junta strings comunes y CDATA: no comentarios,
+        # doctype, ni el contenido de script/style/template/rt/rp
+        if containerClass is None:
+            if self._pila[-1].especial:
+                return
+        elif containerClass is not CData:
+            return
+        texto = texto.strip()
+        if texto:
+            for enlace in self._enlaces_abiertos:
+                enlace.partes.append(texto)
+
+    def _cerrar_ultimo(self) -> _Marco:
+        """Cierra el elemento abierto más reciente."""
+        marco = self._pila.pop()
+        marco.fin = len(self.enlaces)
+        self._abiertos[marco.nombre] -= 1
+        if self._enlaces_abiertos and self._enlaces_abiertos[-1] is marco:
+            self._enlaces_abiertos.pop()
+        return marco
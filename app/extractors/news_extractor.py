@@ -3,11 +3,10 @@ Extractor de datos de noticias individuales.
 """
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 from app.models.noticia import Noticia
-from app.parsers.date_parser import DateParser
-from app.parsers.content_parser import ContentParser
-from app.http.async_client import AsyncHTTPClient
+from app.parsers.parse_executor import ParseExecutor
+from app.http.async_client import AsyncHTTPClient, RespuestaHTTP
+from config.settings import get_scraping_config
 
 
 class NewsExtractor:
@@ -16,15 +15,86 @@ class NewsExtractor:
     Coordina los parsers de contenido y fechas.
     """
     
-    def __init__(self, http_client: AsyncHTTPClient):
+    def __init__(
+        self,
+        http_client: AsyncHTTPClient,
+        parse_executor: ParseExecutor = None,
+        filtrar_keywords: bool = None
+    ):
         """
         Inicializa el extractor.
         
         Args:
             http_client: Cliente HTTP para obtener las páginas
+            parse_executor: Ejecutor donde parsear el HTML.
+                            Si es None, se parsea inline.
+            filtrar_keywords: Descartar las noticias sin keywords apenas se
+                              parsean. Si es None, usa la configuración.
         """
         self.http_client = http_client
-        self.content_parser = ContentParser()
+        self.parse_executor = parse_executor or ParseExecutor(mode='inline')
+        if filtrar_keywords is None:
+            prefiltro = get_scraping_config().get('keyword_prefilter', {})
+            filtrar_keywords = prefiltro.get('early_reject', False)
+        self.filtrar_keywords = filtrar_keywords
+        
+        # Noticias descartadas por no tener keywords
+        self.descartadas_keywords = 0
+    
+    async def descargar(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        semaphore: asyncio.Semaphore
+    ) -> RespuestaHTTP | None:
+        """
+        Descarga una noticia respetando el límite de concurrencia.
+        
+        Args:
+            session: Sesión HTTP activa
+            url: URL de la noticia
+            semaphore: Semáforo para limitar concurrencia
+            
+        Returns:
+            RespuestaHTTP o None si falla o no cambió (304)
+        """
+        # El semáforo se toma dentro del límite del host (ver fetch_bytes)
+        respuesta = await self.http_client.fetch_bytes(session, url, semaphore)
+        if not respuesta or respuesta.not_modified:
+            return None
+        return respuesta
+    
+    async def construir(self, respuesta: RespuestaHTTP, source_name: str) -> Noticia | None:
+        """
+        Parsea una noticia descargada y arma el objeto Noticia.
+        
+        Args:
+            respuesta: Respuesta HTTP de la noticia
+            source_name: Nombre del diario fuente
+            
+        Returns:
+            Objeto Noticia o None si el contenido no es válido (o no
+            tiene keywords, si el pre-filtro está activo)
+        """
+        # Extraer contenido y fecha
+        contenido = await self.parse_executor.parsear_noticia(
+            respuesta.content, respuesta.encoding, respuesta.url, self.filtrar_keywords
+        )
+        
+        if not contenido['is_valid']:
+            return None
+        if not contenido['con_keywords']:
+            self.descartadas_keywords += 1
+            return None
+        
+        return Noticia(
+            url=respuesta.url,
+            source=source_name,
+            title=contenido['title'],
+            subtitle=contenido['subtitle'],
+            body=contenido['body'],
+            published_at=contenido['published_at']
+        )
     
     async def extraer(
         self,
@@ -36,6 +106,9 @@ class NewsExtractor:
         """
         Extrae todos los datos de una noticia.
         
+        El semáforo solo limita la descarga; el parseo corre en el
+        ejecutor para no frenar las demás descargas.
+        
         Args:
             session: Sesión HTTP activa
             url: URL de la noticia
@@ -45,31 +118,10 @@ class NewsExtractor:
         Returns:
             Objeto Noticia o None si falla la extracción
         """
-        async with semaphore:
-            try:
-                html = await self.http_client.fetch_html(session, url)
-                if not html:
-                    return None
-                
-                soup = BeautifulSoup(html, "html.parser")
-                
-                # Extraer contenido
-                contenido = self.content_parser.extraer_todo(soup)
-                
-                if not contenido['is_valid']:
-                    return None
-                
-                # Extraer fecha
-                fecha = DateParser.extraer(soup, url)
-                
-                return Noticia(
-                    url=url,
-                    source=source_name,
-                    title=contenido['title'],
-                    subtitle=contenido['subtitle'],
-                    body=contenido['body'],
-                    published_at=fecha
-                )
-                
-            except Exception:
+        try:
+            respuesta = await self.descargar(session, url, semaphore)
+            if not respuesta:
                 return None
+            return await self.construir(respuesta, source_name)
+        except Exception:
+            return None
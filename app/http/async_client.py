@@ -2,21 +2,45 @@
 Cliente HTTP asíncrono para scraping.
 """
 import asyncio
+import sqlite3
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import dataclass
+from urllib.parse import urlparse
 import aiohttp
+from app.http.host_limiter import AdaptiveHostLimiter
+from app.http.response_cache import ResponseCache
+from app.utils.text_utils import decodificar_html
 from config.settings import get_scraping_config
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+
+@dataclass
+class RespuestaHTTP:
+    """Respuesta HTTP cruda, lista para decodificar y parsear."""
+    url: str
+    content: bytes
+    encoding: str | None = None  # Encoding informado por el servidor
+    not_modified: bool = False  # 304: la página no cambió desde la última ejecución
+
+
 class AsyncHTTPClient:
     """
     Cliente HTTP asíncrono con soporte para encoding automático.
     Maneja timeouts, headers y detección de encoding.
     """
     
-    def __init__(self):
-        """Inicializa el cliente con la configuración."""
+    def __init__(self, connection_mode: str = None):
+        """
+        Inicializa el cliente con la configuración.
+        
+        Args:
+            connection_mode: "keepalive" o "force_close".
+                             Si es None, usa la configuración.
+        """
         self.config = get_scraping_config()
+        self.connection_mode = connection_mode or self.config.get('connection_mode', 'keepalive')
         # Headers que simulan un navegador real
         self.headers = {
             'User-Agent': self.config['user_agent'],
@@ -30,66 +54,141 @@ class AsyncHTTPClient:
             'Sec-Fetch-Site': 'none',
             'Cache-Control': 'max-age=0',
         }
+        
+        # Cache de requests condicionales (ETag / Last-Modified)
+        cache_config = self.config.get('http_cache', {})
+        self.response_cache = None
+        self.on_not_modified = cache_config.get('on_not_modified', 'cached_body')
+        if cache_config.get('enabled', False):
+            self.response_cache = ResponseCache(max_age_days=cache_config.get('max_age_days', 7))
+        
+        # Concurrencia adaptativa por host (AIMD)
+        aimd_config = self.config.get('adaptive_concurrency', {})
+        self.host_limiter = None
+        if aimd_config.get('enabled', False):
+            self.host_limiter = AdaptiveHostLimiter(
+                min_limit=aimd_config.get('min_per_host', 1),
+                max_limit=aimd_config.get('max_per_host', 15),
+                initial_limit=self.config['limit_per_host'],
+                decrease_factor=aimd_config.get('decrease_factor', 0.5),
+                slow_latency=aimd_config.get('slow_latency', 5.0),
+            )
     
-    def crear_session(self, max_connections: int) -> aiohttp.ClientSession:
+    @property
+    def limit_per_host(self) -> int:
+        """Límite por host del connector (el techo AIMD si está habilitado)."""
+        if self.host_limiter:
+            return self.host_limiter.max_limit
+        return self.config['limit_per_host']
+    
+    def crear_session(self, max_connections: int, trace_configs: list = None) -> aiohttp.ClientSession:
         """
         Crea una sesión HTTP con límites de conexión.
         
+        En modo "keepalive" las conexiones quedan en un pool y se reutilizan
+        entre requests al mismo host (un solo handshake TCP/TLS por conexión),
+        con cache de DNS. En modo "force_close" cada request abre y cierra
+        su propia conexión.
+        
         Args:
             max_connections: Número máximo de conexiones concurrentes
+            trace_configs: TraceConfig de aiohttp (para métricas)
             
         Returns:
             ClientSession configurada
         """
-        connector = aiohttp.TCPConnector(
-            limit=max_connections,
-            limit_per_host=self.config['limit_per_host'],
-            force_close=True,  # Forzar cierre de conexiones (evita problemas entre ejecuciones)
-        )
+        if self.connection_mode == 'force_close':
+            connector = aiohttp.TCPConnector(
+                limit=max_connections,
+                limit_per_host=self.limit_per_host,
+                force_close=True,
+            )
+        else:
+            connector = aiohttp.TCPConnector(
+                limit=max_connections,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.config.get('ttl_dns_cache', 300),
+                keepalive_timeout=self.config.get('keepalive_timeout', 15),
+            )
+        if self.response_cache:
+            self.response_cache.abrir()
         return aiohttp.ClientSession(
             connector=connector,
-            headers=self.headers
+            headers=self.headers,
+            trace_configs=trace_configs
         )
     
-    async def fetch_html(self, session: aiohttp.ClientSession, url: str) -> str | None:
+    @asynccontextmanager
+    async def sesion(self, max_connections: int, trace_configs: list = None):
         """
-        Obtiene el HTML de una URL de forma asíncrona.
+        Crea una sesión y la cierra ordenadamente al salir.
         
-        Detecta automáticamente el encoding usando chardet.
+        Cierra la sesión dentro del mismo event loop y, en modo keep-alive,
+        espera a que terminen de cerrarse los transports SSL antes de que
+        asyncio.run() cierre el loop. Esto evita los errores entre
+        ejecuciones ("Event loop is closed", conexiones sin cerrar) que
+        antes se resolvían con force_close. También persiste la cache HTTP
+        y los límites por host aprendidos, y al empezar reinicia el estado
+        del limitador por host para el event loop de esta ejecución.
+        
+        Args:
+            max_connections: Número máximo de conexiones concurrentes
+            trace_configs: TraceConfig de aiohttp (para métricas)
+        """
+        if self.host_limiter:
+            self.host_limiter.reiniciar()
+        session = self.crear_session(max_connections, trace_configs)
+        try:
+            yield session
+        finally:
+            await session.close()
+            if self.connection_mode != 'force_close':
+                await asyncio.sleep(0.25)
+            await asyncio.to_thread(self.cerrar_cache)
+            if self.host_limiter:
+                self.host_limiter.guardar()
+    
+    def cerrar_cache(self):
+        """Persiste la cache de respuestas (llamar al terminar la sesión)."""
+        if self.response_cache:
+            self.response_cache.cerrar()
+    
+    async def fetch_bytes(self, session: aiohttp.ClientSession, url: str,
+                          semaphore: asyncio.Semaphore = None) -> RespuestaHTTP | None:
+        """
+        Obtiene el contenido crudo (bytes) de una URL de forma asíncrona.
+        
+        No decodifica el HTML: eso queda para quien lo parsee, de modo que
+        el trabajo de CPU pueda hacerse fuera del event loop.
+        
+        Si la cache HTTP está habilitada, envía If-None-Match /
+        If-Modified-Since. Ante un 304 retorna el cuerpo guardado, o una
+        respuesta vacía con not_modified=True si on_not_modified es "skip".
+        
+        En modo keep-alive, si el servidor cerró una conexión ociosa del
+        pool (ServerDisconnectedError), se reintenta una vez.
         
         Args:
             session: Sesión HTTP activa
             url: URL a obtener
+            semaphore: Límite global de requests (opcional). Se toma después
+                       del lugar en el límite del host, para que los requests
+                       que esperan a un host lento no ocupen permisos globales
             
         Returns:
-            HTML como string o None si falla
+            RespuestaHTTP o None si falla
         """
         try:
-            timeout = aiohttp.ClientTimeout(total=self.config['request_timeout'])
-            
-            async with session.get(url, timeout=timeout) as response:
-                if response.status >= 400:
-                    logger.warning(f"⚠️ HTTP {response.status} para {url[:50]}...")
-                    return None
-                    
-                # Leer contenido raw (bytes)
-                content = await response.read()
-                
-                # Detectar encoding usando chardet
-                detected_encoding = self._detectar_encoding(content)
-                
-                # Decodificar con el encoding detectado
-                if detected_encoding:
-                    try:
-                        return content.decode(detected_encoding)
-                    except (UnicodeDecodeError, LookupError):
-                        pass
-                
-                # Fallback: usar la detección de aiohttp o UTF-8
-                return content.decode(
-                    response.get_encoding() or 'utf-8', 
-                    errors='replace'
-                )
+            for intento in range(2):
+                try:
+                    respuesta = await self._get(session, url, semaphore)
+                    break
+                except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as e:
+                    # Conexión keep-alive cerrada por el servidor mientras estaba ociosa
+                    # (los errores al conectar no se reintentan)
+                    if intento or self.connection_mode == 'force_close' or isinstance(e, aiohttp.ClientConnectorError):
+                        raise
+                    logger.debug(f"Conexión reutilizada cerrada, reintentando {url[:50]}...")
                 
         except asyncio.TimeoutError:
             logger.warning(f"⏱️ Timeout para {url[:50]}...")
@@ -102,22 +201,100 @@ class AsyncHTTPClient:
         except Exception as e:
             logger.error(f"❌ Error: {type(e).__name__}: {e}")
             return None
+        
+        # Escribir la cache HTTP en un thread (fuera del event loop), ya
+        # liberados el lugar del host y el permiso global
+        if self.response_cache and self.response_cache.escritura_pendiente:
+            try:
+                await self.response_cache.flush_async()
+            except sqlite3.Error as e:
+                logger.warning(f"⚠️ No se pudo escribir la cache HTTP: {e}")
+        return respuesta
     
-    def _detectar_encoding(self, content: bytes) -> str | None:
+    async def _get(self, session: aiohttp.ClientSession, url: str,
+                   semaphore: asyncio.Semaphore = None) -> RespuestaHTTP | None:
+        """
+        Hace un GET (condicional si hay cache) y arma la RespuestaHTTP.
+        
+        Si la concurrencia adaptativa está habilitada, el request ocupa un
+        lugar en el límite de su host y el resultado ajusta ese límite. El
+        permiso global (semaphore) se pide recién con el lugar del host.
         """
-        Detecta el encoding del contenido usando chardet.
+        timeout = aiohttp.ClientTimeout(total=self.config['request_timeout'])
+        headers = self.response_cache.headers_condicionales(url) if self.response_cache else None
+        
+        slot = self.host_limiter.slot(urlparse(url).netloc) if self.host_limiter else nullcontext({})
+        
+        async with slot as medicion:
+            async with semaphore or nullcontext():
+                try:
+                    async with session.get(url, timeout=timeout, headers=headers) as response:
+                        medicion['status'] = response.status
+                        
+                        if response.status == 304 and self.response_cache:
+                            return await self._respuesta_no_modificada(url)
+                        
+                        if response.status >= 400:
+                            logger.warning(f"⚠️ HTTP {response.status} para {url[:50]}...")
+                            return None
+                        
+                        # Leer contenido raw (bytes)
+                        content = await response.read()
+                        encoding = response.get_encoding()
+                        
+                        if self.response_cache:
+                            self.response_cache.guardar(
+                                url,
+                                response.headers.get('ETag'),
+                                response.headers.get('Last-Modified'),
+                                content,
+                                encoding
+                            )
+                        
+                        return RespuestaHTTP(url=url, content=content, encoding=encoding)
+                except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as e:
+                    # Conexión ociosa del pool cerrada por el servidor: no es una
+                    # falla del host, no recorta su límite (fetch_bytes reintenta)
+                    if self.connection_mode != 'force_close' and not isinstance(e, aiohttp.ClientConnectorError):
+                        medicion['neutral'] = True
+                    raise
+    
+    async def _respuesta_no_modificada(self, url: str) -> RespuestaHTTP | None:
+        """Arma la respuesta para un 304 a partir de la cache."""
+        cache = self.response_cache
+        cache.tocar(url)
+        cache.stats['not_modified'] += 1
+        
+        if self.on_not_modified == 'skip':
+            return RespuestaHTTP(url=url, content=b'', not_modified=True)
+        
+        guardado = await cache.obtener_async(url)
+        if guardado is None:
+            logger.warning(f"⚠️ 304 sin cuerpo en cache para {url[:50]}...")
+            return None
+        content, encoding = guardado
+        cache.stats['bytes_ahorrados'] += len(content)
+        return RespuestaHTTP(url=url, content=content, encoding=encoding)
+    
+    async def fetch_html(self, session: aiohttp.ClientSession, url: str) -> str | None:
+        """
+        Obtiene el HTML de una URL de forma asíncrona.
+        
+        Detecta automáticamente el encoding usando chardet.
         
         Args:
-            content: Contenido en bytes
+            session: Sesión HTTP activa
+            url: URL a obtener
             
         Returns:
-            Encoding detectado o None
+            HTML como string o None si falla
         """
+        respuesta = await self.fetch_bytes(session, url)
+        if not respuesta or respuesta.not_modified:
+            return None
+        
         try:
-            import chardet
-            result = chardet.detect(content)
-            if result and result.get('encoding'):
-                return result['encoding']
-        except ImportError:
-            pass
-        return None
+            return decodificar_html(respuesta.content, respuesta.encoding)
+        except Exception as e:
+            logger.error(f"❌ Error: {type(e).__name__}: {e}")
+            return None
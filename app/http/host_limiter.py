@@ -0,0 +1,169 @@
+"""
+Limitador de concurrencia adaptativo por host (AIMD).
+
+Cada host tiene su propio límite de requests simultáneos:
+- Aumento aditivo: cada respuesta sana (rápida y sin error) suma
+  1/límite, es decir, +1 por cada "ventana" completa de éxitos.
+- Disminución multiplicativa: un timeout, un 429 o un 5xx multiplica el
+  límite por `decrease_factor` (como mucho una vez por ventana, para que
+  una ráfaga de errores simultáneos no lo hunda al mínimo).
+
+Los límites aprendidos se guardan en disco y se usan como punto de
+partida en la siguiente ejecución. El estado de cada host (requests en
+curso y su asyncio.Condition, atada al event loop donde espera) se crea
+de nuevo en cada ejecución: entre ejecuciones solo se conservan los
+límites.
+"""
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+HOST_LIMITS_PATH = Path(__file__).resolve().parent.parent / "db" / "host_limits.json"
+
+
+class _HostState:
+    """Estado de concurrencia de un host."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.in_flight = 0
+        self.ultimo_recorte = 0.0
+        self.latencia_media = None
+        self.condition = asyncio.Condition()
+
+
+class AdaptiveHostLimiter:
+    """
+    Limita los requests simultáneos por host y ajusta el límite con AIMD.
+    """
+
+    def __init__(
+        self,
+        min_limit: int = 1,
+        max_limit: int = 15,
+        initial_limit: int = 5,
+        decrease_factor: float = 0.5,
+        slow_latency: float = 5.0,
+        path: Path = HOST_LIMITS_PATH,
+    ):
+        """
+        Inicializa el limitador.
+
+        Args:
+            min_limit: Límite mínimo por host
+            max_limit: Límite máximo por host
+            initial_limit: Límite inicial para hosts sin historial
+            decrease_factor: Factor de recorte ante timeout/429/5xx
+            slow_latency: Segundos a partir de los cuales una respuesta
+                          exitosa no amplía el límite
+            path: Archivo JSON donde persistir los límites aprendidos
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.initial_limit = initial_limit
+        self.decrease_factor = decrease_factor
+        self.slow_latency = slow_latency
+        self.path = Path(path)
+
+        self._hosts: dict[str, _HostState] = {}
+        self._aprendidos = self._cargar()
+
+    def _cargar(self) -> dict:
+        """Carga los límites aprendidos en ejecuciones anteriores."""
+        try:
+            return json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def guardar(self):
+        """Persiste los límites aprendidos."""
+        self._aprendidos.update({host: round(estado.limit, 2) for host, estado in self._hosts.items()})
+        try:
+            self.path.write_text(json.dumps(self._aprendidos, indent=2, sort_keys=True), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudieron guardar los límites por host: {e}")
+
+    def limites(self) -> dict:
+        """Retorna el límite actual de cada host usado."""
+        return {host: estado.limit for host, estado in self._hosts.items()}
+
+    def reiniciar(self):
+        """
+        Empieza una ejecución nueva (llamar al abrir cada sesión).
+
+        Conserva los límites aprendidos y descarta el estado de los hosts,
+        cuyas Condition quedan atadas al event loop de la ejecución
+        anterior (cada asyncio.run() crea uno nuevo).
+        """
+        self._aprendidos.update({host: estado.limit for host, estado in self._hosts.items()})
+        self._hosts = {}
+
+    def _estado(self, host: str) -> _HostState:
+        """Retorna (creándolo si hace falta) el estado del host."""
+        if host not in self._hosts:
+            limit = self._aprendidos.get(host, self.initial_limit)
+            self._hosts[host] = _HostState(min(max(limit, self.min_limit), self.max_limit))
+        return self._hosts[host]
+
+    def _ampliar(self, estado: _HostState, latencia: float):
+        """Aumento aditivo tras una respuesta sana."""
+        if estado.latencia_media is None:
+            estado.latencia_media = latencia
+        else:
+            estado.latencia_media = 0.8 * estado.latencia_media + 0.2 * latencia
+        if latencia < self.slow_latency:
+            estado.limit = min(self.max_limit, estado.limit + 1 / estado.limit)
+
+    def _recortar(self, estado: _HostState, host: str, motivo: str):
+        """Disminución multiplicativa (como mucho una vez por ventana)."""
+        ahora = time.monotonic()
+        ventana = estado.latencia_media or 1.0
+        if ahora - estado.ultimo_recorte < ventana:
+            return
+        estado.ultimo_recorte = ahora
+        anterior = estado.limit
+        estado.limit = max(self.min_limit, estado.limit * self.decrease_factor)
+        logger.debug(f"AIMD {host}: {motivo}, límite {anterior:.1f} -> {estado.limit:.1f}")
+
+    @asynccontextmanager
+    async def slot(self, host: str):
+        """
+        Ocupa un lugar en el límite del host durante un request.
+
+        El bloque recibe un dict donde debe guardar el status HTTP en
+        'status'. Al salir se ajusta el límite según el resultado: las
+        excepciones, los 429 y los 5xx recortan; el resto amplía. Si el
+        bloque pone 'neutral' en True, el resultado no ajusta el límite
+        (fallas que no son culpa del host).
+        """
+        estado = self._estado(host)
+        async with estado.condition:
+            await estado.condition.wait_for(lambda: estado.in_flight < int(estado.limit))
+            estado.in_flight += 1
+
+        medicion = {'status': None, 'neutral': False}
+        inicio = time.monotonic()
+        try:
+            yield medicion
+        except asyncio.TimeoutError:
+            self._recortar(estado, host, "timeout")
+            raise
+        except Exception as e:
+            if not medicion['neutral']:
+                self._recortar(estado, host, type(e).__name__)
+            raise
+        else:
+            status = medicion['status']
+            if status is not None and (status == 429 or status >= 500):
+                self._recortar(estado, host, f"HTTP {status}")
+            else:
+                self._ampliar(estado, time.monotonic() - inicio)
+        finally:
+            async with estado.condition:
+                estado.in_flight -= 1
+                estado.condition.notify_all()
@@ -0,0 +1,163 @@
+"""
+Cache persistente de respuestas HTTP para requests condicionales.
+
+Guarda por URL los validadores (ETag / Last-Modified) y el cuerpo de la
+última respuesta, de modo que la siguiente ejecución pueda enviar
+If-None-Match / If-Modified-Since y, ante un 304, reutilizar el cuerpo
+guardado (o saltear la página) sin volver a descargarla.
+
+Las escrituras y las lecturas de cuerpos se hacen fuera del event loop
+(asyncio.to_thread), así que la conexión se comparte entre threads y se
+usa de a uno por vez (_lock).
+"""
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CACHE_PATH = Path(__file__).resolve().parent.parent / "db" / "http_cache.db"
+
+
+class ResponseCache:
+    """
+    Cache de respuestas HTTP en SQLite.
+
+    Los validadores se cargan en memoria al abrir; los cuerpos se leen de
+    disco solo ante un 304. Las escrituras se acumulan y se guardan en
+    una sola transacción cada `flush_every` respuestas (flush_async) o al
+    cerrar.
+    """
+
+    def __init__(self, path: Path = CACHE_PATH, max_age_days: float = 7, flush_every: int = 100):
+        """
+        Inicializa la cache.
+
+        Args:
+            path: Archivo SQLite de la cache
+            max_age_days: Entradas más viejas que esto se eliminan al abrir
+            flush_every: Cantidad de respuestas pendientes antes de escribir
+        """
+        self.path = Path(path)
+        self.max_age_days = max_age_days
+        self.flush_every = flush_every
+        self._conn = None
+        self._lock = threading.Lock()
+        self._validadores = {}  # url -> (etag, last_modified)
+        self._pendientes = []
+        self._tocadas = []  # (fetched_at, url) confirmadas con 304
+
+        self.stats = {'not_modified': 0, 'bytes_ahorrados': 0}
+
+    def abrir(self):
+        """Abre la BD, elimina entradas vencidas y carga los validadores."""
+        if self._conn is not None:
+            return
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS http_cache (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            encoding TEXT,
+            content BLOB,
+            fetched_at REAL
+        )
+        """)
+        limite = time.time() - self.max_age_days * 86400
+        self._conn.execute("DELETE FROM http_cache WHERE fetched_at < ?", (limite,))
+        self._conn.commit()
+
+        cursor = self._conn.execute("SELECT url, etag, last_modified FROM http_cache")
+        self._validadores = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+        logger.debug(f"Cache HTTP: {len(self._validadores)} URLs con validadores")
+
+    def cerrar(self):
+        """Guarda las respuestas pendientes y cierra la BD."""
+        if self._conn is None:
+            return
+        self.flush()
+        with self._lock:
+            self._conn.close()
+            self._conn = None
+
+    def headers_condicionales(self, url: str) -> dict | None:
+        """Retorna los headers If-None-Match / If-Modified-Since para la URL."""
+        validadores = self._validadores.get(url)
+        if not validadores:
+            return None
+        etag, last_modified = validadores
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers or None
+
+    def obtener(self, url: str) -> tuple[bytes, str | None] | None:
+        """
+        Retorna (content, encoding) guardados para la URL, o None.
+
+        Lee de disco: desde el event loop usar obtener_async().
+        """
+        for pendiente in reversed(self._pendientes):
+            if pendiente[0] == url:
+                return pendiente[4], pendiente[3]
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content, encoding FROM http_cache WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1]
+
+    async def obtener_async(self, url: str) -> tuple[bytes, str | None] | None:
+        """obtener() en un thread, sin bloquear el event loop."""
+        return await asyncio.to_thread(self.obtener, url)
+
+    def guardar(self, url: str, etag: str | None, last_modified: str | None,
+                content: bytes, encoding: str | None):
+        """Registra una respuesta 200 (solo si trae validadores)."""
+        if not etag and not last_modified:
+            return
+        self._validadores[url] = (etag, last_modified)
+        self._pendientes.append((url, etag, last_modified, encoding, content, time.time()))
+
+    @property
+    def escritura_pendiente(self) -> bool:
+        """True si ya hay `flush_every` respuestas para escribir (con flush_async())."""
+        return len(self._pendientes) >= self.flush_every
+
+    def tocar(self, url: str):
+        """Renueva la antigüedad de una entrada confirmada con 304 (al escribir)."""
+        self._tocadas.append((time.time(), url))
+
+    def flush(self):
+        """Escribe lo pendiente en una sola transacción."""
+        self._escribir(*self._tomar_pendientes())
+
+    async def flush_async(self):
+        """flush() en un thread, sin bloquear el event loop."""
+        await asyncio.to_thread(self._escribir, *self._tomar_pendientes())
+
+    def _tomar_pendientes(self) -> tuple[list, list]:
+        """Saca las escrituras pendientes (en el thread del event loop)."""
+        pendientes, tocadas = self._pendientes, self._tocadas
+        self._pendientes, self._tocadas = [], []
+        return pendientes, tocadas
+
+    def _escribir(self, pendientes: list, tocadas: list):
+        """Escribe respuestas y renovaciones en una sola transacción."""
+        if self._conn is None or not (pendientes or tocadas):
+            return
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO http_cache (url, etag, last_modified, encoding, content, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                pendientes
+            )
+            self._conn.executemany("UPDATE http_cache SET fetched_at = ? WHERE url = ?", tocadas)
+            self._conn.commit()
@@ -31,6 +31,9 @@ class Noticia:
 
     # ai_actors: Optional[dict] = None  # Actores detectados por la IA
 
+    # Grupo de noticias casi idénticas entre fuentes (app/utils/near_duplicates.py)
+    cluster_id: Optional[str] = None
+
 
     def __post_init__(self):
         """Validación de datos al crear una instancia."""
@@ -3,5 +3,7 @@ Módulo de parsers para extracción de datos.
 """
 from app.parsers.date_parser import DateParser
 from app.parsers.content_parser import ContentParser
+from app.parsers.backend import crear_soup
+from app.parsers.parse_executor import ParseExecutor
 
-__all__ = ['DateParser', 'ContentParser']
+__all__ = ['DateParser', 'ContentParser', 'ParseExecutor', 'crear_soup']
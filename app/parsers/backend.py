@@ -0,0 +1,56 @@
+"""
+Backend de parseo HTML.
+
+Todos los parsers (ArticleFinder, ContentParser, DateParser) trabajan
+sobre un árbol de BeautifulSoup. Este módulo centraliza la creación de
+ese árbol para poder elegir el tree builder desde SCRAPING_CONFIG:
+
+- "html.parser": parser de la librería estándar (más lento, sin dependencias)
+- "lxml": parser en C (mucho más rápido, requiere `pip install lxml`)
+- "html5lib": parser que replica a los navegadores (el más lento)
+"""
+from bs4 import BeautifulSoup, FeatureNotFound
+from config.settings import get_scraping_config
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+PARSER_BACKENDS = ('html.parser', 'lxml', 'html5lib')
+
+DEFAULT_BACKEND = 'html.parser'
+
+# Backends no instalados (se avisa una sola vez por proceso)
+_backends_no_disponibles = set()
+
+
+def get_parser_backend() -> str:
+    """Retorna el backend configurado en SCRAPING_CONFIG['parser_backend']."""
+    backend = get_scraping_config().get('parser_backend', DEFAULT_BACKEND)
+    if backend not in PARSER_BACKENDS:
+        raise ValueError(f"Backend de parseo inválido: {backend} (opciones: {', '.join(PARSER_BACKENDS)})")
+    return backend
+
+
+def crear_soup(html: str | bytes, backend: str = None) -> BeautifulSoup:
+    """
+    Crea el árbol BeautifulSoup con el backend configurado.
+
+    Si el backend no está instalado se usa html.parser como fallback.
+
+    Args:
+        html: HTML a parsear
+        backend: Backend a usar. Si es None, usa la configuración.
+
+    Returns:
+        BeautifulSoup del HTML
+    """
+    backend = backend or get_parser_backend()
+    if backend in _backends_no_disponibles:
+        backend = DEFAULT_BACKEND
+
+    try:
+        return BeautifulSoup(html, backend)
+    except FeatureNotFound:
+        _backends_no_disponibles.add(backend)
+        logger.warning(f"⚠️ Backend '{backend}' no instalado, usando {DEFAULT_BACKEND}")
+        return BeautifulSoup(html, DEFAULT_BACKEND)
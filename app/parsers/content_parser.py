@@ -3,6 +3,7 @@ Parser de contenido de noticias.
 Extrae título, subtítulo y cuerpo del artículo.
 """
 from bs4 import BeautifulSoup
+from app.parsers.extraction_profiles import en_cascada
 from app.utils.text_utils import normalizar_texto
 from config.settings import get_validation_config
 
@@ -77,18 +78,26 @@ class ContentParser:
         Returns:
             Subtítulo normalizado o None
         """
-        for sel in self.SUBTITLE_SELECTORS:
-            if isinstance(sel, tuple):
-                tag, attrs = sel
-                subtitle_tag = soup.find(tag, class_=attrs.get('class'))
-            else:
-                subtitle_tag = soup.find(sel)
-            
-            if subtitle_tag:
-                subtitulo = normalizar_texto(subtitle_tag.get_text(strip=True))
-                if subtitulo:
-                    return subtitulo
+        return en_cascada(self._opciones_subtitulo(soup))[0]
+    
+    def _opciones_subtitulo(self, soup: BeautifulSoup) -> list:
+        """Pares (clave, extractor) de SUBTITLE_SELECTORS, para en_cascada()."""
+        return [
+            (f"{sel[0]}.{sel[1]['class']}" if isinstance(sel, tuple) else sel,
+             lambda sel=sel: self._subtitulo_en(soup, sel))
+            for sel in self.SUBTITLE_SELECTORS
+        ]
+    
+    def _subtitulo_en(self, soup: BeautifulSoup, sel) -> str | None:
+        """Subtítulo según un selector de SUBTITLE_SELECTORS, o None."""
+        if isinstance(sel, tuple):
+            tag, attrs = sel
+            subtitle_tag = soup.find(tag, class_=attrs.get('class'))
+        else:
+            subtitle_tag = soup.find(sel)
         
+        if subtitle_tag:
+            return normalizar_texto(subtitle_tag.get_text(strip=True)) or None
         return None
     
     def extraer_cuerpo(self, soup: BeautifulSoup) -> str:
@@ -100,51 +109,74 @@ class ContentParser:
         Args:
             soup: BeautifulSoup del HTML
             
+        Returns:
+            Cuerpo del artículo o string vacío
+        """
+        return en_cascada(self._opciones_cuerpo(soup))[0] or ""
+    
+    def _opciones_cuerpo(self, soup: BeautifulSoup) -> list:
+        """Pares (clave, extractor) de BODY_CONTAINERS, para en_cascada()."""
+        return [
+            (f"{tag}.{class_name}" if class_name else tag,
+             lambda tag=tag, class_name=class_name: self._cuerpo_en(soup, tag, class_name))
+            for tag, class_name in self.BODY_CONTAINERS
+        ]
+    
+    def _cuerpo_en(self, soup: BeautifulSoup, tag: str, class_name: str | None) -> str:
+        """
+        Extrae el cuerpo de un tipo de contenedor.
+        
+        Args:
+            soup: BeautifulSoup del HTML
+            tag: Tag del contenedor
+            class_name: Clase del contenedor (None = cualquiera)
+            
         Returns:
             Cuerpo del artículo o string vacío
         """
         min_paragraphs = self.config['min_paragraphs']
         min_paragraph_length = self.config['min_paragraph_length']
         
-        for tag, class_name in self.BODY_CONTAINERS:
-            if class_name:
-                # Primero buscar un solo contenedor
-                container = soup.find(tag, class_=class_name)
-            else:
-                container = soup.find(tag)
+        if class_name:
+            # Primero buscar un solo contenedor
+            container = soup.find(tag, class_=class_name)
+        else:
+            container = soup.find(tag)
+        
+        if not container:
+            return ""
+        
+        paragraphs = container.find_all('p')
+        
+        if paragraphs and len(paragraphs) >= min_paragraphs:
+            body = "\n\n".join([
+                normalizar_texto(p.get_text(strip=True)) 
+                for p in paragraphs 
+                if len(p.get_text(strip=True)) > min_paragraph_length
+            ])
             
-            if container:
-                paragraphs = container.find_all('p')
+            if body:
+                return body
+        
+        # Si el contenedor existe pero no tiene suficientes párrafos,
+        # buscar TODOS los contenedores con esta clase y combinarlos
+        # (esto es común en sitios como San Juan 8 que dividen el artículo)
+        if class_name:
+            all_containers = soup.find_all(tag, class_=lambda x: x and class_name in x)
+            if len(all_containers) > 1:
+                all_paragraphs = []
+                for cont in all_containers:
+                    all_paragraphs.extend(cont.find_all('p'))
                 
-                if paragraphs and len(paragraphs) >= min_paragraphs:
+                if len(all_paragraphs) >= min_paragraphs:
                     body = "\n\n".join([
                         normalizar_texto(p.get_text(strip=True)) 
-                        for p in paragraphs 
+                        for p in all_paragraphs 
                         if len(p.get_text(strip=True)) > min_paragraph_length
                     ])
                     
                     if body:
                         return body
-                
-                # Si el contenedor existe pero no tiene suficientes párrafos,
-                # buscar TODOS los contenedores con esta clase y combinarlos
-                # (esto es común en sitios como San Juan 8 que dividen el artículo)
-                if class_name:
-                    all_containers = soup.find_all(tag, class_=lambda x: x and class_name in x)
-                    if len(all_containers) > 1:
-                        all_paragraphs = []
-                        for cont in all_containers:
-                            all_paragraphs.extend(cont.find_all('p'))
-                        
-                        if len(all_paragraphs) >= min_paragraphs:
-                            body = "\n\n".join([
-                                normalizar_texto(p.get_text(strip=True)) 
-                                for p in all_paragraphs 
-                                if len(p.get_text(strip=True)) > min_paragraph_length
-                            ])
-                            
-                            if body:
-                                return body
         
         return ""
     
@@ -162,23 +194,35 @@ class ContentParser:
         min_body_length = self.config['min_body_length']
         return bool(titulo) and len(cuerpo) >= min_body_length
     
-    def extraer_todo(self, soup: BeautifulSoup) -> dict:
+    def extraer_todo(self, soup: BeautifulSoup, perfil: dict = None) -> dict:
         """
         Extrae todo el contenido de la noticia.
         
         Args:
             soup: BeautifulSoup del HTML
+            perfil: Selectores a probar primero por campo ('subtitle',
+                    'body'), de ExtractionProfiles; None = cascada completa
             
         Returns:
-            Dict con título, subtítulo, cuerpo y validez
+            Dict con título, subtítulo, cuerpo y validez, más 'selectores'
+            (campo -> clave ganadora) y 'aciertos' (campo -> si ganó el
+            selector del perfil) para actualizar el perfil
         """
+        perfil = perfil or {}
         titulo = self.extraer_titulo(soup)
-        subtitulo = self.extraer_subtitulo(soup)
-        cuerpo = self.extraer_cuerpo(soup)
+        subtitulo, clave_subtitulo, acierto_subtitulo = en_cascada(
+            self._opciones_subtitulo(soup), perfil.get('subtitle')
+        )
+        cuerpo, clave_cuerpo, acierto_cuerpo = en_cascada(
+            self._opciones_cuerpo(soup), perfil.get('body')
+        )
+        cuerpo = cuerpo or ""
         
         return {
             'title': titulo,
             'subtitle': subtitulo,
             'body': cuerpo,
-            'is_valid': self.es_contenido_valido(titulo, cuerpo)
+            'is_valid': self.es_contenido_valido(titulo, cuerpo),
+            'selectores': {'subtitle': clave_subtitulo, 'body': clave_cuerpo},
+            'aciertos': {'subtitle': acierto_subtitulo, 'body': acierto_cuerpo},
         }
@@ -6,6 +6,7 @@ import re
 import json
 from datetime import datetime
 from bs4 import BeautifulSoup
+from app.parsers.extraction_profiles import en_cascada
 
 
 class DateParser:
@@ -165,11 +166,17 @@ class DateParser:
     def extraer_de_meta_tags(cls, soup: BeautifulSoup) -> datetime | None:
         """Extrae fecha desde meta tags HTML."""
         for tag, attrs in cls.META_TAGS_FECHA:
-            meta = soup.find(tag, attrs=attrs)
-            if meta and meta.get('content'):
-                fecha = cls.parsear_fecha_iso(meta['content'])
-                if fecha:
-                    return fecha
+            fecha = cls._fecha_de_meta(soup, tag, attrs)
+            if fecha:
+                return fecha
+        return None
+    
+    @classmethod
+    def _fecha_de_meta(cls, soup: BeautifulSoup, tag: str, attrs: dict) -> datetime | None:
+        """Fecha de un meta tag de META_TAGS_FECHA."""
+        meta = soup.find(tag, attrs=attrs)
+        if meta and meta.get('content'):
+            return cls.parsear_fecha_iso(meta['content'])
         return None
     
     @classmethod
@@ -184,13 +191,21 @@ class DateParser:
     def extraer_de_clases_css(cls, soup: BeautifulSoup) -> datetime | None:
         """Extrae fecha desde elementos con clases específicas."""
         for clase in cls.CLASES_FECHA:
-            elementos = soup.find_all(class_=lambda x: x and clase in x.lower())
-            for elem in elementos:
-                texto = elem.get_text(strip=True)
-                if texto and len(texto) < 100:
-                    fecha = cls.parsear_fecha_texto(texto)
-                    if fecha:
-                        return fecha
+            fecha = cls._fecha_de_clase(soup, clase)
+            if fecha:
+                return fecha
+        return None
+    
+    @classmethod
+    def _fecha_de_clase(cls, soup: BeautifulSoup, clase: str) -> datetime | None:
+        """Fecha del primer elemento con una clase de CLASES_FECHA que tenga una."""
+        elementos = soup.find_all(class_=lambda x: x and clase in x.lower())
+        for elem in elementos:
+            texto = elem.get_text(strip=True)
+            if texto and len(texto) < 100:
+                fecha = cls.parsear_fecha_texto(texto)
+                if fecha:
+                    return fecha
         return None
     
     @classmethod
@@ -228,18 +243,41 @@ class DateParser:
         Returns:
             datetime o None si no se encontró fecha
         """
-        # Intentar cada método en orden de prioridad
-        extractores = [
-            cls.extraer_de_json_ld,
-            cls.extraer_de_meta_tags,
-            cls.extraer_de_time_tag,
-            cls.extraer_de_clases_css,
-        ]
-        
-        for extractor in extractores:
-            fecha = extractor(soup)
-            if fecha:
-                return fecha
+        return cls.extraer_con_perfil(soup, url)[0]
+    
+    @classmethod
+    def _opciones(cls, soup: BeautifulSoup, url: str) -> list:
+        """
+        Pares (clave, extractor) en el orden de extraer(), para en_cascada().
         
+        Meta tags y clases CSS van uno por uno, para que el perfil
+        recuerde cuál dio la fecha.
+        """
+        opciones = [('json_ld', lambda: cls.extraer_de_json_ld(soup))]
+        opciones += [
+            (f"meta:{next(iter(attrs.values()))}", lambda tag=tag, attrs=attrs: cls._fecha_de_meta(soup, tag, attrs))
+            for tag, attrs in cls.META_TAGS_FECHA
+        ]
+        opciones.append(('time', lambda: cls.extraer_de_time_tag(soup)))
+        opciones += [
+            (f"clase:{clase}", lambda clase=clase: cls._fecha_de_clase(soup, clase))
+            for clase in cls.CLASES_FECHA
+        ]
         # Último recurso: extraer de URL
-        return cls.extraer_de_url(url)
+        opciones.append(('url', lambda: cls.extraer_de_url(url)))
+        return opciones
+    
+    @classmethod
+    def extraer_con_perfil(cls, soup: BeautifulSoup, url: str, preferida: str = None) -> tuple[datetime | None, str | None, bool | None]:
+        """
+        Igual que extraer(), pero probando primero la fuente del perfil del host.
+        
+        Args:
+            soup: BeautifulSoup del HTML
+            url: URL de la noticia
+            preferida: Clave de la fuente de fecha a probar primero
+            
+        Returns:
+            Tupla (fecha, clave de la fuente ganadora, acierto), como en_cascada()
+        """
+        return en_cascada(cls._opciones(soup, url), preferida)
@@ -0,0 +1,188 @@
+"""
+Perfiles de extracción aprendidos por host.
+
+ContentParser y DateParser prueban una cascada de selectores en orden
+(contenedores del cuerpo, selectores de subtítulo, fuentes de fecha) y
+cada intento fallido recorre el árbol. En un mismo diario el selector
+que gana casi nunca cambia, así que se recuerda por host cuál produjo el
+cuerpo, el subtítulo y la fecha: la próxima vez se prueba ese primero y
+la cascada completa solo corre si falla.
+
+Un selector se aprende (o reemplaza al aprendido) recién cuando gana la
+cascada completa en varias noticias seguidas del host. Una página
+distinta de las demás (sin h2, con la fecha solo en una clase CSS) no
+cambia el perfil: si no, el selector más débil que ganó en ella se
+probaría primero en todas las siguientes y taparía al mejor.
+
+El parseo corre en los workers del ParseExecutor: el proceso principal
+le pasa a cada tarea el perfil de su host (un dict chico) y registra los
+selectores ganadores que vuelven con el resultado. Los perfiles se
+guardan en disco y se usan en la siguiente ejecución.
+"""
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterable
+from urllib.parse import urlparse
+
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+EXTRACTION_PROFILES_PATH = Path(__file__).resolve().parent.parent / "db" / "extraction_profiles.json"
+
+# Campos con perfil (claves de los dicts de selectores)
+CAMPOS = ('body', 'subtitle', 'date')
+
+# Fuentes de último recurso: la fecha de la URL (sin hora) y <article> sin
+# clase (genérico). Van al final de la cascada porque son menos precisas
+# que las de arriba, y en un host que las tiene casi siempre coinciden:
+# aprendidas, taparían para siempre a las fuentes específicas. Nunca se
+# recuerdan ni se prueban primero.
+ULTIMO_RECURSO = frozenset(('url', 'article'))
+
+
+def en_cascada(opciones: Iterable[tuple[str, Callable[[], Any]]], preferida: str | None = None) -> tuple[Any, str | None, bool | None]:
+    """
+    Prueba extractores en orden hasta que uno devuelva algo.
+
+    Args:
+        opciones: Pares (clave del selector, extractor sin argumentos), en
+                  el orden de la cascada
+        preferida: Clave a probar primero (la del perfil), o None. Las de
+                   ULTIMO_RECURSO se ignoran
+
+    Returns:
+        Tupla (resultado, clave ganadora, acierto). acierto es True si ganó
+        la preferida, False si falló y se usó la cascada, y None si no
+        había preferida. Sin resultado: (None, None, acierto).
+    """
+    opciones = list(opciones)
+    if preferida in ULTIMO_RECURSO:
+        preferida = None
+    if preferida is not None:
+        for clave, extractor in opciones:
+            if clave == preferida:
+                resultado = extractor()
+                if resultado:
+                    return resultado, clave, True
+                break
+
+    for clave, extractor in opciones:
+        if clave == preferida:
+            continue  # ya se probó
+        resultado = extractor()
+        if resultado:
+            return resultado, clave, None if preferida is None else False
+    return None, None, None if preferida is None else False
+
+
+def host_de(url: str) -> str:
+    """Host de una URL (clave de los perfiles)."""
+    return urlparse(url).netloc.lower()
+
+
+class ExtractionProfiles:
+    """
+    Selectores ganadores por host, con las tasas de acierto de la
+    ejecución actual.
+    """
+
+    def __init__(self, path: Path = EXTRACTION_PROFILES_PATH, confirmaciones: int = 3):
+        """
+        Inicializa los perfiles.
+
+        Args:
+            path: Archivo JSON donde persistir los perfiles
+            confirmaciones: Veces seguidas que un selector debe ganar la
+                            cascada completa para aprenderlo
+        """
+        self.path = Path(path)
+        self.confirmaciones = max(1, confirmaciones)
+        self._perfiles: dict[str, dict[str, str]] = {}
+        # host -> campo -> [clave candidata, veces seguidas que ganó]
+        self._candidatas: dict[str, dict[str, list]] = {}
+        self._cargar()
+        # host -> campo -> {'aciertos', 'intentos'}
+        self.stats: dict[str, dict[str, dict[str, int]]] = {}
+
+    def _cargar(self):
+        """Carga los perfiles aprendidos en ejecuciones anteriores."""
+        try:
+            datos = json.loads(self.path.read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if 'perfiles' not in datos:
+            datos = {'perfiles': datos}  # formato anterior: solo los perfiles
+        # Descartar fuentes de último recurso guardadas por versiones anteriores
+        self._perfiles = {
+            host: {campo: clave for campo, clave in perfil.items() if clave not in ULTIMO_RECURSO}
+            for host, perfil in datos['perfiles'].items()
+        }
+        self._candidatas = datos.get('candidatas', {})
+
+    def guardar(self):
+        """Persiste los perfiles (y las candidatas a medio confirmar)."""
+        datos = {'perfiles': self._perfiles, 'candidatas': self._candidatas}
+        try:
+            self.path.write_text(json.dumps(datos, indent=2, sort_keys=True), encoding='utf-8')
+        except OSError as e:
+            logger.warning(f"⚠️ No se pudieron guardar los perfiles de extracción: {e}")
+
+    def perfil(self, url: str) -> dict[str, str]:
+        """Selectores preferidos para el host de la URL (copia, para enviar al worker)."""
+        return dict(self._perfiles.get(host_de(url), {}))
+
+    def registrar(self, url: str, selectores: dict[str, str | None], aciertos: dict[str, bool | None]):
+        """
+        Registra el resultado del parseo de una noticia válida.
+
+        Solo cuentan los ganadores de la cascada completa (sin perfil, o
+        cuando falló el selector del perfil): cuando gana el del perfil no
+        se sabe si uno de mayor prioridad también habría encontrado algo.
+        Un ganador reemplaza al perfil al ganar `confirmaciones` veces
+        seguidas; si el selector del perfil vuelve a ganar, la racha se
+        corta.
+
+        Args:
+            url: URL de la noticia
+            selectores: Campo -> clave del selector ganador (None si ninguno
+                        encontró nada, o si el campo no se extrajo)
+            aciertos: Campo -> resultado de en_cascada() para ese campo
+        """
+        host = host_de(url)
+        perfil = self._perfiles.setdefault(host, {})
+        candidatas = self._candidatas.setdefault(host, {})
+        stats = self.stats.setdefault(host, {campo: {'aciertos': 0, 'intentos': 0} for campo in CAMPOS})
+        for campo in CAMPOS:
+            clave = selectores.get(campo)
+            acierto = aciertos.get(campo)
+            if clave is None and acierto is None:
+                continue  # campo no extraído
+            stats[campo]['intentos'] += 1
+            if acierto:
+                stats[campo]['aciertos'] += 1
+                candidatas.pop(campo, None)
+                continue
+            # Si nada encontró el campo (o solo una fuente de último
+            # recurso), no hay nada que aprender
+            if clave is None or clave in ULTIMO_RECURSO:
+                continue
+            candidata = candidatas.get(campo)
+            if candidata and candidata[0] == clave:
+                candidata[1] += 1
+            else:
+                candidata = candidatas[campo] = [clave, 1]
+            if candidata[1] >= self.confirmaciones:
+                perfil[campo] = clave
+                del candidatas[campo]
+
+    def aprendidos(self) -> dict[str, dict[str, str]]:
+        """Host -> campo -> clave del selector aprendido."""
+        return {host: dict(perfil) for host, perfil in self._perfiles.items()}
+
+    def tasas(self) -> dict[str, dict[str, tuple[int, int]]]:
+        """Host -> campo -> (aciertos, intentos) de la ejecución actual."""
+        return {
+            host: {campo: (s['aciertos'], s['intentos']) for campo, s in campos.items()}
+            for host, campos in self.stats.items()
+        }
@@ -0,0 +1,243 @@
+"""
+Ejecutor de parseo fuera del event loop.
+
+El parseo con BeautifulSoup y los parsers de contenido/fechas es trabajo
+de CPU: si se hace dentro del event loop frena todas las descargas en
+curso. Este módulo recibe el HTML crudo (bytes) y devuelve datos planos
+(dicts y listas), de modo que el trabajo pueda ejecutarse en un pool de
+procesos, en un pool de threads o inline.
+"""
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+from app.parsers.backend import crear_soup, get_parser_backend
+from app.parsers.content_parser import ContentParser
+from app.parsers.date_parser import DateParser
+from app.parsers.extraction_profiles import ExtractionProfiles
+from app.utils.text_utils import decodificar_html
+from config.settings import get_scraping_config
+from config.sources import texto_contiene_keywords, texto_para_keywords
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Los workers se crean recién cuando hay trabajo, con el event loop ya
+# andando y con threads propios (asyncio.to_thread, resolver de aiohttp).
+# Un fork de un proceso con threads puede quedar trabado en un lock que
+# otro thread tenía tomado, así que los workers arrancan con forkserver
+# (o spawn donde no existe): las funciones que ejecutan son de módulo.
+_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+
+# Instancias por proceso (se crean una vez en cada worker)
+_content_parser = None
+_article_finder = None
+
+
+def _get_content_parser() -> ContentParser:
+    """Retorna el ContentParser del proceso actual."""
+    global _content_parser
+    if _content_parser is None:
+        _content_parser = ContentParser()
+    return _content_parser
+
+
+def _get_article_finder():
+    """Retorna el ArticleFinder del proceso actual."""
+    global _article_finder
+    if _article_finder is None:
+        # Import diferido: app.extractors importa este módulo
+        from app.extractors.article_finder import ArticleFinder
+        _article_finder = ArticleFinder()
+    return _article_finder
+
+
+def parsear_noticia(content: bytes, encoding: str | None, url: str, filtrar_keywords: bool = False,
+                    perfil: dict = None) -> dict:
+    """
+    Parsea el HTML crudo de una noticia.
+
+    Args:
+        content: HTML en bytes
+        encoding: Encoding informado por el servidor
+        url: URL de la noticia (para extraer fecha como último recurso)
+        filtrar_keywords: Si es True y la noticia no tiene keywords, se
+                          descarta acá mismo (sin fecha ni contenido)
+        perfil: Selectores a probar primero (ExtractionProfiles.perfil())
+
+    Returns:
+        Dict con title, subtitle, body, published_at, is_valid,
+        con_keywords (False solo si se descartó por keywords), y
+        selectores/aciertos para actualizar el perfil del host
+    """
+    html = decodificar_html(content, encoding)
+    soup = crear_soup(html)
+    perfil = perfil or {}
+
+    contenido = _get_content_parser().extraer_todo(soup, perfil)
+    contenido['con_keywords'] = True
+    if not contenido['is_valid']:
+        contenido['published_at'] = None
+        return contenido
+
+    if filtrar_keywords:
+        texto = texto_para_keywords(contenido['title'], contenido['subtitle'], contenido['body'])
+        if not texto_contiene_keywords(texto):
+            # No devolver el cuerpo: evita copiarlo entre procesos
+            return {'title': contenido['title'], 'subtitle': None, 'body': None,
+                    'published_at': None, 'is_valid': True, 'con_keywords': False,
+                    'selectores': contenido['selectores'], 'aciertos': contenido['aciertos']}
+
+    fecha, clave, acierto = DateParser.extraer_con_perfil(soup, url, perfil.get('date'))
+    contenido['published_at'] = fecha
+    contenido['selectores']['date'] = clave
+    contenido['aciertos']['date'] = acierto
+    return contenido
+
+
+def parsear_portada(content: bytes, encoding: str | None, source_url: str) -> tuple[int, list[str]]:
+    """
+    Parsea el HTML crudo de una portada y extrae las URLs de artículos.
+
+    Args:
+        content: HTML en bytes
+        encoding: Encoding informado por el servidor
+        source_url: URL base del diario
+
+    Returns:
+        Tupla (cantidad de artículos encontrados, lista de URLs)
+    """
+    num_articles, enlaces = parsear_portada_con_texto(content, encoding, source_url)
+    return num_articles, list(enlaces)
+
+
+def parsear_portada_con_texto(content: bytes, encoding: str | None, source_url: str) -> tuple[int, dict[str, str]]:
+    """
+    Igual que parsear_portada(), pero incluye el texto de cada enlace.
+
+    Returns:
+        Tupla (cantidad de artículos encontrados, dict URL -> texto del enlace)
+    """
+    html = decodificar_html(content, encoding)
+    article_finder = _get_article_finder()
+
+    # El recorrido en streaming reproduce el árbol de html.parser
+    if get_scraping_config().get('front_page_streaming', True) and get_parser_backend() == 'html.parser':
+        return article_finder.enlaces_de_portada(html, source_url)
+
+    soup = crear_soup(html)
+    articles = article_finder.encontrar_articulos(soup)
+    if not articles:
+        return 0, {}
+    return len(articles), article_finder.extraer_enlaces(articles, source_url)
+
+
+class ParseExecutor:
+    """
+    Ejecuta el parseo de HTML en un pool configurable.
+
+    Modos:
+    - "process": ProcessPoolExecutor (usa todos los núcleos)
+    - "thread": ThreadPoolExecutor (útil si no se pueden crear procesos)
+    - "inline": en el mismo event loop (comportamiento original)
+    """
+
+    MODOS = ('process', 'thread', 'inline')
+
+    def __init__(self, mode: str = None, max_workers: int = None):
+        """
+        Inicializa el ejecutor.
+
+        Args:
+            mode: "process", "thread" o "inline". Si es None, usa la configuración.
+            max_workers: Cantidad de workers. Si es None, usa la configuración
+                         (o la cantidad de núcleos).
+        """
+        config = get_scraping_config()
+        self.mode = mode or config.get('parse_executor', 'process')
+        if self.mode not in self.MODOS:
+            raise ValueError(f"Modo de parseo inválido: {self.mode} (opciones: {', '.join(self.MODOS)})")
+        self.max_workers = max_workers or config.get('parse_workers') or os.cpu_count() or 1
+        self._executor: Executor | None = None
+        # Selectores ganadores por host (se pasan a cada tarea de parseo)
+        self.perfiles = None
+        perfiles_config = config.get('extraction_profiles', {})
+        if perfiles_config.get('enabled', False):
+            self.perfiles = ExtractionProfiles(confirmaciones=perfiles_config.get('confirmations', 3))
+
+    def __enter__(self):
+        self.iniciar()
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    async def __aenter__(self):
+        self.iniciar()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.cerrar_async()
+
+    def iniciar(self):
+        """Crea el pool de workers (no hace nada en modo inline)."""
+        if self._executor is not None or self.mode == 'inline':
+            return
+        if self.mode == 'process':
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context(_START_METHOD),
+            )
+        else:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        logger.debug(f"ParseExecutor iniciado: {self.mode} ({self.max_workers} workers)")
+
+    def cerrar(self):
+        """Libera el pool de workers y persiste los perfiles de extracción."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        if self.perfiles:
+            self.perfiles.guardar()
+
+    async def cerrar_async(self):
+        """
+        cerrar() desde el event loop.
+
+        shutdown(wait=True) espera a que terminen todos los workers: se
+        hace en un thread para no bloquear el loop mientras otras tareas
+        siguen programadas (ej: al desarmar el pipeline).
+        """
+        await asyncio.to_thread(self.cerrar)
+
+    async def _ejecutar(self, fn, *args):
+        """Ejecuta fn en el pool, o inline si no hay pool."""
+        if self._executor is None:
+            return fn(*args)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    async def parsear_noticia(self, content: bytes, encoding: str | None, url: str,
+                              filtrar_keywords: bool = False) -> dict:
+        """
+        Versión asíncrona de parsear_noticia().
+
+        Envía el perfil del host con la tarea y registra los selectores
+        ganadores que vuelven del worker.
+        """
+        perfil = self.perfiles.perfil(url) if self.perfiles else None
+        contenido = await self._ejecutar(parsear_noticia, content, encoding, url, filtrar_keywords, perfil)
+        if self.perfiles and contenido['is_valid']:
+            self.perfiles.registrar(url, contenido['selectores'], contenido['aciertos'])
+        return contenido
+
+    async def parsear_portada(self, content: bytes, encoding: str | None, source_url: str) -> tuple[int, list[str]]:
+        """Versión asíncrona de parsear_portada()."""
+        return await self._ejecutar(parsear_portada, content, encoding, source_url)
+
+    async def parsear_portada_con_texto(self, content: bytes, encoding: str | None,
+                                        source_url: str) -> tuple[int, dict[str, str]]:
+        """Versión asíncrona de parsear_portada_con_texto()."""
+        return await self._ejecutar(parsear_portada_con_texto, content, encoding, source_url)
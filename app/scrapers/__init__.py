@@ -2,5 +2,6 @@
 Módulo de scrapers de noticias.
 """
 from app.scrapers.async_scraper import AsyncNewsScraper
+from app.scrapers.pipeline import ScrapePipeline
 
-__all__ = ['AsyncNewsScraper']
+__all__ = ['AsyncNewsScraper', 'ScrapePipeline']
@@ -3,6 +3,7 @@ Scraper asíncrono para extraer noticias de múltiples fuentes en paralelo.
 
 Este módulo orquesta el proceso de scraping usando componentes modulares:
 - AsyncHTTPClient: Cliente HTTP asíncrono
+- ParseExecutor: Parsea el HTML fuera del event loop
 - ArticleFinder: Encuentra artículos en portadas
 - NewsExtractor: Extrae datos de noticias individuales
 - DateParser: Parsea fechas de publicación
@@ -10,16 +11,23 @@ Este módulo orquesta el proceso de scraping usando componentes modulares:
 """
 import asyncio
 import time
-from bs4 import BeautifulSoup
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
 
 from app.models.noticia import Noticia
 from app.http import AsyncHTTPClient
-from app.extractors import ArticleFinder, NewsExtractor
+from app.extractors import NewsExtractor
+from app.parsers import ParseExecutor
+from app.db.database import get_urls_existentes
 from config.settings import get_scraping_config
+from config.sources import texto_contiene_keywords
 from config.logging_config import get_logger
 
 logger = get_logger(__name__)
 
+# Marca de fin de flujo en la cola de noticias
+_FIN = object()
+
 class AsyncNewsScraper:
     """
     Scraper asíncrono de noticias.
@@ -41,80 +49,177 @@ class AsyncNewsScraper:
         
         # Componentes
         self.http_client = AsyncHTTPClient()
-        self.article_finder = ArticleFinder()
+        
+        # URLs descartadas por estar ya en la BD (requests ahorrados)
+        self.urls_omitidas = 0
+        
+        # URLs descartadas en la portada por no tener keywords en el enlace
+        self.urls_sin_keywords = 0
+        
+        # Noticias descartadas por keywords al parsearlas (de la última ejecución)
+        self.descartadas_keywords = 0
+        
+        # Aciertos de los perfiles de extracción por host (de la última ejecución)
+        self.tasas_perfiles = {}
+    
+    @asynccontextmanager
+    async def recursos(self):
+        """
+        Crea los recursos compartidos de una ejecución.
+        
+        Yields:
+            Tupla (session, parse_executor, news_extractor)
+        """
+        self.urls_omitidas = 0
+        self.urls_sin_keywords = 0
+        self.tasas_perfiles = {}
+        async with ParseExecutor() as parse_executor:
+            news_extractor = NewsExtractor(self.http_client, parse_executor)
+            logger.info(f"   Parseo: {parse_executor.mode} ({parse_executor.max_workers} workers)")
+            
+            try:
+                async with self.http_client.sesion(self.max_concurrent) as session:
+                    yield session, parse_executor, news_extractor
+            finally:
+                self.descartadas_keywords = news_extractor.descartadas_keywords
+                if parse_executor.perfiles:
+                    self.tasas_perfiles = parse_executor.perfiles.tasas()
+    
+    async def descubrir_urls(
+        self,
+        session,
+        source: dict,
+        parse_executor: ParseExecutor
+    ) -> list[str]:
+        """
+        Obtiene la portada de una fuente y extrae las URLs a procesar.
+        
+        Descarta las URLs que ya están guardadas en la BD y, si está
+        activo el pre-filtro de portada, las que no tienen keywords en el
+        texto del enlace.
+        
+        Args:
+            session: Sesión HTTP activa
+            source: Dict con 'name' y 'url' del diario
+            parse_executor: Ejecutor donde parsear la portada
+            
+        Returns:
+            Lista de URLs de noticias (vacía si falla)
+        """
+        source_url = source['url']
+        source_name = source['name']
+        
+        logger.info(f"🔍 Scrapeando: {source_name}")
+        
+        # Obtener HTML de la portada
+        respuesta = await self.http_client.fetch_bytes(session, source_url)
+        if not respuesta:
+            logger.error(f"   ❌ No se pudo obtener HTML")
+            return []
+        if respuesta.not_modified:
+            logger.info(f"   ⏭️ {source_name}: portada sin cambios (304)")
+            return []
+        
+        # Encontrar artículos y extraer URLs (fuera del event loop)
+        filtrar_portada = self.config.get('keyword_prefilter', {}).get('front_page', False)
+        if filtrar_portada:
+            num_articles, enlaces = await parse_executor.parsear_portada_con_texto(
+                respuesta.content, respuesta.encoding, source_url
+            )
+            urls = list(enlaces)
+        else:
+            num_articles, urls = await parse_executor.parsear_portada(
+                respuesta.content, respuesta.encoding, source_url
+            )
+        if not num_articles:
+            logger.warning(f"   ⚠️ No se encontraron artículos")
+            return []
+        
+        # Descartar URLs ya guardadas antes de descargarlas
+        conocidas = 0
+        if self.config.get('skip_known_urls', True) and urls:
+            existentes = await asyncio.to_thread(get_urls_existentes, urls)
+            if existentes:
+                urls = [url for url in urls if url not in existentes]
+                conocidas = len(existentes)
+                self.urls_omitidas += conocidas
+        
+        # Descartar las URLs cuyo enlace en la portada no tiene keywords
+        if filtrar_portada:
+            total = len(urls)
+            urls = [url for url in urls if texto_contiene_keywords(enlaces[url])]
+            self.urls_sin_keywords += total - len(urls)
+        
+        logger.info(f"   📰 {source_name}:{num_articles} artículos encontrados, procesando {len(urls)} URLs ({conocidas} ya en BD)...")
+        return urls
     
     async def _scrape_source(
         self,
         session,
         source: dict,
         semaphore: asyncio.Semaphore,
-        news_extractor: NewsExtractor
-    ) -> list[Noticia]:
+        news_extractor: NewsExtractor,
+        parse_executor: ParseExecutor,
+        salida: asyncio.Queue
+    ) -> int:
         """
         Scrapea una fuente individual.
         
+        Cada noticia se pone en la cola de salida apenas se extrae.
+        
         Args:
             session: Sesión HTTP activa
             source: Dict con 'name' y 'url' del diario
             semaphore: Semáforo para limitar concurrencia
             news_extractor: Extractor de noticias
+            parse_executor: Ejecutor donde parsear la portada
+            salida: Cola donde publicar las noticias extraídas
             
         Returns:
-            Lista de noticias extraídas
+            Cantidad de noticias extraídas
         """
-        source_url = source['url']
         source_name = source['name']
         start_time = time.time()
         
+        async def extraer(url: str) -> bool:
+            noticia = await news_extractor.extraer(session, url, source_name, semaphore)
+            if noticia is None:
+                return False
+            await salida.put(noticia)
+            return True
+        
         try:
-            logger.info(f"🔍 Scrapeando: {source_name}")
-            
-            # Obtener HTML de la portada
-            html = await self.http_client.fetch_html(session, source_url)
-            if not html:
-                logger.error(f"   ❌ No se pudo obtener HTML")
-                return []
-            
-            soup = BeautifulSoup(html, "html.parser")
-            
-            # Encontrar artículos
-            articles = self.article_finder.encontrar_articulos(soup)
-            if not articles:
-                logger.warning(f"   ⚠️ No se encontraron artículos")
-                return []
-            
-            # Extraer URLs
-            urls = self.article_finder.extraer_urls(articles, source_url)
-            logger.info(f"   📰 {source_name}:{len(articles)} artículos encontrados, procesando {len(urls)} URLs...")
+            urls = await self.descubrir_urls(session, source, parse_executor)
             
             # Procesar noticias en paralelo
-            tasks = [
-                news_extractor.extraer(session, url, source_name, semaphore)
-                for url in urls
-            ]
+            resultados = await asyncio.gather(*[extraer(url) for url in urls])
+            num_noticias = sum(resultados)
             
-            resultados = await asyncio.gather(*tasks)
-            noticias = [n for n in resultados if n is not None]
-            
-            elapsed = time.time() - start_time
-            logger.info(f"   ✅ {source_name}: {len(noticias)} noticias extraídas en {elapsed:.2f}s")
+            if urls:
+                elapsed = time.time() - start_time
+                logger.info(f"   ✅ {source_name}: {num_noticias} noticias extraídas en {elapsed:.2f}s")
             
-            return noticias
+            return num_noticias
             
         except Exception as e:
             elapsed = time.time() - start_time
             logger.error(f"   ❌ Error: {e} ({elapsed:.2f}s)")
-            return []
+            return 0
     
-    async def scrape_async(self, sources: list[dict]) -> list[Noticia]:
+    async def scrape_iter(self, sources: list[dict]) -> AsyncIterator[Noticia]:
         """
-        Scrapea todas las fuentes de forma asíncrona.
+        Scrapea todas las fuentes y entrega cada noticia apenas se extrae.
+        
+        Las noticias pasan por una cola acotada: si el consumidor es más
+        lento que el scraping, las descargas esperan en lugar de acumular
+        noticias en memoria. Si el consumidor corta la iteración, se
+        cancelan las descargas pendientes.
         
         Args:
             sources: Lista de dicts con 'name' y 'url'
             
-        Returns:
-            Lista de todas las noticias extraídas
+        Yields:
+            Noticias extraídas, en el orden en que se completan
         """
         start_time = time.time()
         
@@ -125,27 +230,45 @@ class AsyncNewsScraper:
         logger.info(f"   Conexiones concurrentes: {self.max_concurrent}")
         
         semaphore = asyncio.Semaphore(self.max_concurrent)
-        news_extractor = NewsExtractor(self.http_client)
-        
-        async with self.http_client.crear_session(self.max_concurrent) as session:
-            # Procesar todas las fuentes en paralelo
-            tasks = [
-                self._scrape_source(session, source, semaphore, news_extractor)
-                for source in sources
-            ]
-            
-            resultados_por_fuente = await asyncio.gather(*tasks)
+        cola = asyncio.Queue(self.config.get('pipeline', {}).get('queue_size', 100))
+        num_noticias = 0
         
-        # Combinar todas las noticias
-        todas_las_noticias = []
-        for noticias in resultados_por_fuente:
-            todas_las_noticias.extend(noticias)
+        async with self.recursos() as (session, parse_executor, news_extractor):
+            async def producir():
+                # Procesar todas las fuentes en paralelo
+                try:
+                    await asyncio.gather(*[
+                        self._scrape_source(session, source, semaphore, news_extractor, parse_executor, cola)
+                        for source in sources
+                    ])
+                except Exception as e:
+                    logger.error(f"   ❌ Error: {e}")
+                await cola.put(_FIN)
+            
+            productor = asyncio.create_task(producir())
+            try:
+                while (noticia := await cola.get()) is not _FIN:
+                    num_noticias += 1
+                    yield noticia
+            finally:
+                productor.cancel()
+                await asyncio.gather(productor, return_exceptions=True)
         
         elapsed = time.time() - start_time
         
-        self._imprimir_resumen(len(sources), len(todas_las_noticias), elapsed)
+        self._imprimir_resumen(len(sources), num_noticias, elapsed)
+    
+    async def scrape_async(self, sources: list[dict]) -> list[Noticia]:
+        """
+        Scrapea todas las fuentes de forma asíncrona.
         
-        return todas_las_noticias
+        Args:
+            sources: Lista de dicts con 'name' y 'url'
+            
+        Returns:
+            Lista de todas las noticias extraídas
+        """
+        return [noticia async for noticia in self.scrape_iter(sources)]
     
     def _imprimir_resumen(self, num_fuentes: int, num_noticias: int, elapsed: float):
         """Imprime el resumen final del scraping."""
@@ -153,11 +276,37 @@ class AsyncNewsScraper:
         logger.info(f"📊 RESUMEN FINAL:")
         logger.info(f"   Fuentes procesadas: {num_fuentes}")
         logger.info(f"   Total noticias: {num_noticias}")
+        self.imprimir_ahorros()
         logger.info(f"   ⏱️  TIEMPO TOTAL: {elapsed:.2f}s ({elapsed/60:.2f} min)")
         if num_noticias:
             logger.info(f"   ⚡ Promedio: {elapsed/num_noticias:.2f}s/noticia")
         logger.info("=" * 60)
     
+    def imprimir_ahorros(self):
+        """Imprime los requests ahorrados, descartes y estado HTTP de la última ejecución."""
+        logger.info(f"   ⏭️  Requests ahorrados (URLs ya en BD): {self.urls_omitidas}")
+        if self.urls_sin_keywords:
+            logger.info(f"   ⏭️  Requests ahorrados (enlace sin keywords): {self.urls_sin_keywords}")
+        if self.descartadas_keywords:
+            logger.info(f"   🔍 Descartadas al parsear (sin keywords): {self.descartadas_keywords}")
+        if self.http_client.response_cache:
+            cache_stats = self.http_client.response_cache.stats
+            logger.info(f"   🗄️  Respuestas 304 (sin cambios): {cache_stats['not_modified']} "
+                        f"({cache_stats['bytes_ahorrados'] / 1024:.0f} KB no descargados)")
+        if self.http_client.host_limiter:
+            limites = self.http_client.host_limiter.limites()
+            logger.info(f"   🎚️  Concurrencia por host: " + ", ".join(
+                f"{host}={limite:.1f}" for host, limite in sorted(limites.items())
+            ))
+        if self.tasas_perfiles:
+            logger.info(f"   🧭 Perfiles de extracción (aciertos del selector aprendido):")
+            nombres = {'body': 'cuerpo', 'subtitle': 'subtítulo', 'date': 'fecha'}
+            for host, campos in sorted(self.tasas_perfiles.items()):
+                logger.info(f"      {host}: " + ", ".join(
+                    f"{nombres[campo]} {aciertos}/{intentos}"
+                    for campo, (aciertos, intentos) in campos.items() if intentos
+                ))
+    
     def scrape(self, sources: list[dict]) -> list[Noticia]:
         """
         Wrapper síncrono para scrape_async.
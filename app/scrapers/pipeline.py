@@ -0,0 +1,312 @@
+"""
+Pipeline de scraping por etapas conectadas con colas acotadas.
+
+    descubrir → descargar → parsear → keywords → IA → guardar
+
+Cada etapa tiene su propia cantidad de workers y lee de una
+asyncio.Queue con tamaño máximo: si una etapa se atrasa, la cola se
+llena y las anteriores esperan (backpressure). La descarga reparte las
+URLs en una cola por host con sus propios workers, para que un host
+lento (con su límite AIMD bajo) no ocupe los workers de los demás. Así las primeras noticias
+llegan a la BD a los pocos segundos, sin esperar al sitio más lento, y
+nunca hay más de unas pocas colas llenas de noticias en memoria.
+
+La etapa de keywords además agrupa las noticias casi idénticas entre
+fuentes (cluster_id): la IA analiza la primera de cada grupo y las
+copias que llegan después reutilizan su resultado.
+"""
+import asyncio
+import time
+from collections import Counter, deque
+from typing import Callable
+from urllib.parse import urlparse
+
+from app.db.database import insert_noticias_bulk
+from app.models.noticia import Noticia
+from app.scrapers.async_scraper import AsyncNewsScraper
+from app.utils.near_duplicates import NearDuplicateIndex
+from config.settings import get_scraping_config
+from config.sources import noticia_contiene_keywords
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# Marca de fin de flujo entre etapas
+_FIN = object()
+
+
+class ScrapePipeline:
+    """
+    Ejecuta el scraping completo como un pipeline de etapas concurrentes.
+    """
+
+    def __init__(
+        self,
+        scraper: AsyncNewsScraper,
+        ai_filter=None,
+        keyword_filter: Callable[[Noticia], bool] = noticia_contiene_keywords,
+        persist: Callable[[list[Noticia]], dict] = insert_noticias_bulk,
+    ):
+        """
+        Inicializa el pipeline.
+
+        Args:
+            scraper: Scraper que provee HTTP, descubrimiento y extracción
+            ai_filter: AIFilter opcional (None = sin etapa de IA)
+            keyword_filter: Función de pre-filtro por keywords
+            persist: Función que guarda un lote y retorna estadísticas
+        """
+        self.scraper = scraper
+        self.ai_filter = ai_filter
+        self.keyword_filter = keyword_filter
+        self.persist = persist
+        scraping_config = get_scraping_config()
+        self.config = scraping_config.get('pipeline', {})
+
+        dedup_config = scraping_config.get('near_duplicates', {})
+        self.near_duplicates = None
+        if dedup_config.get('enabled', False):
+            self.near_duplicates = NearDuplicateIndex(dedup_config.get('max_distance', 10),
+                                                      dedup_config.get('min_words', 20))
+
+        self.stats = {
+            'urls': 0,
+            'descargadas': 0,
+            'parseadas': 0,
+            'con_keywords': 0,
+            'relevantes': 0,
+            'insertadas': 0,
+            'duplicadas': 0,
+            'errores': 0,
+        }
+
+    def _workers(self, clave: str, default: int) -> int:
+        """Cantidad de workers configurada para una etapa."""
+        return max(1, self.config.get(clave) or default)
+
+    async def _etapa(self, nombre: str, entrada: asyncio.Queue, salida: asyncio.Queue | None,
+                     fn, workers: int, workers_siguiente: int):
+        """
+        Corre `workers` consumidores de `entrada` que aplican `fn` a cada
+        item y ponen el resultado (si no es None) en `salida`. Cuando
+        todos terminan, propaga el fin de flujo a la etapa siguiente.
+        """
+        async def worker():
+            while True:
+                item = await entrada.get()
+                if item is _FIN:
+                    return
+                try:
+                    resultado = await fn(item)
+                except Exception as e:
+                    logger.error(f"   ❌ Error en etapa {nombre}: {type(e).__name__}: {e}")
+                    continue
+                if resultado is not None and salida is not None:
+                    await salida.put(resultado)
+
+        await asyncio.gather(*[worker() for _ in range(workers)])
+        if salida is not None:
+            for _ in range(workers_siguiente):
+                await salida.put(_FIN)
+
+    async def _etapa_por_host(self, nombre: str, entrada: asyncio.Queue, salida: asyncio.Queue,
+                              fn, host_de: Callable, por_host: int, workers_siguiente: int):
+        """
+        Como _etapa(), pero con una cola por host y hasta `por_host`
+        workers por host. Un worker que espera a su host (límite AIMD,
+        backpressure) no frena a los items de los demás hosts.
+
+        Lee hasta un solo fin de flujo.
+        """
+        colas: dict[str, deque] = {}
+        activos = Counter()
+        tareas = set()
+
+        async def worker(host: str):
+            cola = colas[host]
+            try:
+                while cola:
+                    item = cola.popleft()
+                    try:
+                        resultado = await fn(item)
+                    except Exception as e:
+                        logger.error(f"   ❌ Error en etapa {nombre}: {type(e).__name__}: {e}")
+                        continue
+                    if resultado is not None:
+                        await salida.put(resultado)
+            finally:
+                activos[host] -= 1
+
+        try:
+            while (item := await entrada.get()) is not _FIN:
+                host = host_de(item)
+                colas.setdefault(host, deque()).append(item)
+                if activos[host] < por_host:
+                    activos[host] += 1
+                    tarea = asyncio.create_task(worker(host))
+                    tareas.add(tarea)
+                    tarea.add_done_callback(tareas.discard)
+            await asyncio.gather(*tareas)
+        finally:
+            for tarea in tareas:
+                tarea.cancel()
+        for _ in range(workers_siguiente):
+            await salida.put(_FIN)
+
+    async def run(self, sources: list[dict]) -> dict:
+        """
+        Ejecuta el pipeline sobre las fuentes.
+
+        Args:
+            sources: Lista de dicts con 'name' y 'url'
+
+        Returns:
+            Dict con estadísticas por etapa
+        """
+        start_time = time.time()
+        scraper = self.scraper
+        queue_size = self.config.get('queue_size', 100)
+
+        q_urls = asyncio.Queue(queue_size)
+        q_respuestas = asyncio.Queue(queue_size)
+        q_noticias = asyncio.Queue(queue_size)
+        q_filtradas = asyncio.Queue(queue_size)
+        q_guardar = asyncio.Queue(queue_size)
+
+        logger.info("=" * 60)
+        logger.info("🚀 SCRAPING ASÍNCRONO - PIPELINE POR ETAPAS")
+        logger.info("=" * 60)
+        logger.info(f"   Fuentes: {len(sources)}")
+
+        async with scraper.recursos() as (session, parse_executor, news_extractor):
+            n_descubrir = self._workers('discover_workers', 4)
+            n_descargar = self._workers('fetch_workers_per_host', scraper.http_client.limit_per_host)
+            n_parsear = self._workers('parse_workers', parse_executor.max_workers)
+            n_ia = self._workers('ai_workers', self.ai_filter.max_concurrent) if self.ai_filter else 1
+            semaphore = asyncio.Semaphore(scraper.max_concurrent)
+
+            q_fuentes = asyncio.Queue()
+            for source in sources:
+                q_fuentes.put_nowait(source)
+            for _ in range(n_descubrir):
+                q_fuentes.put_nowait(_FIN)
+
+            async def descubrir(source):
+                try:
+                    urls = await scraper.descubrir_urls(session, source, parse_executor)
+                except Exception as e:
+                    logger.error(f"   ❌ {source['name']}: {e}")
+                    return None
+                for url in urls:
+                    self.stats['urls'] += 1
+                    await q_urls.put((source['name'], url))
+                return None
+
+            async def descargar(item):
+                source_name, url = item
+                respuesta = await news_extractor.descargar(session, url, semaphore)
+                if respuesta is None:
+                    return None
+                self.stats['descargadas'] += 1
+                return source_name, respuesta
+
+            async def parsear(item):
+                source_name, respuesta = item
+                noticia = await news_extractor.construir(respuesta, source_name)
+                if noticia is not None:
+                    self.stats['parseadas'] += 1
+                return noticia
+
+            async def filtrar_keywords(noticia):
+                if not self.keyword_filter(noticia):
+                    return None
+                self.stats['con_keywords'] += 1
+                if self.near_duplicates:
+                    self.near_duplicates.agregar(noticia)
+                return noticia
+
+            async def filtrar_ia(noticia):
+                if self.ai_filter and not await self.ai_filter.analizar_noticia_async(noticia):
+                    return None
+                self.stats['relevantes'] += 1
+                return noticia
+
+            try:
+                # Si una etapa falla (ej: la BD al guardar), el TaskGroup
+                # cancela y espera a las demás antes de cerrar los recursos;
+                # con gather seguirían corriendo, bloqueadas en colas llenas
+                async with asyncio.TaskGroup() as etapas:
+                    etapas.create_task(self._etapa('descubrir', q_fuentes, q_urls, descubrir, n_descubrir, 1))
+                    etapas.create_task(self._etapa_por_host(
+                        'descargar', q_urls, q_respuestas, descargar,
+                        lambda item: urlparse(item[1]).netloc, n_descargar, n_parsear,
+                    ))
+                    etapas.create_task(self._etapa('parsear', q_respuestas, q_noticias, parsear, n_parsear, 1))
+                    etapas.create_task(self._etapa('keywords', q_noticias, q_filtradas, filtrar_keywords, 1, n_ia))
+                    etapas.create_task(self._etapa('ia', q_filtradas, q_guardar, filtrar_ia, n_ia, 1))
+                    etapas.create_task(self._guardar(q_guardar))
+            except ExceptionGroup as grupo:
+                # Propagar el error original de la etapa que falló
+                raise grupo.exceptions[0]
+            finally:
+                if self.ai_filter:
+                    await self.ai_filter.cerrar()
+
+        self._imprimir_resumen(time.time() - start_time)
+        return self.stats.copy()
+
+    async def _guardar(self, entrada: asyncio.Queue):
+        """
+        Etapa final: guarda las noticias en lotes.
+
+        Un lote se escribe cuando llega a `persist_batch_size` noticias o
+        cuando su primera noticia lleva `persist_interval` segundos
+        esperando, lo que ocurra primero.
+        """
+        batch_size = self.config.get('persist_batch_size', 20)
+        interval = self.config.get('persist_interval', 5.0)
+        lote = []
+        inicio_lote = None
+        fin = False
+
+        while not fin:
+            timeout = None if not lote else max(0.0, interval - (time.monotonic() - inicio_lote))
+            try:
+                item = await asyncio.wait_for(entrada.get(), timeout=timeout)
+                if item is _FIN:
+                    fin = True
+                else:
+                    if not lote:
+                        inicio_lote = time.monotonic()
+                    lote.append(item)
+            except asyncio.TimeoutError:
+                pass
+
+            vencido = lote and time.monotonic() - inicio_lote >= interval
+            if lote and (fin or vencido or len(lote) >= batch_size):
+                stats = await asyncio.to_thread(self.persist, lote)
+                for clave in ('insertadas', 'duplicadas', 'errores'):
+                    self.stats[clave] += stats[clave]
+                logger.info(f"   💾 Lote guardado: {stats['insertadas']} insertadas, {stats['duplicadas']} duplicadas")
+                lote = []
+
+    def _imprimir_resumen(self, elapsed: float):
+        """Imprime el resumen final del pipeline."""
+        logger.info(f"{'=' * 60}")
+        logger.info(f"📊 RESUMEN FINAL:")
+        logger.info(f"   URLs a procesar: {self.stats['urls']}")
+        self.scraper.imprimir_ahorros()
+        logger.info(f"   Descargadas: {self.stats['descargadas']}")
+        logger.info(f"   Parseadas: {self.stats['parseadas']}")
+        logger.info(f"   Con keywords: {self.stats['con_keywords']}")
+        if self.near_duplicates and self.near_duplicates.duplicadas:
+            logger.info(f"   🧬 Copias casi idénticas: {self.near_duplicates.duplicadas} "
+                        f"(en {len(self.near_duplicates.clusters)} historias)")
+        if self.ai_filter:
+            logger.info(f"   Relevantes (IA): {self.stats['relevantes']}")
+        logger.info(f"   ✅ Insertadas: {self.stats['insertadas']}")
+        logger.info(f"   ⏭️  Duplicadas (ignoradas): {self.stats['duplicadas']}")
+        if self.stats['errores']:
+            logger.error(f"   ❌ Errores: {self.stats['errores']}")
+        logger.info(f"   ⏱️  TIEMPO TOTAL: {elapsed:.2f}s ({elapsed/60:.2f} min)")
+        logger.info("=" * 60)
@@ -0,0 +1,224 @@
+"""
+Cache persistente de resultados de IA.
+
+Guarda en SQLite (app/db/ai_cache.db) el resultado del análisis de cada
+noticia, con clave en un hash de lo que se le envía al modelo: título,
+subtítulo, cuerpo (primeros 1500 caracteres), prompt de contexto, modelo
+y topics permitidos. Una noticia idéntica no vuelve a llamar a la API.
+
+Si cambia el prompt de contexto o la lista de topics, todas las entradas
+dejan de servir: se detecta al abrir la cache y se vacía.
+
+Cada resultado se guarda además, con el texto analizado, en la tabla
+`ejemplos`, que no se vacía al invalidar la cache: son los ejemplos
+etiquetados (incluidas las no relevantes, que no llegan a news.db) con
+los que se entrena el clasificador local (train_classifier.py).
+
+El filtrado asíncrono usa la cache desde threads (asyncio.to_thread)
+para no bloquear el event loop: la conexión se usa de a uno por vez.
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from app.utils.ai_prompt import BODY_CHARS
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+AI_CACHE_PATH = Path(__file__).resolve().parent.parent / "db" / "ai_cache.db"
+
+
+def _hash(*partes) -> str:
+    """SHA-256 de una secuencia de valores serializables a JSON."""
+    return hashlib.sha256(json.dumps(partes, ensure_ascii=False).encode('utf-8')).hexdigest()
+
+
+def _crear_tablas(conn: sqlite3.Connection):
+    """Crea las tablas (y pasa a `ejemplos` lo guardado antes de que existiera)."""
+    nueva = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ejemplos'"
+    ).fetchone() is None
+    conn.executescript("""
+    CREATE TABLE IF NOT EXISTS meta (
+        key TEXT PRIMARY KEY,
+        value TEXT
+    );
+    CREATE TABLE IF NOT EXISTS ai_cache (
+        key TEXT PRIMARY KEY,
+        model TEXT,
+        title TEXT,
+        subtitle TEXT,
+        body TEXT,
+        result TEXT,
+        created_at REAL
+    );
+    CREATE TABLE IF NOT EXISTS ejemplos (
+        key TEXT PRIMARY KEY,
+        model TEXT,
+        title TEXT,
+        subtitle TEXT,
+        body TEXT,
+        result TEXT,
+        created_at REAL
+    );
+    """)
+    if nueva:
+        for model, title, subtitle, body, result, created_at in conn.execute(
+            "SELECT model, title, subtitle, body, result, created_at FROM ai_cache"
+        ).fetchall():
+            conn.execute(
+                "INSERT OR REPLACE INTO ejemplos (key, model, title, subtitle, body, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (_hash(title, subtitle, body, model), model, title, subtitle, body, result, created_at)
+            )
+    conn.commit()
+
+
+def cargar_ejemplos(model: str, path: Path = AI_CACHE_PATH) -> list[tuple[str, str | None, str, dict]]:
+    """
+    Ejemplos etiquetados por un modelo (para entrenar el clasificador local).
+
+    Args:
+        model: Modelo cuyas decisiones usar (las del simulador se guardan
+               como "fake/<modelo>" y quedan afuera)
+        path: Archivo SQLite de la cache
+
+    Returns:
+        Lista de (title, subtitle, body, resultado)
+    """
+    if not Path(path).exists():
+        return []
+    conn = sqlite3.connect(str(path))
+    try:
+        _crear_tablas(conn)
+        return [
+            (title, subtitle, body, json.loads(result))
+            for title, subtitle, body, result in conn.execute(
+                "SELECT title, subtitle, body, result FROM ejemplos WHERE model = ?", (model,)
+            )
+        ]
+    finally:
+        conn.close()
+
+
+class AICache:
+    """
+    Cache de resultados de IA en SQLite.
+    """
+
+    def __init__(self, context_prompt: str, model: str, topics: list[str], path: Path = AI_CACHE_PATH):
+        """
+        Inicializa la cache (la BD se abre en el primer uso).
+
+        Args:
+            context_prompt: Prompt de contexto del filtrado
+            model: Modelo usado
+            topics: Topics permitidos
+            path: Archivo SQLite de la cache
+        """
+        self.path = Path(path)
+        self.model = model
+        self.config_hash = _hash(context_prompt, list(topics))
+        self._conn = None
+        self._lock = threading.Lock()
+
+        self.stats = {'hits': 0, 'misses': 0}
+
+    def abrir(self):
+        """Abre la BD y la vacía si cambió el prompt o los topics."""
+        with self._lock:
+            self._abrir()
+
+    def _abrir(self):
+        """abrir() con el lock tomado."""
+        if self._conn is not None:
+            return
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        _crear_tablas(self._conn)
+        row = self._conn.execute("SELECT value FROM meta WHERE key = 'config_hash'").fetchone()
+        if row is None or row[0] != self.config_hash:
+            if row is not None:
+                # Los ejemplos para el clasificador local se conservan
+                borradas = self._conn.execute("DELETE FROM ai_cache").rowcount
+                logger.info(f"🗑️ Cache IA invalidada (cambió el prompt o los topics): {borradas} entradas")
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('config_hash', ?)", (self.config_hash,)
+            )
+        self._conn.commit()
+
+    def cerrar(self):
+        """Cierra la BD."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def clave(self, title: str, subtitle: str | None, body: str | None) -> str:
+        """Clave de cache de una noticia."""
+        return _hash(title, subtitle, (body or '')[:BODY_CHARS], self.config_hash, self.model)
+
+    def obtener(self, clave: str) -> dict | None:
+        """
+        Busca un resultado guardado.
+
+        Args:
+            clave: Clave calculada con clave()
+
+        Returns:
+            Dict con los campos del resultado, o None si no está
+        """
+        with self._lock:
+            self._abrir()
+            row = self._conn.execute("SELECT result FROM ai_cache WHERE key = ?", (clave,)).fetchone()
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return json.loads(row[0])
+
+    def guardar(self, clave: str, title: str, subtitle: str | None, body: str | None, resultado: dict):
+        """
+        Guarda un resultado (en la cache y en los ejemplos etiquetados).
+
+        Args:
+            clave: Clave calculada con clave()
+            title: Título analizado
+            subtitle: Subtítulo analizado
+            body: Cuerpo analizado (se guardan los primeros BODY_CHARS)
+            resultado: Campos del resultado
+        """
+        self.guardar_varios([(clave, title, subtitle, body, resultado)])
+
+    def guardar_varios(self, entradas: list[tuple[str, str, str | None, str | None, dict]]):
+        """
+        Guarda varios resultados en una sola transacción.
+
+        Args:
+            entradas: Tuplas (clave, title, subtitle, body, resultado), como
+                      los argumentos de guardar()
+        """
+        if not entradas:
+            return
+        ahora = time.time()
+        cache, ejemplos = [], []
+        for clave, title, subtitle, body, resultado in entradas:
+            body = (body or '')[:BODY_CHARS]
+            datos = (self.model, title, subtitle, body, json.dumps(resultado, ensure_ascii=False), ahora)
+            cache.append((clave, *datos))
+            ejemplos.append((_hash(title, subtitle, body, self.model), *datos))
+        with self._lock:
+            self._abrir()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ai_cache (key, model, title, subtitle, body, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                cache
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO ejemplos (key, model, title, subtitle, body, result, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                ejemplos
+            )
+            self._conn.commit()
@@ -1,11 +1,16 @@
 """
 Módulo de filtrado de noticias mediante IA usando Groq.
 """
+import asyncio
 import json
 from typing import List, Optional
-from dataclasses import dataclass
+from dataclasses import dataclass, asdict
 
 from app.models.noticia import Noticia
+from app.utils.ai_cache import AI_CACHE_PATH, AICache
+from app.utils.ai_prompt import PromptTemplate
+from app.utils.local_classifier import NaiveBayesClassifier, texto_clasificable
+from app.utils.rate_limiter import TokenBucketLimiter
 from config.settings import get_allowed_topics
 from config.logging_config import get_logger
 
@@ -31,106 +36,112 @@ class AIFilterResult:
     # actors: Optional[dict] = None # Actores mencionados y su rol
 
 
-class GroqProvider:
-    """Proveedor para Groq API - Rápido y gratuito."""
+def _es_error(result: AIFilterResult) -> bool:
+    """Indica si el resultado corresponde a un error de la API o del parseo."""
+    return "Error" in (result.reasoning or "")
+
+
+class AIProvider:
+    """
+    Base de los proveedores con API de chat completions (estilo OpenAI).
     
-    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile"):
-        self.api_key = api_key
+    El armado de prompts, el parseo de respuestas y el rate limiting son
+    comunes; cada proveedor solo crea sus clientes (síncrono y asíncrono)
+    con la interfaz client.chat.completions.create(**request).
+    """
+    
+    NOMBRE = "IA"
+    SYSTEM_PROMPT = "Eres un asistente que analiza noticias y responde solo en JSON."
+    MAX_TOKENS = 500
+    
+    def __init__(self, model: str, rate_limiter: TokenBucketLimiter = None):
         self.model = model
+        self.rate_limiter = rate_limiter
+        self.topics = tuple(get_allowed_topics())
+        self.topics_permitidos = frozenset(self.topics)
+        self._plantilla = None
         self._client = None
+        self._async_client = None
+        
+        # Tokens informados por la API ('cached': parte del prompt que el
+        # proveedor sirvió de su cache de prefijos, si la tiene)
+        self.uso = {'prompt': 0, 'cached': 0, 'completion': 0}
     
     def _get_client(self):
-        """Lazy initialization del cliente Groq."""
-        if self._client is None:
-            try:
-                from groq import Groq
-                self._client = Groq(api_key=self.api_key)
-            except ImportError:
-                raise ImportError("Instala groq: pip install groq")
-        return self._client
+        """Cliente síncrono de chat completions."""
+        raise NotImplementedError
+    
+    def _get_async_client(self):
+        """Cliente asíncrono de chat completions."""
+        raise NotImplementedError
+    
+    async def cerrar(self):
+        """Cierra el cliente asíncrono (queda atado al event loop que lo usó)."""
+        if self._async_client is not None:
+            await self._async_client.close()
+            self._async_client = None
+    
+    def plantilla(self, context_prompt: str) -> PromptTemplate:
+        """
+        Plantilla de prompts para el contexto (se arma una vez y se reutiliza).
+        
+        Sus prefijos (plantilla.prefijo_individual / prefijo_lote) son
+        iguales en todos los requests: es lo que pueden cachear las APIs
+        con cache de prompts (en Groq es automático en los modelos que lo
+        soportan; los tokens reutilizados se cuentan en uso['cached']).
+        """
+        if self._plantilla is None or self._plantilla.context_prompt != context_prompt:
+            self._plantilla = PromptTemplate(context_prompt, self.topics)
+        return self._plantilla
     
     def _build_analysis_prompt(self, noticia: Noticia, context_prompt: str) -> str:
         """Construye el prompt para el análisis."""
-
-        # Obtener lista de topics permitidos
-        allowed_topics = get_allowed_topics()
-        topics_str = '", "'.join(allowed_topics)
-
-        return f"""Eres un asistente que filtra noticias según su relevancia para un contexto específico.
-
-CONTEXTO DE FILTRADO:
-{context_prompt}
-
-NOTICIA A ANALIZAR:
-- Título: {noticia.title}
-- Subtítulo: {noticia.subtitle or 'N/A'}
-- Fuente: {noticia.source}
-- Contenido (primeros 1500 caracteres): {noticia.body[:1500] if noticia.body else 'Sin contenido'}
-
-TOPICS PERMITIDOS (debes elegir de esta lista):
-["{topics_str}"]
-
-INSTRUCCIONES:
-Analiza si esta noticia es relevante para el contexto especificado.
-Responde ÚNICAMENTE con un JSON válido (sin markdown, sin ```json):
-
-{{
-    "is_relevant": true/false,
-    "relevance_score": 0.0 a 1.0,
-    "reasoning": "Explicación breve de por qué es o no relevante",
-    "keywords_found": ["lista", "de", "términos", "relevantes", "encontrados"],
-
-    "sentiment": "positiva" | "negativa" | "neutral" | "mixta",
-    "sentiment_score": -1.0 a 1.0,
-    "sentiment_confidence": 0.0 a 1.0
-
-    "tone": "crítico" | "elogioso" | "informativo" | "investigativo" | "sensacionalista"
-
-    "topics": ["elige 1-3 topics de la lista permitida arriba"],
-    "main_topic": "el topic principal (debe estar en topics)"
-}}
-
-GUÍA:
-- **Sentiment**: Tono emocional hacia la gestión (positiva=logros, negativa=críticas, neutral=objetiva, mixta=ambas)
-- **Tone**: Estilo periodístico (informativo=objetivo, crítico=cuestiona, elogioso=alaba, investigativo=profundiza, sensacionalista=exagera)
-- **Topics**: Usa EXACTAMENTE los nombres de la lista permitida
-"""
+        return self.plantilla(context_prompt).individual(noticia)
+    
+    def _build_batch_prompt(self, noticias: List[Noticia], context_prompt: str) -> str:
+        """Construye el prompt para analizar varias noticias en un solo request."""
+        return self.plantilla(context_prompt).lote(noticias)
+    
+    def _limpiar_respuesta(self, response_text: str) -> str:
+        """Quita los posibles bloques de código markdown de la respuesta."""
+        cleaned = response_text.strip()
+        if cleaned.startswith("```"):
+            # Remover bloques de código markdown
+            lines = cleaned.split('\n')
+            cleaned = '\n'.join(lines[1:-1] if lines[-1] == '```' else lines[1:])
+        return cleaned
+    
+    def _result_from_dict(self, data: dict) -> AIFilterResult:
+        """Convierte un objeto JSON de la respuesta en AIFilterResult."""
+        # Filtrar topics no permitidos
+        allowed = self.topics_permitidos
+        topics = [t for t in data.get('topics', []) if t in allowed]
+        main_topic = data.get('main_topic') if data.get('main_topic') in allowed else None
+
+        return AIFilterResult(
+            is_relevant=data.get('is_relevant', False),
+            relevance_score=float(data.get('relevance_score', 0.0)),
+            reasoning=data.get('reasoning', None),
+            keywords_found=data.get('keywords_found', []),
+
+            sentiment=data.get('sentiment', None),
+            sentiment_score=float(data.get('sentiment_score')) if data.get('sentiment_score') is not None else None,
+            sentiment_confidence=float(data.get('sentiment_confidence')) if data.get('sentiment_confidence') is not None else None,
+
+            tone=data.get('tone', None),
+
+            topics=topics,
+            main_topic=main_topic,
+
+            # actors=data.get('actors', {})
+        )
     
     def _parse_response(self, response_text: str) -> AIFilterResult:
         """Parsea la respuesta de la IA a AIFilterResult."""
         try:
-            # Limpiar respuesta de posibles markers de código
-            cleaned = response_text.strip()
-            if cleaned.startswith("```"):
-                # Remover bloques de código markdown
-                lines = cleaned.split('\n')
-                cleaned = '\n'.join(lines[1:-1] if lines[-1] == '```' else lines[1:])
-            
-            data = json.loads(cleaned)
-
-            # Filtrar topics no permitidos
-            allowed = set(get_allowed_topics())
-            topics = [t for t in data.get('topics', []) if t in allowed]
-            main_topic = data.get('main_topic') if data.get('main_topic') in allowed else None
-
-            return AIFilterResult(
-                is_relevant=data.get('is_relevant', False),
-                relevance_score=float(data.get('relevance_score', 0.0)),
-                reasoning=data.get('reasoning', None),
-                keywords_found=data.get('keywords_found', []),
-
-                sentiment=data.get('sentiment', None),
-                sentiment_score=float(data.get('sentiment_score')) if data.get('sentiment_score') is not None else None,
-                sentiment_confidence=float(data.get('sentiment_confidence')) if data.get('sentiment_confidence') is not None else None,
-
-                tone=data.get('tone', None),
-
-                topics=topics,
-                main_topic=main_topic,
-
-                # actors=data.get('actors', {})
-            )
-        except (json.JSONDecodeError, KeyError, ValueError) as e:
+            data = json.loads(self._limpiar_respuesta(response_text))
+            return self._result_from_dict(data)
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError) as e:
             # Fallback si no se puede parsear
             return AIFilterResult(
                 is_relevant=False,
@@ -146,42 +157,175 @@ GUÍA:
                 # actors={}
             )
     
+    def _parse_batch_response(self, response_text: str, cantidad: int) -> List[AIFilterResult] | None:
+        """
+        Parsea la respuesta de un lote.
+        
+        Returns:
+            Un resultado por noticia, en el orden del lote, o None si la
+            respuesta no es un array válido con todos los índices
+        """
+        try:
+            data = json.loads(self._limpiar_respuesta(response_text))
+            if isinstance(data, dict):
+                # Algunos modelos envuelven el array: {"results": [...]}
+                data = next((v for v in data.values() if isinstance(v, list)), None)
+            por_indice = {int(item['index']): self._result_from_dict(item) for item in data}
+            return [por_indice[i] for i in range(cantidad)]
+        except (json.JSONDecodeError, KeyError, ValueError, TypeError, AttributeError):
+            return None
+    
+    def _build_request(self, prompt: str, max_tokens: int = MAX_TOKENS) -> dict:
+        """Arma los parámetros del chat completion."""
+        return {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": self.SYSTEM_PROMPT},
+                {"role": "user", "content": prompt}
+            ],
+            'temperature': 0.1,
+            'max_tokens': max_tokens,
+        }
+    
+    def _estimar_tokens(self, request: dict) -> int:
+        """Estima los tokens de un request (~4 caracteres por token + la respuesta)."""
+        caracteres = sum(len(m['content']) for m in request['messages'])
+        return caracteres // 4 + request['max_tokens']
+    
+    def _error_result(self, e: Exception) -> AIFilterResult:
+        """Resultado a usar cuando falla la llamada a la API."""
+        return AIFilterResult(
+            is_relevant=False,
+            relevance_score=0.0,
+            reasoning=f"Error en {self.NOMBRE} API: {str(e)}",
+            keywords_found=[],
+            sentiment=None,
+            sentiment_score=None,
+            sentiment_confidence=None,
+            tone=None,
+            topics=[],
+            main_topic=None,
+            # actors={}
+        )
+    
     def analyze_relevance(self, noticia: Noticia, context_prompt: str) -> AIFilterResult:
-        """Analiza una noticia usando Groq."""
+        """Analiza una noticia con el modelo."""
         client = self._get_client()
-        prompt = self._build_analysis_prompt(noticia, context_prompt)
+        request = self._build_request(self._build_analysis_prompt(noticia, context_prompt))
         
         try:
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "Eres un asistente que analiza noticias y responde solo en JSON."},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.1,
-                max_tokens=500
-            )
+            response = client.chat.completions.create(**request)
+            self._registrar_uso(response.usage)
             return self._parse_response(response.choices[0].message.content)
         except Exception as e:
-            return AIFilterResult(
-                is_relevant=False,
-                relevance_score=0.0,
-                reasoning=f"Error en Groq API: {str(e)}",
-                keywords_found=[],
-                sentiment=None,
-                sentiment_score=None,
-                sentiment_confidence=None,
-                tone=None,
-                topics=[],
-                main_topic=None,
-                # actors={}
-            )
+            return self._error_result(e)
+    
+    async def analyze_relevance_async(self, noticia: Noticia, context_prompt: str) -> AIFilterResult:
+        """Versión asíncrona de analyze_relevance()."""
+        request = self._build_request(self._build_analysis_prompt(noticia, context_prompt))
+        try:
+            return self._parse_response(await self._completar_async(request))
+        except Exception as e:
+            return self._error_result(e)
+    
+    async def analyze_batch_async(self, noticias: List[Noticia], context_prompt: str) -> List[AIFilterResult] | None:
+        """
+        Analiza varias noticias en un solo request.
+        
+        El contexto, los topics y las instrucciones se envían una sola vez
+        para todo el lote.
+        
+        Returns:
+            Un resultado por noticia (en el mismo orden), o None si falla
+            la llamada o la respuesta no se puede interpretar
+        """
+        request = self._build_request(
+            self._build_batch_prompt(noticias, context_prompt),
+            max_tokens=self.MAX_TOKENS * len(noticias)
+        )
+        try:
+            return self._parse_batch_response(await self._completar_async(request), len(noticias))
+        except Exception as e:
+            logger.warning(f"      ⚠️ Error en {self.NOMBRE} API (lote de {len(noticias)}): {e}")
+            return None
+    
+    async def _completar_async(self, request: dict) -> str:
+        """
+        Ejecuta un chat completion asíncrono y retorna el texto de la respuesta.
+        
+        Respeta el rate_limiter (RPM/TPM) antes de la llamada y le informa
+        los tokens realmente usados.
+        """
+        client = self._get_async_client()
+        tokens = self._estimar_tokens(request)
+        if self.rate_limiter:
+            await self.rate_limiter.adquirir(tokens)
+        response = await client.chat.completions.create(**request)
+        self._registrar_uso(response.usage)
+        if self.rate_limiter and response.usage:
+            self.rate_limiter.ajustar(tokens, response.usage.total_tokens)
+        return response.choices[0].message.content
+    
+    def _registrar_uso(self, usage):
+        """Suma los tokens informados en la respuesta (si los hay)."""
+        if not usage:
+            return
+        self.uso['prompt'] += usage.prompt_tokens or 0
+        self.uso['completion'] += usage.completion_tokens or 0
+        detalles = getattr(usage, 'prompt_tokens_details', None)
+        self.uso['cached'] += getattr(detalles, 'cached_tokens', None) or 0
+
+
+class GroqProvider(AIProvider):
+    """Proveedor para Groq API - Rápido y gratuito."""
+    
+    NOMBRE = "Groq"
+    
+    def __init__(self, api_key: str, model: str = "llama-3.3-70b-versatile",
+                 rate_limiter: TokenBucketLimiter = None):
+        super().__init__(model, rate_limiter)
+        self.api_key = api_key
+    
+    def _get_client(self):
+        """Lazy initialization del cliente Groq."""
+        if self._client is None:
+            try:
+                from groq import Groq
+                self._client = Groq(api_key=self.api_key)
+            except ImportError:
+                raise ImportError("Instala groq: pip install groq")
+        return self._client
+    
+    def _get_async_client(self):
+        """Lazy initialization del cliente asíncrono de Groq."""
+        if self._async_client is None:
+            try:
+                from groq import AsyncGroq
+                self._async_client = AsyncGroq(api_key=self.api_key)
+            except ImportError:
+                raise ImportError("Instala groq: pip install groq")
+        return self._async_client
 
 
 class AIFilter:
     """Clase principal para filtrar noticias usando IA (Groq)."""
     
-    def __init__(self, api_key: str, model: str, context_prompt: str, relevance_threshold: float = 0.6):
+    def __init__(
+        self,
+        api_key: str,
+        model: str,
+        context_prompt: str,
+        relevance_threshold: float = 0.6,
+        max_concurrent: int = 5,
+        rpm: int = None,
+        tpm: int = None,
+        cache: bool = True,
+        batch_size: int = 1,
+        local_classifier: dict = None,
+        provider: str = "groq",
+        provider_options: dict = None,
+        cache_path=AI_CACHE_PATH
+    ):
         """
         Inicializa el filtro de IA.
         
@@ -190,18 +334,213 @@ class AIFilter:
             model: Modelo de Groq a usar
             context_prompt: El prompt con el contexto de filtrado
             relevance_threshold: Umbral mínimo de relevancia (0.0 a 1.0)
+            max_concurrent: Llamadas simultáneas a la API
+            rpm: Requests por minuto permitidos (None = sin límite)
+            tpm: Tokens por minuto permitidos (None = sin límite)
+            cache: Reutilizar resultados guardados en app/db/ai_cache.db
+            batch_size: Noticias por request en filter_noticias (1 = de a una)
+            local_classifier: Configuración del clasificador local previo
+                              (enabled, auto_reject, auto_accept)
+            provider: "groq" o "fake" (simulador local, ver app/utils/fake_llm.py)
+            provider_options: Parámetros del simulador (solo con provider="fake")
+            cache_path: Archivo SQLite de la cache
         """
-        self.provider = GroqProvider(api_key=api_key, model=model)
+        rate_limiter = TokenBucketLimiter(rpm=rpm, tpm=tpm)
+        if provider == "fake":
+            from app.utils.fake_llm import FakeProvider
+            self.provider = FakeProvider(model=model, rate_limiter=rate_limiter, **(provider_options or {}))
+        elif provider == "groq":
+            self.provider = GroqProvider(api_key=api_key, model=model, rate_limiter=rate_limiter)
+        else:
+            raise ValueError(f"Proveedor de IA desconocido: {provider}")
         self.context_prompt = context_prompt
         self.relevance_threshold = relevance_threshold
+        self.max_concurrent = max_concurrent
+        self.batch_size = max(1, batch_size)
+        self.cache = AICache(context_prompt, self.provider.model, self.provider.topics, cache_path) if cache else None
+        
+        # Clasificador local: resuelve los casos claros sin llamar a la API
+        local_classifier = local_classifier or {}
+        self.clasificador = None
+        if local_classifier.get('enabled', False):
+            self.clasificador = NaiveBayesClassifier.cargar()
+            if self.clasificador is None:
+                logger.info("🧮 Clasificador local sin entrenar (python train_classifier.py)")
+        self.auto_reject = local_classifier.get('auto_reject', False)
+        self.auto_accept = local_classifier.get('auto_accept', False)
+        
+        # Noticias casi idénticas (mismo cluster_id): se analiza la primera
+        # y el resto copia su resultado. cluster_id -> resultado, o la
+        # tarea en curso si el análisis todavía no terminó
+        self._por_cluster = {}
         
         # Estadísticas
         self.stats = {
             'total_analyzed': 0,
             'relevant': 0,
             'not_relevant': 0,
-            'errors': 0
+            'errors': 0,
+            'cluster_copies': 0
         }
+        self.local_stats = {'rejected': 0, 'accepted': 0}
+    
+    def analizar_noticia(self, noticia: Noticia) -> bool:
+        """
+        Analiza una noticia, completa sus campos de IA y actualiza las estadísticas.
+        
+        Args:
+            noticia: Noticia a analizar
+            
+        Returns:
+            True si la noticia es relevante
+        """
+        self.stats['total_analyzed'] += 1
+        result = self._resultado_del_cluster(noticia)
+        if result is None:
+            clave, result = self._resultado_previo(noticia)
+            if result is None:
+                result = self.provider.analyze_relevance(noticia, self.context_prompt)
+                self._guardar_en_cache(clave, noticia, result)
+            if noticia.cluster_id:
+                self._por_cluster[noticia.cluster_id] = result
+        return self._aplicar_resultado(noticia, result)
+    
+    async def analizar_noticia_async(self, noticia: Noticia) -> bool:
+        """Versión asíncrona de analizar_noticia()."""
+        self.stats['total_analyzed'] += 1
+        result = self._resultado_del_cluster(noticia)
+        if isinstance(result, asyncio.Future):
+            result = await result
+        if result is None:
+            tarea = asyncio.ensure_future(self._analizar_async(noticia))
+            if noticia.cluster_id:
+                self._por_cluster[noticia.cluster_id] = tarea
+            result = await tarea
+            if noticia.cluster_id:
+                self._por_cluster[noticia.cluster_id] = result
+        return self._aplicar_resultado(noticia, result)
+    
+    async def _analizar_async(self, noticia: Noticia) -> AIFilterResult:
+        """Resultado de la cache, del clasificador local o del LLM."""
+        clave, result = await self._fuera_del_loop(self._resultado_previo, noticia)
+        if result is None:
+            result = await self.provider.analyze_relevance_async(noticia, self.context_prompt)
+            await self._fuera_del_loop(self._guardar_en_cache, clave, noticia, result)
+        return result
+    
+    async def _fuera_del_loop(self, fn, *args):
+        """Ejecuta fn en un thread si usa la cache (SQLite), para no bloquear el event loop."""
+        if self.cache:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+    
+    def _resultado_del_cluster(self, noticia: Noticia):
+        """
+        Resultado del representante del cluster de la noticia, si ya se
+        analizó (o la tarea en curso que lo va a producir).
+        
+        Returns:
+            AIFilterResult, asyncio.Future o None si es la primera del cluster
+        """
+        if not noticia.cluster_id or noticia.cluster_id not in self._por_cluster:
+            return None
+        self.stats['cluster_copies'] += 1
+        logger.debug(f"      🔁 Copia del cluster {noticia.cluster_id}: {noticia.title[:50]}")
+        return self._por_cluster[noticia.cluster_id]
+    
+    def _resultado_previo(self, noticia: Noticia) -> tuple[str | None, AIFilterResult | None]:
+        """
+        Busca un resultado sin llamar a la API: en la cache o con el
+        clasificador local.
+        
+        Returns:
+            Tupla (clave de cache, resultado o None si hay que consultar al LLM)
+        """
+        clave, result = self._buscar_en_cache(noticia)
+        if result is None:
+            result = self._clasificar_localmente(noticia)
+        return clave, result
+    
+    def _clasificar_localmente(self, noticia: Noticia) -> AIFilterResult | None:
+        """Resultado del clasificador local si es concluyente, o None."""
+        if not self.clasificador:
+            return None
+        decision, puntaje = self.clasificador.decidir(
+            texto_clasificable(noticia.title, noticia.subtitle, noticia.body)
+        )
+        if decision is False and self.auto_reject:
+            self.local_stats['rejected'] += 1
+            return AIFilterResult(
+                is_relevant=False,
+                relevance_score=0.0,
+                reasoning=f"Descartada por el clasificador local (puntaje {puntaje:.1f})",
+                keywords_found=[],
+                topics=[],
+            )
+        if decision is True and self.auto_accept:
+            self.local_stats['accepted'] += 1
+            return AIFilterResult(
+                is_relevant=True,
+                relevance_score=1.0,
+                reasoning=f"Aceptada por el clasificador local (puntaje {puntaje:.1f})",
+                keywords_found=[],
+                topics=[],
+            )
+        return None
+    
+    def _buscar_en_cache(self, noticia: Noticia) -> tuple[str | None, AIFilterResult | None]:
+        """Retorna (clave, resultado guardado o None)."""
+        if not self.cache:
+            return None, None
+        clave = self.cache.clave(noticia.title, noticia.subtitle, noticia.body)
+        guardado = self.cache.obtener(clave)
+        return clave, AIFilterResult(**guardado) if guardado else None
+    
+    def _guardar_en_cache(self, clave: str | None, noticia: Noticia, result: AIFilterResult):
+        """Guarda el resultado en la cache (salvo errores, que se reintentan)."""
+        self._guardar_varios_en_cache([(clave, noticia, result)])
+    
+    def _guardar_varios_en_cache(self, entradas: List[tuple[str | None, Noticia, AIFilterResult]]):
+        """Guarda varios resultados (clave, noticia, resultado) en una sola transacción."""
+        if not self.cache:
+            return
+        self.cache.guardar_varios([
+            (clave, noticia.title, noticia.subtitle, noticia.body, asdict(result))
+            for clave, noticia, result in entradas
+            if not _es_error(result)
+        ])
+    
+    def _aplicar_resultado(self, noticia: Noticia, result: AIFilterResult) -> bool:
+        """Copia el resultado de IA a la noticia y actualiza las estadísticas."""
+        # Actualizar noticia con metadatos de IA
+        noticia.ai_decision = result.is_relevant and result.relevance_score >= self.relevance_threshold
+        noticia.ai_relevance_score = result.relevance_score
+        noticia.ai_reasoning = result.reasoning
+        noticia.ai_keywords_found = result.keywords_found
+
+        noticia.ai_sentiment = result.sentiment
+        noticia.ai_sentiment_score = result.sentiment_score
+        noticia.ai_sentiment_confidence = result.sentiment_confidence
+
+        noticia.ai_tone = result.tone
+
+        noticia.ai_topics = result.topics
+        noticia.ai_main_topic = result.main_topic
+
+        # noticia.ai_actors = result.actors
+        
+        if _es_error(result):
+            self.stats['errors'] += 1
+            logger.warning(f"      ⚠️ Error: {result.reasoning}")
+            return False
+        elif noticia.ai_decision:
+            self.stats['relevant'] += 1
+            logger.info(f"      ✅ Relevante (score: {result.relevance_score:.2f})")
+            return True
+        else:
+            self.stats['not_relevant'] += 1
+            logger.info(f"      ❌ No relevante (score: {result.relevance_score:.2f})")
+            return False
     
     def filter_noticias(self, noticias: List[Noticia]) -> List[Noticia]:
         """
@@ -209,7 +548,6 @@ class AIFilter:
         
         Args:
             noticias: Lista de noticias a filtrar
-            verbose: Si mostrar progreso
             
         Returns:
             Lista de noticias relevantes
@@ -217,48 +555,127 @@ class AIFilter:
         if not noticias:
             return []
         
-        relevant_noticias = []
-        total = len(noticias)
+        async def filtrar():
+            try:
+                return await self.filter_noticias_async(noticias)
+            finally:
+                await self.cerrar()
         
-        for i, noticia in enumerate(noticias, 1):
-            logger.info(f"   🤖 Analizando [{i}/{total}]: {noticia.title[:50]}...")
+        return asyncio.run(filtrar())
+    
+    async def filter_noticias_async(self, noticias: List[Noticia]) -> List[Noticia]:
+        """
+        Filtra una lista de noticias con llamadas concurrentes a la API.
+        
+        Hace hasta `max_concurrent` llamadas a la vez, respetando los
+        límites RPM/TPM. Con batch_size > 1 cada llamada analiza un lote
+        de noticias. El resultado mantiene el orden de entrada.
+        
+        Args:
+            noticias: Lista de noticias a filtrar
             
+        Returns:
+            Lista de noticias relevantes
+        """
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+        total = len(noticias)
+        
+        if self.batch_size > 1:
+            relevantes = await self._filtrar_en_lotes(noticias, semaphore)
+            return [noticia for noticia, relevante in zip(noticias, relevantes) if relevante]
+        
+        async def analizar(i: int, noticia: Noticia) -> bool:
+            async with semaphore:
+                logger.info(f"   🤖 Analizando [{i}/{total}]: {noticia.title[:50]}...")
+                return await self.analizar_noticia_async(noticia)
+        
+        relevantes = await asyncio.gather(*[
+            analizar(i, noticia) for i, noticia in enumerate(noticias, 1)
+        ])
+        return [noticia for noticia, relevante in zip(noticias, relevantes) if relevante]
+    
+    async def _filtrar_en_lotes(self, noticias: List[Noticia], semaphore: asyncio.Semaphore) -> List[bool]:
+        """
+        Analiza las noticias en lotes de `batch_size` por request.
+        
+        Las noticias que están en cache no se envían, y de cada cluster de
+        casi idénticas se envía solo la primera. Si la respuesta de un lote
+        no se puede interpretar, sus noticias se analizan de a una.
+        
+        Returns:
+            Lista de booleanos (relevante o no), en el orden de entrada
+        """
+        copia_de = {}  # índice -> índice del representante de su cluster
+        representantes = {}  # cluster_id -> índice
+        for i, noticia in enumerate(noticias):
+            if noticia.cluster_id in representantes:
+                copia_de[i] = representantes[noticia.cluster_id]
+            elif noticia.cluster_id:
+                representantes[noticia.cluster_id] = i
+        
+        def buscar_previos() -> List[tuple]:
+            return [
+                (None, None) if i in copia_de else self._resultado_previo(noticia)
+                for i, noticia in enumerate(noticias)
+            ]
+        
+        previos = await self._fuera_del_loop(buscar_previos)
+        claves = [clave for clave, _ in previos]
+        resultados = [result for _, result in previos]
+        pendientes = [i for i, result in enumerate(resultados) if result is None and i not in copia_de]
+        
+        async def analizar_una(noticia: Noticia) -> AIFilterResult:
+            async with semaphore:
+                return await self.provider.analyze_relevance_async(noticia, self.context_prompt)
+        
+        async def analizar_lote(indices: List[int]):
+            lote = [noticias[i] for i in indices]
+            async with semaphore:
+                logger.info(f"   🤖 Analizando lote de {len(lote)} noticias: {lote[0].title[:40]}...")
+                results = await self.provider.analyze_batch_async(lote, self.context_prompt)
+            if results is None:
+                logger.warning(f"      ⚠️ Respuesta del lote inválida, analizando sus {len(lote)} noticias de a una")
+                results = await asyncio.gather(*[analizar_una(noticia) for noticia in lote])
+            for i, result in zip(indices, results):
+                resultados[i] = result
+            await self._fuera_del_loop(
+                self._guardar_varios_en_cache,
+                [(claves[i], noticias[i], result) for i, result in zip(indices, results)]
+            )
+        
+        await asyncio.gather(*[
+            analizar_lote(pendientes[inicio:inicio + self.batch_size])
+            for inicio in range(0, len(pendientes), self.batch_size)
+        ])
+        
+        for i, representante in copia_de.items():
+            resultados[i] = resultados[representante]
+        self.stats['cluster_copies'] += len(copia_de)
+        
+        relevantes = []
+        for noticia, result in zip(noticias, resultados):
             self.stats['total_analyzed'] += 1
-            result = self.provider.analyze_relevance(noticia, self.context_prompt)
-            
-            # Actualizar noticia con metadatos de IA
-            noticia.ai_decision = result.is_relevant and result.relevance_score >= self.relevance_threshold
-            noticia.ai_relevance_score = result.relevance_score
-            noticia.ai_reasoning = result.reasoning
-            noticia.ai_keywords_found = result.keywords_found
-
-            noticia.ai_sentiment = result.sentiment
-            noticia.ai_sentiment_score = result.sentiment_score
-            noticia.ai_sentiment_confidence = result.sentiment_confidence
-
-            noticia.ai_tone = result.tone
-
-            noticia.ai_topics = result.topics
-            noticia.ai_main_topic = result.main_topic
-
-            # noticia.ai_actors = result.actors
-            
-            if "Error" in result.reasoning:
-                self.stats['errors'] += 1
-                logger.warning(f"      ⚠️ Error: {result.reasoning}")
-            elif noticia.ai_decision:
-                self.stats['relevant'] += 1
-                relevant_noticias.append(noticia)
-                logger.info(f"      ✅ Relevante (score: {result.relevance_score:.2f})")
-            else:
-                self.stats['not_relevant'] += 1
-                logger.info(f"      ❌ No relevante (score: {result.relevance_score:.2f})")
-        
-        return relevant_noticias
+            relevantes.append(self._aplicar_resultado(noticia, result))
+        return relevantes
+    
+    async def cerrar(self):
+        """Libera el cliente asíncrono del proveedor y la cache."""
+        self._por_cluster.clear()
+        await self.provider.cerrar()
+        if self.cache:
+            await asyncio.to_thread(self.cache.cerrar)
     
     def get_stats(self) -> dict:
-        """Retorna estadísticas del filtrado."""
-        return self.stats.copy()
+        """Retorna estadísticas del filtrado (incluye aciertos de cache y copias por cluster)."""
+        stats = self.stats.copy()
+        stats['cache_hits'] = self.cache.stats['hits'] if self.cache else 0
+        stats['cache_misses'] = self.cache.stats['misses'] if self.cache else 0
+        stats['local_rejected'] = self.local_stats['rejected']
+        stats['local_accepted'] = self.local_stats['accepted']
+        stats['prompt_tokens'] = self.provider.uso['prompt']
+        stats['cached_tokens'] = self.provider.uso['cached']
+        stats['completion_tokens'] = self.provider.uso['completion']
+        return stats
 
 
 def get_ai_filter(config: dict) -> Optional[AIFilter]:
@@ -278,5 +695,13 @@ def get_ai_filter(config: dict) -> Optional[AIFilter]:
         api_key=config.get('api_key', ''),
         model=config.get('model', 'llama-3.3-70b-versatile'),
         context_prompt=config.get('context_prompt', ''),
-        relevance_threshold=config.get('relevance_threshold', 0.6)
+        relevance_threshold=config.get('relevance_threshold', 0.6),
+        max_concurrent=config.get('max_concurrent', 5),
+        rpm=config.get('rpm'),
+        tpm=config.get('tpm'),
+        cache=config.get('cache', True),
+        batch_size=config.get('batch_size', 1),
+        local_classifier=config.get('local_classifier'),
+        provider=config.get('provider', 'groq'),
+        provider_options=config.get('fake')
     )
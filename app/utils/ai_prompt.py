@@ -0,0 +1,114 @@
+"""
+Plantilla precompilada de los prompts de análisis.
+
+Todo lo que no depende de la noticia (contexto de filtrado, topics
+permitidos, instrucciones y formato de respuesta) se arma una sola vez
+y va al principio del prompt; la noticia va al final. Así cada prompt
+es una concatenación de dos strings, y todos los requests comparten el
+mismo prefijo, que las APIs con cache de prompts (prefix caching) pueden
+reutilizar entre requests.
+"""
+from typing import Iterable, List
+
+from app.models.noticia import Noticia
+
+# Caracteres del cuerpo que se envían al modelo. La cache de IA, el
+# clasificador local y la huella de casi-duplicados usan los mismos
+# (importan esta constante): la clave de la cache depende de que coincida
+BODY_CHARS = 1500
+
+# Campos que el modelo debe devolver por noticia (se comparte entre el
+# prompt individual y el de lotes)
+_CAMPOS_RESULTADO = """    "is_relevant": true/false,
+    "relevance_score": 0.0 a 1.0,
+    "reasoning": "Explicación breve de por qué es o no relevante",
+    "keywords_found": ["lista", "de", "términos", "relevantes", "encontrados"],
+
+    "sentiment": "positiva" | "negativa" | "neutral" | "mixta",
+    "sentiment_score": -1.0 a 1.0,
+    "sentiment_confidence": 0.0 a 1.0
+
+    "tone": "crítico" | "elogioso" | "informativo" | "investigativo" | "sensacionalista"
+
+    "topics": ["elige 1-3 topics de la lista permitida arriba"],
+    "main_topic": "el topic principal (debe estar en topics)\""""
+
+_GUIA_RESULTADO = """GUÍA:
+- **Sentiment**: Tono emocional hacia la gestión (positiva=logros, negativa=críticas, neutral=objetiva, mixta=ambas)
+- **Tone**: Estilo periodístico (informativo=objetivo, crítico=cuestiona, elogioso=alaba, investigativo=profundiza, sensacionalista=exagera)
+- **Topics**: Usa EXACTAMENTE los nombres de la lista permitida"""
+
+
+def formato_noticia(noticia: Noticia) -> str:
+    """Datos de la noticia tal como se incluyen en el prompt."""
+    return (
+        f"- Título: {noticia.title}\n"
+        f"- Subtítulo: {noticia.subtitle or 'N/A'}\n"
+        f"- Fuente: {noticia.source}\n"
+        f"- Contenido (primeros {BODY_CHARS} caracteres): "
+        f"{noticia.body[:BODY_CHARS] if noticia.body else 'Sin contenido'}"
+    )
+
+
+class PromptTemplate:
+    """
+    Prompts de análisis (individual y por lotes) para un contexto y una
+    lista de topics fijos.
+    """
+
+    def __init__(self, context_prompt: str, topics: Iterable[str]):
+        """
+        Arma los prefijos fijos.
+
+        Args:
+            context_prompt: Prompt con el contexto de filtrado
+            topics: Topics permitidos
+        """
+        self.context_prompt = context_prompt
+        self.topics = tuple(topics)
+
+        topics_str = '", "'.join(self.topics)
+        encabezado = f"""Eres un asistente que filtra noticias según su relevancia para un contexto específico.
+
+CONTEXTO DE FILTRADO:
+{context_prompt}
+
+TOPICS PERMITIDOS (debes elegir de esta lista):
+["{topics_str}"]
+
+INSTRUCCIONES:
+"""
+        self.prefijo_individual = encabezado + f"""Analiza si la noticia (al final) es relevante para el contexto especificado.
+Responde ÚNICAMENTE con un JSON válido (sin markdown, sin ```json):
+
+{{
+{_CAMPOS_RESULTADO}
+}}
+
+{_GUIA_RESULTADO}
+
+NOTICIA A ANALIZAR:
+"""
+        self.prefijo_lote = encabezado + f"""Analiza POR SEPARADO si cada noticia (al final) es relevante para el contexto especificado.
+Responde ÚNICAMENTE con un array JSON válido (sin markdown, sin ```json), con un
+objeto por noticia, donde "index" es el número entre corchetes de la noticia:
+
+[
+  {{
+    "index": 0,
+{_CAMPOS_RESULTADO}
+  }}
+]
+
+{_GUIA_RESULTADO}
+
+"""
+
+    def individual(self, noticia: Noticia) -> str:
+        """Prompt para analizar una noticia."""
+        return self.prefijo_individual + formato_noticia(noticia)
+
+    def lote(self, noticias: List[Noticia]) -> str:
+        """Prompt para analizar varias noticias en un solo request."""
+        bloques = "\n\n".join(f"[{i}]\n{formato_noticia(noticia)}" for i, noticia in enumerate(noticias))
+        return f"{self.prefijo_lote}NOTICIAS A ANALIZAR ({len(noticias)}):\n{bloques}"
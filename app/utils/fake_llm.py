@@ -0,0 +1,298 @@
+"""
+Simulador local de una API de chat completions (estilo Groq/OpenAI).
+
+Permite probar y medir la etapa de IA sin red ni API key: FakeProvider
+se usa igual que GroqProvider (AI_CONFIG["provider"] = "fake") y sus
+clientes exponen client.chat.completions.create(**request), con la misma
+forma de respuesta (choices[0].message.content y usage).
+
+Comportamiento configurable (AI_CONFIG["fake"]):
+- latency: (mín, máx) segundos de cada respuesta
+- error_rate: fracción de requests que fallan con 500
+- rate_limit_rate: fracción de requests rechazados con 429 al azar
+- rpm_limit: requests por minuto que acepta el "servidor" (ventana de
+  60 s); el excedente recibe 429 con retry_after, como la API real
+- invalid_json_rate: fracción de respuestas que no son JSON válido
+- relevant_rate: fracción de noticias que el modelo simulado considera
+  relevantes
+- max_retries: reintentos del cliente ante 429 y 5xx (el SDK de Groq
+  reintenta 2 veces, respetando retry_after)
+- seed: semilla de las fallas simuladas
+
+También simula la cache de prompts por prefijo: la parte inicial del
+prompt que coincide con el request anterior se informa como
+usage.prompt_tokens_details.cached_tokens.
+
+La decisión sobre cada noticia depende solo de su título (hash), así que
+es la misma entre corridas y con cualquier concurrencia. Las decisiones
+son inventadas: no usar este proveedor para guardar noticias reales.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import random
+import re
+import time
+from collections import deque
+from types import SimpleNamespace
+
+from app.utils.ai_filter import AIProvider
+from app.utils.rate_limiter import TokenBucketLimiter
+from config.settings import get_allowed_topics
+
+_TITULO = re.compile(r'^(?:\[(\d+)\]\n)?- Título: (.*)$', re.MULTILINE)
+
+_SENTIMIENTOS = ["positiva", "negativa", "neutral", "mixta"]
+_TONOS = ["informativo", "crítico", "elogioso", "investigativo", "sensacionalista"]
+
+
+class FakeLLMError(Exception):
+    """Error HTTP simulado (mismo formato de mensaje que el SDK de Groq)."""
+
+    def __init__(self, status_code: int, mensaje: str, retry_after: float | None = None):
+        super().__init__(f"Error code: {status_code} - {mensaje}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class FakeLLMServer:
+    """
+    "Servidor" simulado: decide latencia y fallas de cada request y arma
+    la respuesta. Compartido por los clientes síncrono y asíncrono.
+    """
+
+    def __init__(
+        self,
+        latency: tuple[float, float] = (0.3, 1.2),
+        error_rate: float = 0.0,
+        rate_limit_rate: float = 0.0,
+        rpm_limit: int | None = None,
+        invalid_json_rate: float = 0.0,
+        relevant_rate: float = 0.3,
+        seed: int = 0,
+    ):
+        self.latency = tuple(latency)
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.rpm_limit = rpm_limit
+        self.invalid_json_rate = invalid_json_rate
+        self.relevant_rate = relevant_rate
+        self._random = random.Random(seed)
+        self._aceptados = deque()  # instantes de los requests aceptados (rpm_limit)
+        self._en_curso = 0
+        self._prompt_anterior = ""
+
+        self.stats = {
+            'requests': 0,
+            'ok': 0,
+            'rate_limited': 0,
+            'server_errors': 0,
+            'invalid_json': 0,
+            'retries': 0,
+            'prompt_tokens': 0,
+            'cached_tokens': 0,
+            'completion_tokens': 0,
+            'max_concurrent': 0,
+        }
+
+    def _admitir(self) -> tuple[float, bool, bool]:
+        """
+        Registra un request y sortea su suerte.
+
+        Returns:
+            Tupla (latencia, falla con 500, respuesta inválida)
+
+        Raises:
+            FakeLLMError: 429 si supera el límite o sale sorteado
+        """
+        self.stats['requests'] += 1
+        # Siempre los mismos sorteos por request, para que la secuencia
+        # sea reproducible sin importar qué rama se toma
+        sorteo_429, sorteo_500, sorteo_json = (self._random.random() for _ in range(3))
+        latencia = self._random.uniform(*self.latency)
+
+        ahora = time.monotonic()
+        if self.rpm_limit:
+            while self._aceptados and ahora - self._aceptados[0] >= 60:
+                self._aceptados.popleft()
+            if len(self._aceptados) >= self.rpm_limit:
+                self.stats['rate_limited'] += 1
+                raise FakeLLMError(429, "rate_limit_exceeded (rpm)", retry_after=60 - (ahora - self._aceptados[0]))
+        if sorteo_429 < self.rate_limit_rate:
+            self.stats['rate_limited'] += 1
+            raise FakeLLMError(429, "rate_limit_exceeded", retry_after=1.0)
+        self._aceptados.append(ahora)
+        return latencia, sorteo_500 < self.error_rate, sorteo_json < self.invalid_json_rate
+
+    def _empezar(self):
+        """Marca un request en curso (para medir la concurrencia real)."""
+        self._en_curso += 1
+        self.stats['max_concurrent'] = max(self.stats['max_concurrent'], self._en_curso)
+
+    def _responder(self, request: dict, falla: bool, invalida: bool) -> SimpleNamespace:
+        """Arma la respuesta (o lanza el 500 sorteado)."""
+        self._en_curso -= 1
+        if falla:
+            self.stats['server_errors'] += 1
+            raise FakeLLMError(500, "internal_server_error")
+
+        prompt = request['messages'][-1]['content']
+        if invalida:
+            self.stats['invalid_json'] += 1
+            contenido = "Lo siento, no puedo analizar esta noticia."
+        else:
+            contenido = self._contenido(prompt)
+        self.stats['ok'] += 1
+
+        texto = "".join(m['content'] for m in request['messages'])
+        prompt_tokens = len(texto) // 4
+        cached_tokens = len(os.path.commonprefix([texto, self._prompt_anterior])) // 4
+        self._prompt_anterior = texto
+        completion_tokens = len(contenido) // 4
+        self.stats['prompt_tokens'] += prompt_tokens
+        self.stats['cached_tokens'] += cached_tokens
+        self.stats['completion_tokens'] += completion_tokens
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=contenido))],
+            usage=SimpleNamespace(
+                prompt_tokens=prompt_tokens,
+                completion_tokens=completion_tokens,
+                total_tokens=prompt_tokens + completion_tokens,
+                prompt_tokens_details=SimpleNamespace(cached_tokens=cached_tokens),
+            ),
+        )
+
+    def _contenido(self, prompt: str) -> str:
+        """JSON de respuesta: un objeto, o un array si el prompt es un lote."""
+        noticias = _TITULO.findall(prompt)
+        if noticias and noticias[0][0]:
+            return json.dumps(
+                [{'index': int(indice), **self._resultado(titulo)} for indice, titulo in noticias],
+                ensure_ascii=False
+            )
+        titulo = noticias[0][1] if noticias else prompt
+        return json.dumps(self._resultado(titulo), ensure_ascii=False)
+
+    def _resultado(self, titulo: str) -> dict:
+        """Resultado determinístico para una noticia (según el hash del título)."""
+        semilla = hashlib.sha256(titulo.encode('utf-8')).digest()
+        fraccion = int.from_bytes(semilla[:4], 'big') / 2 ** 32
+        relevante = fraccion < self.relevant_rate
+        topics = get_allowed_topics()
+        elegidos = [topics[b % len(topics)] for b in semilla[4:4 + 1 + semilla[7] % 3]]
+        return {
+            'is_relevant': relevante,
+            'relevance_score': round(0.6 + 0.4 * semilla[8] / 255 if relevante else 0.5 * semilla[8] / 255, 2),
+            'reasoning': "Resultado simulado",
+            'keywords_found': [],
+            'sentiment': _SENTIMIENTOS[semilla[9] % len(_SENTIMIENTOS)],
+            'sentiment_score': round(semilla[10] / 127.5 - 1, 2),
+            'sentiment_confidence': round(semilla[11] / 255, 2),
+            'tone': _TONOS[semilla[12] % len(_TONOS)],
+            'topics': list(dict.fromkeys(elegidos)),
+            'main_topic': elegidos[0],
+        }
+
+    def atender(self, request: dict) -> SimpleNamespace:
+        """Atiende un request de forma síncrona."""
+        latencia, falla, invalida = self._admitir()
+        self._empezar()
+        time.sleep(latencia)
+        return self._responder(request, falla, invalida)
+
+    async def atender_async(self, request: dict) -> SimpleNamespace:
+        """Atiende un request de forma asíncrona."""
+        latencia, falla, invalida = self._admitir()
+        self._empezar()
+        try:
+            await asyncio.sleep(latencia)
+        except BaseException:
+            self._en_curso -= 1
+            raise
+        return self._responder(request, falla, invalida)
+
+
+def _espera_reintento(error: FakeLLMError, intento: int) -> float:
+    """Segundos antes de reintentar: retry_after o backoff exponencial (como el SDK)."""
+    if error.retry_after is not None:
+        return error.retry_after
+    return min(0.5 * 2 ** intento, 8.0)
+
+
+def _reintentable(error: FakeLLMError) -> bool:
+    """Errores que el SDK reintenta: 408, 409, 429 y 5xx."""
+    return error.status_code in (408, 409, 429) or error.status_code >= 500
+
+
+class FakeClient:
+    """Cliente síncrono con la interfaz client.chat.completions.create()."""
+
+    def __init__(self, server: FakeLLMServer, max_retries: int = 2):
+        self.server = server
+        self.max_retries = max_retries
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **request) -> SimpleNamespace:
+        for intento in range(self.max_retries + 1):
+            try:
+                return self.server.atender(request)
+            except FakeLLMError as e:
+                if intento == self.max_retries or not _reintentable(e):
+                    raise
+                self.server.stats['retries'] += 1
+                time.sleep(_espera_reintento(e, intento))
+
+
+class FakeAsyncClient:
+    """Cliente asíncrono con la interfaz client.chat.completions.create()."""
+
+    def __init__(self, server: FakeLLMServer, max_retries: int = 2):
+        self.server = server
+        self.max_retries = max_retries
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    async def _create(self, **request) -> SimpleNamespace:
+        for intento in range(self.max_retries + 1):
+            try:
+                return await self.server.atender_async(request)
+            except FakeLLMError as e:
+                if intento == self.max_retries or not _reintentable(e):
+                    raise
+                self.server.stats['retries'] += 1
+                await asyncio.sleep(_espera_reintento(e, intento))
+
+    async def close(self):
+        """Nada que liberar (misma interfaz que AsyncGroq)."""
+
+
+class FakeProvider(AIProvider):
+    """Proveedor simulado, sin red ni API key (para benchmarks y pruebas)."""
+
+    NOMBRE = "Fake"
+
+    def __init__(self, model: str = "simulado", rate_limiter: TokenBucketLimiter = None,
+                 max_retries: int = 2, **opciones):
+        """
+        Inicializa el proveedor.
+
+        Args:
+            model: Nombre del modelo (se guarda como "fake/<model>", para no
+                   mezclar sus resultados con los reales en la cache)
+            rate_limiter: Limitador RPM/TPM del lado del cliente
+            max_retries: Reintentos ante 429 y 5xx
+            **opciones: Parámetros de FakeLLMServer
+        """
+        super().__init__(f"fake/{model}", rate_limiter)
+        self.max_retries = max_retries
+        self.server = FakeLLMServer(**opciones)
+
+    def _get_client(self):
+        if self._client is None:
+            self._client = FakeClient(self.server, self.max_retries)
+        return self._client
+
+    def _get_async_client(self):
+        if self._async_client is None:
+            self._async_client = FakeAsyncClient(self.server, self.max_retries)
+        return self._async_client
@@ -0,0 +1,138 @@
+"""
+Búsqueda de múltiples keywords en una sola pasada.
+
+La lista de keywords se compila una vez en un autómata Aho-Corasick y
+cada texto se recorre una sola vez, obteniendo todas las keywords que
+aparecen con su posición.
+
+Keywords y textos pasan por la misma tabla de plegado
+(text_utils.normalizar_busqueda): "Concepción", "CONCEPCION" y
+"concepcion" son la misma keyword, así que alcanza con escribir cada una
+una sola vez.
+
+El autómata usa pyahocorasick (implementado en C, en requirements.txt).
+Si no está instalado se usa, con un warning, una búsqueda de subcadenas
+(str.find) con la misma interfaz y resultados, pero que recorre el texto
+una vez por keyword. Un autómata escrito en Python puro sería varias
+veces más lento que eso en CPython.
+"""
+from dataclasses import dataclass
+from typing import Iterable
+
+from app.utils.text_utils import normalizar_busqueda
+from config.logging_config import get_logger
+
+try:
+    import ahocorasick
+except ImportError:  # pragma: no cover - depende del entorno
+    ahocorasick = None
+
+logger = get_logger(__name__)
+
+# Para avisar una sola vez que falta pyahocorasick
+_aviso_fallback = False
+
+
+def _avisar_fallback():
+    """Avisa (una vez) que se usa str.find en lugar del autómata."""
+    global _aviso_fallback
+    if not _aviso_fallback:
+        _aviso_fallback = True
+        logger.warning("⚠️ pyahocorasick no instalado, búsqueda de keywords con str.find "
+                       "(una pasada por keyword): pip install pyahocorasick")
+
+
+@dataclass(frozen=True)
+class KeywordMatch:
+    """
+    Una keyword encontrada en texto[start:end].
+
+    `keyword` es la forma normalizada (minúsculas, sin tildes).
+    """
+    keyword: str
+    start: int
+    end: int
+
+
+class KeywordMatcher:
+    """
+    Busca una lista fija de keywords (sin distinguir mayúsculas ni tildes).
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        """
+        Compila las keywords.
+
+        Args:
+            keywords: Keywords a buscar (se ignoran vacías y las que
+                      normalizadas repiten a otra)
+        """
+        self.keywords = list(dict.fromkeys(normalizar_busqueda(k) for k in keywords if k))
+
+        self._automaton = None
+        if ahocorasick is None:
+            _avisar_fallback()
+        elif self.keywords:
+            self._automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                self._automaton.add_word(keyword, keyword)
+            self._automaton.make_automaton()
+
+    @property
+    def backend(self) -> str:
+        """Implementación en uso: "ahocorasick" o "str.find"."""
+        return "ahocorasick" if self._automaton is not None else "str.find"
+
+    def buscar(self, texto: str) -> list[KeywordMatch]:
+        """
+        Busca todas las apariciones de las keywords.
+
+        Args:
+            texto: Texto donde buscar
+
+        Returns:
+            Lista de KeywordMatch ordenada por posición (incluye
+            apariciones superpuestas, ej: "laciar" dentro de "susana laciar")
+        """
+        texto = normalizar_busqueda(texto)
+        if self._automaton is not None:
+            matches = [
+                KeywordMatch(keyword, end - len(keyword) + 1, end + 1)
+                for end, keyword in self._automaton.iter(texto)
+            ]
+        else:
+            matches = []
+            for keyword in self.keywords:
+                start = texto.find(keyword)
+                while start != -1:
+                    matches.append(KeywordMatch(keyword, start, start + len(keyword)))
+                    start = texto.find(keyword, start + 1)
+        matches.sort(key=lambda m: (m.start, m.end))
+        return matches
+
+    def contiene(self, texto: str) -> bool:
+        """
+        Verifica si aparece alguna keyword (corta en la primera).
+
+        Args:
+            texto: Texto donde buscar
+
+        Returns:
+            True si el texto contiene al menos una keyword
+        """
+        texto = normalizar_busqueda(texto)
+        if self._automaton is not None:
+            return next(self._automaton.iter(texto), None) is not None
+        return any(keyword in texto for keyword in self.keywords)
+
+    def encontradas(self, texto: str) -> list[str]:
+        """
+        Retorna las keywords distintas que aparecen, en orden de aparición.
+
+        Args:
+            texto: Texto donde buscar
+
+        Returns:
+            Lista de keywords sin repetir
+        """
+        return list(dict.fromkeys(m.keyword for m in self.buscar(texto)))
@@ -0,0 +1,195 @@
+"""
+Clasificador local de relevancia (Naive Bayes) previo al LLM.
+
+Se entrena con las decisiones que ya tomó el modelo (noticias guardadas
+en news.db y resultados de app/db/ai_cache.db) y se usa como primer
+filtro: las noticias claramente irrelevantes (o claramente relevantes)
+se resuelven localmente y solo las dudosas llegan a Groq.
+
+Los umbrales se eligen al entrenar a partir de validación cruzada, para
+un recall fijo: ej. con recall 0.98, a lo sumo el 2% de las noticias
+relevantes se descartaría sin consultar al LLM.
+
+Entrenamiento y evaluación: python train_classifier.py
+"""
+import json
+import math
+import re
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+
+from app.utils.ai_prompt import BODY_CHARS
+from app.utils.text_utils import normalizar_busqueda
+from config.logging_config import get_logger
+
+logger = get_logger(__name__)
+
+CLASSIFIER_PATH = Path(__file__).resolve().parent.parent / "db" / "local_classifier.json"
+
+_TOKEN = re.compile(r'[a-z0-9ñ]{3,}')
+
+
+def texto_clasificable(title: str, subtitle: str | None, body: str | None) -> str:
+    """Texto de una noticia tal como lo usa el clasificador."""
+    return f"{title} {subtitle or ''} {(body or '')[:BODY_CHARS]}"
+
+
+def tokenizar(texto: str) -> set[str]:
+    """Palabras (3+ caracteres, sin tildes ni mayúsculas) presentes en el texto."""
+    return set(_TOKEN.findall(normalizar_busqueda(texto)))
+
+
+class NaiveBayesClassifier:
+    """
+    Naive Bayes multinomial binarizado (cada palabra cuenta una vez por
+    noticia) con suavizado de Laplace.
+
+    puntaje() retorna el log-odds de relevancia: > 0 favorece "relevante".
+    """
+
+    def __init__(self):
+        self.conteos: dict[str, list[int]] = {}  # palabra -> [en relevantes, en no relevantes]
+        self.docs = [0, 0]
+        self.umbral_rechazo: float | None = None
+        self.umbral_aceptacion: float | None = None
+        self.metricas: dict = {}
+        self._log_probs: dict[str, float] = {}
+        self._prior = 0.0
+
+    @property
+    def entrenado(self) -> bool:
+        """Indica si el modelo tiene ejemplos de ambas clases."""
+        return self.docs[0] > 0 and self.docs[1] > 0
+
+    def entrenar(self, textos: list[str], etiquetas: list[bool]):
+        """
+        Entrena el modelo desde cero.
+
+        Args:
+            textos: Textos de las noticias
+            etiquetas: True si la noticia es relevante
+        """
+        conteos = {True: Counter(), False: Counter()}
+        self.docs = [0, 0]
+        for texto, relevante in zip(textos, etiquetas):
+            conteos[relevante].update(tokenizar(texto))
+            self.docs[0 if relevante else 1] += 1
+
+        vocabulario = conteos[True].keys() | conteos[False].keys()
+        self.conteos = {palabra: [conteos[True][palabra], conteos[False][palabra]] for palabra in vocabulario}
+        self._precalcular()
+
+    def _precalcular(self):
+        """Calcula el log-odds de cada palabra y el prior."""
+        if not self.entrenado:
+            self._log_probs = {}
+            self._prior = 0.0
+            return
+        total = [sum(c[0] for c in self.conteos.values()), sum(c[1] for c in self.conteos.values())]
+        v = len(self.conteos)
+        self._log_probs = {
+            palabra: math.log((c[0] + 1) / (total[0] + v)) - math.log((c[1] + 1) / (total[1] + v))
+            for palabra, c in self.conteos.items()
+        }
+        self._prior = math.log(self.docs[0] / self.docs[1])
+
+    def puntaje(self, texto: str) -> float:
+        """Log-odds de que la noticia sea relevante."""
+        return self._prior + sum(self._log_probs.get(palabra, 0.0) for palabra in tokenizar(texto))
+
+    def decidir(self, texto: str) -> tuple[bool | None, float]:
+        """
+        Decide localmente si el puntaje es concluyente.
+
+        Args:
+            texto: Texto de la noticia (ver texto_clasificable)
+
+        Returns:
+            Tupla (decisión, puntaje). La decisión es True (aceptar),
+            False (rechazar) o None (dudosa: consultar al LLM).
+        """
+        puntaje = self.puntaje(texto)
+        if self.umbral_rechazo is not None and puntaje < self.umbral_rechazo:
+            return False, puntaje
+        if self.umbral_aceptacion is not None and puntaje > self.umbral_aceptacion:
+            return True, puntaje
+        return None, puntaje
+
+    def guardar(self, path: Path = CLASSIFIER_PATH):
+        """Guarda el modelo en JSON."""
+        datos = {
+            'entrenado_en': datetime.now().isoformat(timespec='seconds'),
+            'docs': self.docs,
+            'umbral_rechazo': self.umbral_rechazo,
+            'umbral_aceptacion': self.umbral_aceptacion,
+            'metricas': self.metricas,
+            'conteos': self.conteos,
+        }
+        Path(path).write_text(json.dumps(datos, ensure_ascii=False), encoding='utf-8')
+
+    @classmethod
+    def cargar(cls, path: Path = CLASSIFIER_PATH) -> 'NaiveBayesClassifier | None':
+        """
+        Carga un modelo guardado.
+
+        Returns:
+            El clasificador, o None si no existe o no es válido
+        """
+        try:
+            datos = json.loads(Path(path).read_text(encoding='utf-8'))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+        clasificador = cls()
+        clasificador.docs = datos['docs']
+        clasificador.conteos = datos['conteos']
+        clasificador.umbral_rechazo = datos.get('umbral_rechazo')
+        clasificador.umbral_aceptacion = datos.get('umbral_aceptacion')
+        clasificador.metricas = datos.get('metricas', {})
+        clasificador._precalcular()
+        if not clasificador.entrenado:
+            return None
+        logger.debug(f"Clasificador local cargado: {clasificador.docs[0]} relevantes, {clasificador.docs[1]} no relevantes")
+        return clasificador
+
+
+def umbral_para_recall(puntajes_relevantes: list[float], recall: float) -> float:
+    """
+    Umbral de rechazo que conserva al menos `recall` de las relevantes.
+
+    Args:
+        puntajes_relevantes: Puntajes de noticias relevantes
+        recall: Fracción de relevantes que no deben rechazarse (0-1)
+
+    Returns:
+        Umbral: se rechaza lo que puntúa estrictamente por debajo
+    """
+    ordenados = sorted(puntajes_relevantes)
+    perdibles = int(len(ordenados) * (1 - recall))
+    return ordenados[perdibles]
+
+
+def umbral_para_precision(puntajes: list[tuple[float, bool]], precision: float) -> float | None:
+    """
+    Umbral de aceptación más bajo cuya precisión es al menos `precision`.
+
+    Args:
+        puntajes: Lista de (puntaje, es_relevante)
+        precision: Precisión mínima de las aceptadas (0-1)
+
+    Returns:
+        Umbral: se acepta lo que puntúa estrictamente por encima
+        (None si ningún umbral alcanza la precisión)
+    """
+    ordenados = sorted(puntajes, reverse=True)
+    umbral = None
+    aciertos = 0
+    for i, (puntaje, relevante) in enumerate(ordenados, 1):
+        aciertos += relevante
+        siguiente = ordenados[i][0] if i < len(ordenados) else None
+        if siguiente == puntaje:
+            continue  # No cortar entre puntajes iguales
+        if aciertos / i >= precision:
+            umbral = siguiente if siguiente is not None else puntaje - 1.0
+    return umbral
@@ -0,0 +1,164 @@
+"""
+Agrupamiento de noticias casi idénticas entre fuentes (SimHash).
+
+Una misma gacetilla de prensa suele publicarse casi textual en varios
+diarios. Cada noticia se resume en una huella SimHash de 64 bits sobre
+sus shingles (secuencias de 3 palabras, sin tildes ni mayúsculas): dos
+textos casi iguales tienen huellas que difieren en pocos bits, aunque
+cada diario cambie el título, agregue una línea o corte un párrafo.
+
+Las noticias cuya huella está a `max_distancia` bits o menos de otra ya
+vista quedan en el mismo cluster. El cluster_id es la huella (en hex)
+de la primera noticia del grupo, que actúa de representante: la IA
+analiza solo esa y el resultado se copia al resto.
+
+Las noticias con menos de `min_palabras` palabras (sin cuerpo, o solo
+con un título corto) no se agrupan: con tan poco texto la huella no
+distingue notas distintas (sin palabras es 0 para todas).
+
+Los clusters se arman por ejecución. Las comparaciones son contra todas
+las noticias vistas (O(n²)), suficiente para los cientos de noticias
+que pasan el filtro de keywords.
+"""
+import hashlib
+import re
+from typing import Iterable
+
+from app.models.noticia import Noticia
+from app.utils.ai_prompt import BODY_CHARS
+from app.utils.text_utils import normalizar_busqueda
+
+SHINGLE = 3
+
+_PALABRA = re.compile(r'[a-z0-9ñ]+')
+
+
+def _palabras(texto: str) -> list[str]:
+    """Palabras del texto normalizado (sin tildes ni mayúsculas)."""
+    return _PALABRA.findall(normalizar_busqueda(texto))
+
+
+def _shingles(palabras: list[str]) -> set[str]:
+    """Secuencias de SHINGLE palabras consecutivas."""
+    if len(palabras) < SHINGLE:
+        return set(palabras)
+    return {' '.join(palabras[i:i + SHINGLE]) for i in range(len(palabras) - SHINGLE + 1)}
+
+
+def simhash(texto: str) -> int:
+    """
+    Huella SimHash de 64 bits de un texto.
+
+    Args:
+        texto: Texto a resumir
+
+    Returns:
+        Entero de 64 bits (0 si el texto no tiene palabras)
+    """
+    return _huella(_palabras(texto))
+
+
+def _huella(palabras: list[str]) -> int:
+    """SimHash de las palabras ya normalizadas (ver simhash())."""
+    shingles = _shingles(palabras)
+    if not shingles:
+        return 0
+    # Cada bit de la huella es el voto mayoritario de ese bit entre los
+    # hashes de los shingles (contado por columnas, no bit a bit)
+    bits = [
+        format(int.from_bytes(hashlib.blake2b(s.encode('utf-8'), digest_size=8).digest(), 'big'), '064b')
+        for s in shingles
+    ]
+    mitad = len(bits) / 2
+    return int(''.join('1' if columna.count('1') > mitad else '0' for columna in zip(*bits)), 2)
+
+
+def distancia(a: int, b: int) -> int:
+    """Bits distintos entre dos huellas (distancia de Hamming)."""
+    return (a ^ b).bit_count()
+
+
+def texto_noticia(noticia: Noticia) -> str:
+    """
+    Texto de una noticia que entra en la huella.
+
+    Del cuerpo entran los mismos caracteres que ve el LLM. Además deja
+    afuera el final de la página, donde cada diario agrega su propio
+    texto fijo (que acerca entre sí a notas distintas de una misma fuente).
+    """
+    return f"{noticia.title} {noticia.subtitle or ''} {noticia.body[:BODY_CHARS]}"
+
+
+class NearDuplicateIndex:
+    """
+    Índice incremental de huellas: asigna cluster_id a cada noticia a
+    medida que llega (sirve tanto para listas como para el pipeline).
+    """
+
+    def __init__(self, max_distancia: int = 10, min_palabras: int = 20):
+        """
+        Inicializa el índice vacío.
+
+        Args:
+            max_distancia: Bits distintos (de 64) hasta los que dos
+                           noticias se consideran la misma
+            min_palabras: Palabras mínimas para agrupar una noticia
+        """
+        self.max_distancia = max_distancia
+        self.min_palabras = min_palabras
+        self._huellas: list[tuple[int, str]] = []  # (huella, cluster_id)
+        self.clusters: dict[str, int] = {}  # cluster_id -> cantidad de noticias
+        self.sin_agrupar = 0  # noticias con poco texto
+
+    def agregar(self, noticia: Noticia) -> str | None:
+        """
+        Calcula la huella de la noticia y le asigna su cluster_id.
+
+        Args:
+            noticia: Noticia a agrupar (se completa noticia.cluster_id)
+
+        Returns:
+            El cluster_id asignado, o None si la noticia tiene menos de
+            min_palabras palabras (queda sin agrupar)
+        """
+        palabras = _palabras(texto_noticia(noticia))
+        if len(palabras) < self.min_palabras:
+            noticia.cluster_id = None
+            self.sin_agrupar += 1
+            return None
+        huella = _huella(palabras)
+        cluster_id = next(
+            (cluster for otra, cluster in self._huellas if distancia(huella, otra) <= self.max_distancia),
+            None
+        )
+        if cluster_id is None:
+            cluster_id = f"{huella:016x}"
+        self._huellas.append((huella, cluster_id))
+        self.clusters[cluster_id] = self.clusters.get(cluster_id, 0) + 1
+        noticia.cluster_id = cluster_id
+        return cluster_id
+
+    @property
+    def duplicadas(self) -> int:
+        """Noticias que cayeron en el cluster de otra ya vista."""
+        return sum(cantidad - 1 for cantidad in self.clusters.values())
+
+
+def agrupar_duplicados(noticias: Iterable[Noticia], max_distancia: int = 10,
+                       min_palabras: int = 20) -> NearDuplicateIndex:
+    """
+    Asigna cluster_id a una lista de noticias.
+
+    Args:
+        noticias: Noticias a agrupar (en orden: la primera de cada grupo
+                  es su representante)
+        max_distancia: Ver NearDuplicateIndex
+        min_palabras: Ver NearDuplicateIndex
+
+    Returns:
+        El índice, con los tamaños de cada cluster
+    """
+    indice = NearDuplicateIndex(max_distancia, min_palabras)
+    for noticia in noticias:
+        indice.agregar(noticia)
+    return indice
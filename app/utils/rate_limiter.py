@@ -0,0 +1,93 @@
+"""
+Limitador de tasa por token bucket para APIs con cupos por minuto.
+
+Las APIs de LLM (como Groq) limitan tanto los requests por minuto (RPM)
+como los tokens por minuto (TPM). Se usan dos buckets que se recargan
+de forma continua: cada request consume 1 del primero y sus tokens
+estimados del segundo, y espera si alguno no alcanza.
+"""
+import asyncio
+import time
+
+
+class _Bucket:
+    """Bucket que se recarga `capacidad` unidades por minuto."""
+
+    def __init__(self, capacidad: float):
+        self.capacidad = capacidad
+        self.disponible = capacidad
+        self.por_segundo = capacidad / 60.0
+        self.actualizado = time.monotonic()
+
+    def recargar(self):
+        """Suma lo recargado desde la última consulta."""
+        ahora = time.monotonic()
+        self.disponible = min(self.capacidad, self.disponible + (ahora - self.actualizado) * self.por_segundo)
+        self.actualizado = ahora
+
+    def espera(self, cantidad: float) -> float:
+        """Segundos hasta que haya `cantidad` disponible (0 si ya hay)."""
+        faltante = cantidad - self.disponible
+        return faltante / self.por_segundo if faltante > 0 else 0.0
+
+
+class TokenBucketLimiter:
+    """
+    Limita requests y tokens por minuto.
+
+    Un límite en None (o 0) se considera ilimitado.
+    """
+
+    def __init__(self, rpm: float | None = None, tpm: float | None = None):
+        """
+        Inicializa el limitador.
+
+        Args:
+            rpm: Requests por minuto permitidos
+            tpm: Tokens por minuto permitidos
+        """
+        self._requests = _Bucket(rpm) if rpm else None
+        self._tokens = _Bucket(tpm) if tpm else None
+
+    async def adquirir(self, tokens: int = 0):
+        """
+        Espera hasta que haya cupo para un request de `tokens` tokens y lo consume.
+
+        Args:
+            tokens: Tokens estimados del request (prompt + respuesta)
+        """
+        if self._tokens:
+            # Un request más grande que el cupo total esperaría para siempre
+            tokens = min(tokens, self._tokens.capacidad)
+
+        while True:
+            espera = 0.0
+            if self._requests:
+                self._requests.recargar()
+                espera = max(espera, self._requests.espera(1))
+            if self._tokens:
+                self._tokens.recargar()
+                espera = max(espera, self._tokens.espera(tokens))
+
+            if espera <= 0:
+                if self._requests:
+                    self._requests.disponible -= 1
+                if self._tokens:
+                    self._tokens.disponible -= tokens
+                return
+            await asyncio.sleep(espera)
+
+    def ajustar(self, tokens_estimados: int, tokens_reales: int):
+        """
+        Corrige el consumo de tokens con el uso real informado por la API.
+
+        Args:
+            tokens_estimados: Tokens descontados en adquirir()
+            tokens_reales: Tokens efectivamente usados
+        """
+        if self._tokens:
+            self._tokens.recargar()
+            self._tokens.disponible = min(
+                self._tokens.capacidad,
+                self._tokens.disponible + tokens_estimados - tokens_reales
+            )
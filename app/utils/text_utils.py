@@ -24,3 +24,98 @@ def normalizar_texto(texto: str) -> str:
         if unicodedata.category(char) != 'Mn'
     )
     return texto_sin_tildes
+
+
+def _crear_tabla_busqueda() -> dict:
+    """
+    Precalcula la tabla de plegado para búsquedas.
+    
+    Cada letra con tilde de Latin-1 (á, é, í, ó, ú, ñ, ü, ç, à...), ya en
+    minúsculas, se lleva a su forma sin tilde usando normalizar_texto,
+    solo cuando el resultado es un único carácter: así el texto plegado
+    tiene el mismo largo que el original y las posiciones de los matches
+    siguen valiendo. Las letras de Latin Extended (ł, ş, ő...) no se
+    pliegan: no aparecen en las keywords ni en los diarios.
+    """
+    tabla = {}
+    for codigo in range(0xC0, 0x100):
+        char = chr(codigo).lower()
+        plegado = normalizar_texto(char)
+        if len(plegado) == 1 and plegado != char:
+            tabla[char] = plegado
+    return tabla
+
+
+# Tabla compartida por keywords y textos (ver normalizar_busqueda)
+TABLA_BUSQUEDA = _crear_tabla_busqueda()
+
+
+def normalizar_busqueda(texto: str) -> str:
+    """
+    Lleva el texto a minúsculas y sin tildes para buscar keywords.
+    
+    Conserva el largo del texto (un carácter por carácter), por lo que
+    las posiciones encontradas sirven sobre el texto original.
+    
+    str.lower() y str.replace() recorren el texto en C; buscar cada letra
+    de TABLA_BUSQUEDA con `in` antes de reemplazarla cuesta mucho menos
+    que recorrer el texto con una regex o con str.translate.
+    
+    Args:
+        texto: Texto a normalizar
+        
+    Returns:
+        Texto plegado
+    """
+    if texto.isascii():
+        return texto.lower()
+    if 'İ' in texto:
+        # Única letra que str.lower() convierte en dos caracteres
+        texto = texto.replace('İ', 'I')
+    texto = texto.lower()
+    for char, plegado in TABLA_BUSQUEDA.items():
+        if char in texto:
+            texto = texto.replace(char, plegado)
+    return texto
+
+
+def detectar_encoding(content: bytes) -> str | None:
+    """
+    Detecta el encoding del contenido usando chardet.
+    
+    Args:
+        content: Contenido en bytes
+        
+    Returns:
+        Encoding detectado o None
+    """
+    try:
+        import chardet
+        result = chardet.detect(content)
+        if result and result.get('encoding'):
+            return result['encoding']
+    except ImportError:
+        pass
+    return None
+
+
+def decodificar_html(content: bytes, encoding_fallback: str | None = None) -> str:
+    """
+    Decodifica HTML crudo detectando el encoding con chardet.
+    
+    Args:
+        content: HTML en bytes
+        encoding_fallback: Encoding informado por el servidor (o None)
+        
+    Returns:
+        HTML como string
+    """
+    detected_encoding = detectar_encoding(content)
+    if detected_encoding:
+        try:
+            return content.decode(detected_encoding)
+        except (UnicodeDecodeError, LookupError):
+            pass
+    
+    # Fallback: encoding del servidor o UTF-8
+    return content.decode(encoding_fallback or 'utf-8', errors='replace')
@@ -0,0 +1,144 @@
+"""
+Benchmark de la etapa de IA contra el LLM simulado (sin red ni API key).
+
+Uso:
+    python -m benchmarks.bench_ai_stage [--noticias 200] [--latencia 0.2 0.6]
+        [--escenarios concurrencia cache lotes fallas rpm]
+
+Escenarios:
+- concurrencia: tiempo y concurrencia real según AI_CONFIG["max_concurrent"]
+- cache: segunda corrida sobre las mismas noticias (todo sale de la cache)
+- lotes: requests y tokens según batch_size
+
+La columna "prefijo" es la fracción de tokens de prompt que el servidor
+simulado sirvió de su cache de prefijos.
+- fallas: 429 y 500 al azar, con y sin reintentos del cliente
+- rpm: el servidor acepta pocos requests por minuto; con y sin el
+  limitador RPM del cliente (tarda ~1 minuto, no se corre por defecto)
+
+Cada corrida usa un AIFilter nuevo con provider="fake" y una cache en un
+directorio temporal; no toca app/db. Las decisiones simuladas dependen
+solo del título, así que todas las corridas deben coincidir.
+"""
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from app.models.noticia import Noticia
+from app.utils.ai_filter import AIFilter
+
+ESCENARIOS = ["concurrencia", "cache", "lotes", "fallas", "rpm"]
+
+
+def _generar_noticias(n: int) -> list[Noticia]:
+    """Noticias sintéticas con títulos distintos."""
+    return [
+        Noticia(
+            url=f"https://example.com/nota-{i}",
+            source=f"Diario {i % 13}",
+            title=f"Noticia de prueba número {i}",
+            subtitle="Subtítulo",
+            body="Cuerpo de la noticia sobre la gestión municipal. " * 40,
+        )
+        for i in range(n)
+    ]
+
+
+def _correr(noticias: list[Noticia], cache_path: Path, max_concurrent: int = 5,
+            batch_size: int = 1, rpm: int = None, cache: bool = False, **fake) -> dict:
+    """Filtra las noticias con un AIFilter nuevo y retorna las métricas."""
+    ai_filter = AIFilter(
+        api_key="", model="bench", context_prompt="Noticias de la Municipalidad de San Juan.",
+        max_concurrent=max_concurrent, rpm=rpm, tpm=None, cache=cache, batch_size=batch_size,
+        provider="fake", provider_options=fake, cache_path=cache_path,
+    )
+    for noticia in noticias:
+        noticia.cluster_id = None
+
+    inicio = time.perf_counter()
+    relevantes = ai_filter.filter_noticias(noticias)
+    segundos = time.perf_counter() - inicio
+
+    server = ai_filter.provider.server.stats
+    stats = ai_filter.get_stats()
+    return {
+        'segundos': segundos,
+        'relevantes': {n.url for n in relevantes},
+        'requests': server['requests'],
+        '429': server['rate_limited'],
+        '500': server['server_errors'],
+        'reintentos': server['retries'],
+        'errores': stats['errors'],
+        'cache': stats['cache_hits'],
+        'tokens': server['prompt_tokens'] + server['completion_tokens'],
+        'prefijo': server['cached_tokens'] / server['prompt_tokens'] if server['prompt_tokens'] else 0.0,
+        'concurrencia': server['max_concurrent'],
+    }
+
+
+def _imprimir(nombre: str, m: dict, n: int):
+    print(f"{nombre:<38} {m['segundos']:>7.2f} {n / m['segundos']:>8.1f} {m['requests']:>5} "
+          f"{m['429']:>4} {m['500']:>4} {m['reintentos']:>5} {m['errores']:>5} {m['cache']:>5} "
+          f"{m['tokens']:>8} {m['prefijo']:>7.0%} {m['concurrencia']:>5}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noticias", type=int, default=200)
+    parser.add_argument("--latencia", type=float, nargs=2, default=(0.2, 0.6), metavar=("MIN", "MAX"))
+    parser.add_argument("--escenarios", nargs="+", choices=ESCENARIOS, default=ESCENARIOS[:-1])
+    args = parser.parse_args()
+
+    # El AIFilter loguea cada noticia
+    logging.disable(logging.WARNING)
+
+    noticias = _generar_noticias(args.noticias)
+    latencia = tuple(args.latencia)
+    directorio = Path(tempfile.mkdtemp())
+    corridas = []
+
+    def medir(nombre: str, noticias_corrida: list[Noticia] = noticias, cache_path: Path = None, **kwargs):
+        m = _correr(noticias_corrida, cache_path or directorio / f"{len(corridas)}.db", **kwargs)
+        _imprimir(nombre, m, len(noticias_corrida))
+        corridas.append((noticias_corrida, m))
+        return m
+
+    print(f"{len(noticias)} noticias, latencia simulada {latencia[0]}-{latencia[1]} s")
+    print(f"{'escenario':<38} {'seg':>7} {'not/s':>8} {'req':>5} {'429':>4} {'500':>4} "
+          f"{'reint':>5} {'error':>5} {'cache':>5} {'tokens':>8} {'prefijo':>7} {'conc':>5}")
+
+    if "concurrencia" in args.escenarios:
+        for max_concurrent in (1, 5, 10, 20):
+            medir(f"concurrencia max_concurrent={max_concurrent}",
+                  max_concurrent=max_concurrent, latency=latencia)
+
+    if "cache" in args.escenarios:
+        cache_path = directorio / "cache.db"
+        medir("cache: primera corrida", cache_path=cache_path, cache=True, latency=latencia)
+        medir("cache: segunda corrida", cache_path=cache_path, cache=True, latency=latencia)
+
+    if "lotes" in args.escenarios:
+        for batch_size in (1, 5, 10):
+            medir(f"lotes batch_size={batch_size}", batch_size=batch_size, latency=latencia)
+        medir("lotes batch_size=5, 20% JSON inválido", batch_size=5, latency=latencia, invalid_json_rate=0.2)
+
+    if "fallas" in args.escenarios:
+        for max_retries in (0, 2):
+            medir(f"fallas 10% 429 + 5% 500, retries={max_retries}", latency=latencia,
+                  rate_limit_rate=0.1, error_rate=0.05, max_retries=max_retries)
+
+    if "rpm" in args.escenarios:
+        pocas = noticias[:30]
+        medir("rpm servidor=20, sin limitador", pocas, latency=latencia, rpm_limit=20)
+        medir("rpm servidor=20, limitador rpm=20", pocas, rpm=20, latency=latencia, rpm_limit=20)
+
+    # Las corridas completas sin errores deben dar las mismas relevantes
+    sin_errores = [m['relevantes'] for lista, m in corridas if lista is noticias and not m['errores']]
+    if any(r != sin_errores[0] for r in sin_errores[1:]):
+        print("⚠️ Las corridas sin errores dieron relevantes distintas")
+
+
+if __name__ == "__main__":
+    main()
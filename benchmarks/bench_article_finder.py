@@ -0,0 +1,171 @@
+"""
+Benchmark de ArticleFinder sobre las portadas del corpus guardado.
+
+Uso:
+    python -m benchmarks.bench_article_finder [--dir benchmarks/corpus] [--repeticiones 5]
+
+Compara, sobre árboles ya parseados:
+- la búsqueda de contenedores de artículos de antes (un find_all por
+  <article> y otro por cada selector de ARTICLE_SELECTORS) con la de un
+  solo recorrido (SelectorMatcher), verificando que devuelvan los mismos
+  elementos en el mismo orden;
+- el fallback por patrones de URL (_buscar_por_url_patterns), forzado en
+  todas las portadas: deduplicación con una lista (igualdad de Tag, que
+  compara subárboles) contra un set de ids y una regex precompilada;
+- la portada completa, desde el HTML hasta los enlaces: árbol de
+  html.parser + encontrar_articulos() + extraer_enlaces() contra el
+  recorrido en streaming (enlaces_de_portada), en tiempo y memoria pico
+  (tracemalloc), verificando que den las mismas URLs, en el mismo orden
+  y con el mismo texto.
+"""
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from bs4 import BeautifulSoup
+
+from app.extractors.article_finder import ArticleFinder
+from app.parsers.backend import crear_soup, get_parser_backend
+from app.utils.text_utils import decodificar_html
+from benchmarks.corpus import CORPUS_DIR, cargar_corpus
+
+
+def encontrar_articulos_anterior(finder: ArticleFinder, soup: BeautifulSoup) -> list:
+    """Implementación anterior: un recorrido del árbol por selector."""
+    min_articles = finder.config['min_articles_found']
+    all_articles = []
+    found_elements = set()
+
+    for art in soup.find_all('article'):
+        if id(art) not in found_elements:
+            all_articles.append(art)
+            found_elements.add(id(art))
+
+    for tag, class_name in finder.article_selectors:
+        found = soup.find_all(tag, class_=lambda x: x and class_name in ' '.join(x) if isinstance(x, list) else class_name in str(x))
+        for elem in found:
+            if id(elem) not in found_elements:
+                all_articles.append(elem)
+                found_elements.add(id(elem))
+
+    if len(all_articles) >= min_articles:
+        return all_articles
+
+    for elem in finder._buscar_por_url_patterns(soup, min_articles):
+        if id(elem) not in found_elements:
+            all_articles.append(elem)
+            found_elements.add(id(elem))
+
+    return all_articles if len(all_articles) >= min_articles else []
+
+
+def buscar_por_url_patterns_anterior(finder: ArticleFinder, soup: BeautifulSoup) -> list:
+    """Implementación anterior del fallback: any() por patrón y dedupe con una lista."""
+    article_containers = []
+    for link in soup.find_all('a', href=True):
+        href = link.get('href', '')
+        if any(pattern in href.lower() for pattern in finder.url_patterns):
+            parent = link.find_parent(['article', 'div', 'li'])
+            if parent and parent not in article_containers:
+                article_containers.append(parent)
+    return article_containers
+
+
+def _medir(fn, soups: list, repeticiones: int) -> tuple[list, float]:
+    """Ejecuta fn sobre cada árbol; retorna los resultados y el mejor tiempo total."""
+    mejor = float('inf')
+    resultados = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = [fn(soup) for soup in soups]
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultados, mejor
+
+
+def enlaces_con_arbol(finder: ArticleFinder, html: str, source_url: str) -> tuple[int, dict[str, str]]:
+    """Camino con árbol (el de parsear_portada_con_texto sin streaming)."""
+    soup = crear_soup(html, 'html.parser')
+    articles = finder.encontrar_articulos(soup)
+    if not articles:
+        return 0, {}
+    return len(articles), finder.extraer_enlaces(articles, source_url)
+
+
+def _memoria_pico(fn, paginas: list) -> int:
+    """Mayor pico de memoria (bytes) de fn sobre una sola portada."""
+    pico = 0
+    for pagina in paginas:
+        tracemalloc.start()
+        fn(pagina)
+        pico = max(pico, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return pico
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    portadas = cargar_corpus(args.dir, tipo="portada")
+    backend = get_parser_backend()
+    soups = [crear_soup(decodificar_html(p['content'], p['encoding']), backend) for p in portadas]
+    finder = ArticleFinder()
+
+    print(f"{len(soups)} portadas, {len(finder.article_selectors)} selectores, parser {backend}")
+    anteriores, t_anterior = _medir(lambda soup: encontrar_articulos_anterior(finder, soup), soups, args.repeticiones)
+    nuevos, t_nuevo = _medir(finder.encontrar_articulos, soups, args.repeticiones)
+
+    print(f"{'método':<32} {'ms/portada':>11}")
+    print(f"{'anterior (find_all por selector)':<32} {t_anterior / len(soups) * 1000:>11.2f}")
+    print(f"{'un recorrido (SelectorMatcher)':<32} {t_nuevo / len(soups) * 1000:>11.2f}")
+    print(f"Mejora: {t_anterior / t_nuevo:.1f}x")
+
+    for portada, anterior, nuevo in zip(portadas, anteriores, nuevos):
+        if [id(e) for e in anterior] != [id(e) for e in nuevo]:
+            print(f"   ⚠️ {portada['fuente']}: contenedores distintos ({len(anterior)} vs {len(nuevo)})")
+
+    # Fallback por patrones de URL (sin el mínimo de artículos, para medirlo en todas)
+    print()
+    anteriores, t_anterior = _medir(lambda soup: buscar_por_url_patterns_anterior(finder, soup), soups, args.repeticiones)
+    nuevos, t_nuevo = _medir(lambda soup: finder._buscar_por_url_patterns(soup, 0), soups, args.repeticiones)
+    print(f"{'fallback por patrones de URL':<32} {'ms/portada':>11}")
+    print(f"{'anterior (lista + any)':<32} {t_anterior / len(soups) * 1000:>11.2f}")
+    print(f"{'set de ids + regex':<32} {t_nuevo / len(soups) * 1000:>11.2f}")
+    print(f"Mejora: {t_anterior / t_nuevo:.1f}x")
+
+    for portada, anterior, nuevo in zip(portadas, anteriores, nuevos):
+        # La lista fusionaba contenedores distintos con el mismo HTML; el set
+        # de ids los conserva. Fusionándolos de nuevo, debe dar lo mismo.
+        fusionados = []
+        for elem in nuevo:
+            if elem not in fusionados:
+                fusionados.append(elem)
+        if [id(e) for e in fusionados] != [id(e) for e in anterior]:
+            print(f"   ⚠️ {portada['fuente']}: contenedores distintos ({len(anterior)} vs {len(nuevo)})")
+        elif len(nuevo) != len(anterior):
+            print(f"   {portada['fuente']}: {len(nuevo) - len(anterior)} contenedores con HTML idéntico a otro")
+
+    # Portada completa: HTML -> enlaces
+    print()
+    paginas = [(decodificar_html(p['content'], p['encoding']), p['url']) for p in portadas]
+    con_arbol = lambda pagina: enlaces_con_arbol(finder, *pagina)
+    streaming = lambda pagina: finder.enlaces_de_portada(*pagina)
+    anteriores, t_anterior = _medir(con_arbol, paginas, args.repeticiones)
+    nuevos, t_nuevo = _medir(streaming, paginas, args.repeticiones)
+    m_anterior, m_nuevo = _memoria_pico(con_arbol, paginas), _memoria_pico(streaming, paginas)
+    kb_html = max(len(html) for html, _ in paginas) / 1024
+    print(f"{'HTML -> enlaces (html.parser)':<32} {'ms/portada':>11} {'pico MB':>8}   (portada más grande: {kb_html:.0f} KB)")
+    print(f"{'árbol + extraer_enlaces':<32} {t_anterior / len(paginas) * 1000:>11.2f} {m_anterior / 2**20:>8.1f}")
+    print(f"{'streaming (enlaces_de_portada)':<32} {t_nuevo / len(paginas) * 1000:>11.2f} {m_nuevo / 2**20:>8.1f}")
+    print(f"Mejora: {t_anterior / t_nuevo:.1f}x en tiempo, {m_anterior / m_nuevo:.1f}x en memoria")
+
+    for portada, anterior, nuevo in zip(portadas, anteriores, nuevos):
+        if anterior != nuevo or list(anterior[1]) != list(nuevo[1]):
+            print(f"   ⚠️ {portada['fuente']}: enlaces distintos ({len(anterior[1])} vs {len(nuevo[1])})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Benchmark de manejo de conexiones: keep-alive vs force_close.
+
+Uso:
+    python -m benchmarks.bench_connection_modes              # URLs del corpus guardado
+    python -m benchmarks.bench_connection_modes --local 200  # servidor local, sin red
+
+Para cada modo reporta cuántas conexiones nuevas se abrieron (handshakes
+TCP/TLS), cuántas se reutilizaron y la latencia p50/p95 por fetch.
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from pathlib import Path
+
+import aiohttp
+from aiohttp import web
+
+from app.http import AsyncHTTPClient
+from benchmarks.corpus import CORPUS_DIR, cargar_corpus
+from config.settings import get_scraping_config
+
+
+def _percentil(valores: list[float], p: float) -> float:
+    """Percentil p (0-100) de una lista de valores."""
+    if len(valores) < 2:
+        return valores[0] if valores else 0.0
+    return statistics.quantiles(valores, n=100, method='inclusive')[int(p) - 1]
+
+
+def _trace_config(contadores: dict) -> aiohttp.TraceConfig:
+    """TraceConfig que cuenta conexiones nuevas y reutilizadas."""
+    trace = aiohttp.TraceConfig()
+
+    async def on_create(session, ctx, params):
+        contadores['handshakes'] += 1
+
+    async def on_reuse(session, ctx, params):
+        contadores['reutilizadas'] += 1
+
+    trace.on_connection_create_end.append(on_create)
+    trace.on_connection_reuseconn.append(on_reuse)
+    return trace
+
+
+async def _medir_modo(modo: str, urls: list[str], max_concurrent: int) -> dict:
+    """Descarga todas las URLs con un modo de conexión."""
+    http_client = AsyncHTTPClient(connection_mode=modo)
+    http_client.response_cache = None  # Medir solo la red
+    contadores = {'handshakes': 0, 'reutilizadas': 0}
+    latencias = []
+    errores = 0
+    semaphore = asyncio.Semaphore(max_concurrent)
+
+    async def fetch(session, url):
+        nonlocal errores
+        async with semaphore:
+            inicio = time.perf_counter()
+            respuesta = await http_client.fetch_bytes(session, url)
+            latencias.append(time.perf_counter() - inicio)
+            if respuesta is None:
+                errores += 1
+
+    inicio = time.perf_counter()
+    async with http_client.sesion(max_concurrent, [_trace_config(contadores)]) as session:
+        await asyncio.gather(*[fetch(session, url) for url in urls])
+    total = time.perf_counter() - inicio
+
+    return {
+        **contadores,
+        'errores': errores,
+        'p50_ms': _percentil(latencias, 50) * 1000,
+        'p95_ms': _percentil(latencias, 95) * 1000,
+        'total_s': total,
+    }
+
+
+async def _servidor_local(paginas: int, latencia: float) -> tuple[web.AppRunner, list[str]]:
+    """Levanta un servidor HTTP local con `paginas` páginas."""
+    cuerpo = "<html><body>" + "<p>Contenido de prueba.</p>" * 200 + "</body></html>"
+
+    async def handler(request):
+        await asyncio.sleep(latencia)
+        return web.Response(text=cuerpo, content_type='text/html')
+
+    app = web.Application()
+    app.router.add_get('/nota/{n}', handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, '127.0.0.1', 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, [f"http://127.0.0.1:{port}/nota/{i}" for i in range(paginas)]
+
+
+async def _main(args):
+    runner = None
+    if args.local:
+        runner, urls = await _servidor_local(args.local, args.latencia)
+    else:
+        urls = [entrada['url'] for entrada in cargar_corpus(args.dir)]
+
+    max_concurrent = get_scraping_config()['max_concurrent_requests']
+    print(f"{len(urls)} URLs, {max_concurrent} concurrentes")
+    print(f"{'modo':<12} {'handshakes':>10} {'reusadas':>9} {'errores':>8} {'p50 ms':>8} {'p95 ms':>8} {'total s':>8}")
+    try:
+        for modo in ('force_close', 'keepalive'):
+            r = await _medir_modo(modo, urls, max_concurrent)
+            print(f"{modo:<12} {r['handshakes']:>10} {r['reutilizadas']:>9} {r['errores']:>8} "
+                  f"{r['p50_ms']:>8.1f} {r['p95_ms']:>8.1f} {r['total_s']:>8.2f}")
+    finally:
+        if runner:
+            await runner.cleanup()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--local", type=int, default=0, help="Usar un servidor local con N páginas")
+    parser.add_argument("--latencia", type=float, default=0.02, help="Latencia simulada del servidor local (s)")
+    args = parser.parse_args()
+    asyncio.run(_main(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+"""
+Benchmark de los perfiles de extracción por host (ContentParser + DateParser).
+
+Uso:
+    python -m benchmarks.bench_content_profiles [--dir benchmarks/corpus] [--repeticiones 5]
+
+Sobre los árboles ya parseados de las noticias del corpus, mide la
+extracción de subtítulo, cuerpo y fecha con la cascada completa y con el
+perfil aprendido de cada host (una primera pasada aprende los perfiles,
+como en la primera ejecución). Verifica que ambos den el mismo resultado
+y que el perfil nunca elija una fuente de menor prioridad que la cascada
+completa en la misma página, también forzando como perfil las fuentes de
+último recurso (que se deben ignorar), y muestra, por host, el selector
+aprendido y los aciertos.
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from app.parsers.backend import crear_soup
+from app.parsers.content_parser import ContentParser
+from app.parsers.date_parser import DateParser
+from app.parsers.extraction_profiles import CAMPOS, ULTIMO_RECURSO, ExtractionProfiles, host_de
+from app.utils.text_utils import decodificar_html
+from benchmarks.corpus import CORPUS_DIR, cargar_corpus
+
+
+def _extraer(content_parser: ContentParser, soup, url: str, perfil: dict = None) -> dict:
+    """Lo mismo que parsear_noticia() después de crear el árbol."""
+    perfil = perfil or {}
+    contenido = content_parser.extraer_todo(soup, perfil)
+    fecha, clave, acierto = DateParser.extraer_con_perfil(soup, url, perfil.get('date'))
+    contenido['published_at'] = fecha
+    contenido['selectores']['date'] = clave
+    contenido['aciertos']['date'] = acierto
+    return contenido
+
+
+def _sin_perfil(contenido: dict) -> dict:
+    """Resultado sin los datos del perfil (para comparar)."""
+    return {k: v for k, v in contenido.items() if k not in ('selectores', 'aciertos')}
+
+
+def _prioridades(content_parser: ContentParser, soup, url: str) -> dict[str, list[str]]:
+    """Campo -> claves en el orden de la cascada."""
+    return {
+        'subtitle': [clave for clave, _ in content_parser._opciones_subtitulo(soup)],
+        'body': [clave for clave, _ in content_parser._opciones_cuerpo(soup)],
+        'date': [clave for clave, _ in DateParser._opciones(soup, url)],
+    }
+
+
+def _peor_prioridad(prioridades: dict, cascada: dict, con_perfil: dict) -> list[str]:
+    """Campos en los que el perfil eligió una fuente posterior a la de la cascada."""
+    posicion = lambda claves, clave: claves.index(clave) if clave in claves else len(claves)
+    return [
+        campo for campo in CAMPOS
+        if posicion(prioridades[campo], con_perfil['selectores'][campo])
+        > posicion(prioridades[campo], cascada['selectores'][campo])
+    ]
+
+
+def _medir(fn, paginas: list, repeticiones: int) -> tuple[list, float]:
+    """Ejecuta fn sobre cada página; retorna los resultados y el mejor tiempo total."""
+    mejor = float('inf')
+    resultados = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = [fn(pagina) for pagina in paginas]
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultados, mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    noticias = cargar_corpus(args.dir, tipo="noticia")
+    paginas = [(crear_soup(decodificar_html(n['content'], n['encoding'])), n['url']) for n in noticias]
+    content_parser = ContentParser()
+
+    # Primera pasada: aprender los perfiles (sin tocar app/db)
+    perfiles = ExtractionProfiles(Path(tempfile.mkdtemp()) / "perfiles.json")
+    for soup, url in paginas:
+        contenido = _extraer(content_parser, soup, url, perfiles.perfil(url))
+        if contenido['is_valid']:
+            perfiles.registrar(url, contenido['selectores'], contenido['aciertos'])
+    perfiles.stats = {}
+
+    cascada, t_cascada = _medir(lambda p: _extraer(content_parser, *p), paginas, args.repeticiones)
+    con_perfil, t_perfil = _medir(
+        lambda p: _extraer(content_parser, p[0], p[1], perfiles.perfil(p[1])), paginas, args.repeticiones
+    )
+    for (soup, url), contenido in zip(paginas, con_perfil):
+        if contenido['is_valid']:
+            perfiles.registrar(url, contenido['selectores'], contenido['aciertos'])
+
+    print(f"{len(paginas)} noticias de {len({host_de(url) for _, url in paginas})} hosts")
+    print(f"{'método':<24} {'ms/noticia':>11}")
+    print(f"{'cascada completa':<24} {t_cascada / len(paginas) * 1000:>11.2f}")
+    print(f"{'perfil por host':<24} {t_perfil / len(paginas) * 1000:>11.2f}")
+    print(f"Mejora: {t_cascada / t_perfil:.1f}x")
+
+    print()
+    print(f"{'host':<28} {'cuerpo':<22} {'subtítulo':<10} {'fecha':<30} aciertos (cuerpo/subt./fecha)")
+    aprendidos = perfiles.aprendidos()
+    for host, campos in sorted(perfiles.tasas().items()):
+        perfil = aprendidos[host]
+        aciertos = " ".join(f"{a}/{i}" for a, i in campos.values())
+        print(f"{host:<28} {perfil.get('body', '-'):<22} {perfil.get('subtitle', '-'):<10} "
+              f"{perfil.get('date', '-'):<30} {aciertos}")
+
+    distintas = [url for (_, url), a, b in zip(paginas, cascada, con_perfil) if _sin_perfil(a) != _sin_perfil(b)]
+    if distintas:
+        print(f"\n⚠️ {len(distintas)} noticias con resultado distinto al de la cascada: {', '.join(distintas[:5])}")
+
+    # Prioridad: el perfil aprendido, y uno forzado con las fuentes de
+    # último recurso, nunca eligen una fuente posterior a la de la cascada
+    forzado = {'body': 'article', 'date': 'url'}
+    peores = []
+    for (soup, url), a, b in zip(paginas, cascada, con_perfil):
+        prioridades = _prioridades(content_parser, soup, url)
+        campos = _peor_prioridad(prioridades, a, b)
+        campos += _peor_prioridad(prioridades, a, _extraer(content_parser, soup, url, forzado))
+        if campos:
+            peores.append(f"{url} ({', '.join(campos)})")
+    aprendidas = {c for perfil in aprendidos.values() for c in perfil.values()} & ULTIMO_RECURSO
+    print(f"\nFuentes de menor prioridad que la cascada: {len(peores)} noticias; "
+          f"de último recurso aprendidas: {len(aprendidas)}")
+    for linea in peores[:5]:
+        print(f"   ⚠️ {linea}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark de inserción masiva: commit por fila vs transacción única.
+
+Uso:
+    python -m benchmarks.bench_db_insert [--noticias 500] [--repeticiones 3]
+
+Trabaja sobre bases SQLite temporales; no toca app/db/news.db.
+"""
+import argparse
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from app.db import database
+from app.models.noticia import Noticia
+
+
+def _generar_noticias(n: int) -> list[Noticia]:
+    """Genera noticias sintéticas con keywords y topics repetidos."""
+    keywords = [f"keyword {i}" for i in range(30)]
+    topics = ["obras públicas", "gestión municipal", "cultura", "deportes"]
+    return [
+        Noticia(
+            url=f"https://example.com/nota-{i}",
+            source="Benchmark",
+            title=f"Titulo {i}",
+            subtitle="Subtitulo",
+            body="Cuerpo de la noticia. " * 100,
+            ai_decision=True,
+            ai_relevance_score=0.9,
+            ai_keywords_found=[keywords[(i + j) % len(keywords)] for j in range(5)],
+            ai_topics=[topics[i % len(topics)], topics[(i + 1) % len(topics)]],
+        )
+        for i in range(n)
+    ]
+
+
+def _insert_nombres_por_fila(cursor, tabla: str, tabla_relacion: str, columna: str,
+                             news_id: int, nombres: list[str] | None):
+    """Implementación anterior de relaciones: INSERT + SELECT por nombre."""
+    for nombre in nombres or []:
+        cursor.execute(f"INSERT OR IGNORE INTO {tabla} (name) VALUES (?)", (nombre,))
+        cursor.execute(f"SELECT id FROM {tabla} WHERE name = ?", (nombre,))
+        nombre_id = cursor.fetchone()[0]
+        cursor.execute(f"INSERT OR IGNORE INTO {tabla_relacion} (news_id, {columna}) VALUES (?, ?)", (news_id, nombre_id))
+
+
+def insert_por_fila(noticias: list[Noticia]) -> dict:
+    """Implementación anterior: un commit por noticia."""
+    stats = {'insertadas': 0, 'duplicadas': 0, 'errores': 0}
+    conn = database.get_connection()
+    cursor = conn.cursor()
+    for noticia in noticias:
+        try:
+            cursor.execute(database.INSERT_NEWS_SQL, database._news_row(noticia))
+            news_id = cursor.lastrowid
+            _insert_nombres_por_fila(cursor, 'keywords', 'news_keywords', 'keyword_id',
+                                     news_id, noticia.ai_keywords_found)
+            _insert_nombres_por_fila(cursor, 'topics', 'news_topics', 'topic_id',
+                                     news_id, noticia.ai_topics)
+            conn.commit()
+            stats['insertadas'] += 1
+        except sqlite3.IntegrityError:
+            stats['duplicadas'] += 1
+        except Exception:
+            stats['errores'] += 1
+    conn.close()
+    return stats
+
+
+def _medir(nombre: str, insert_fn, noticias: list[Noticia], repeticiones: int):
+    """Ejecuta insert_fn sobre una BD nueva en cada repetición."""
+    tiempos = []
+    stats = None
+    for _ in range(repeticiones):
+        with tempfile.TemporaryDirectory() as tmp:
+            database.DB_PATH = Path(tmp) / "bench.db"
+            database.init_database()
+            # Mitad del lote ya existente para ejercitar el camino de duplicadas
+            insert_fn(noticias[: len(noticias) // 2])
+            inicio = time.perf_counter()
+            stats = insert_fn(noticias)
+            tiempos.append(time.perf_counter() - inicio)
+    mejor = min(tiempos)
+    print(f"{nombre:<22} {mejor * 1000:9.1f} ms  ({len(noticias) / mejor:8.0f} noticias/s)  {stats}")
+    return mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noticias", type=int, default=500)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    db_original = database.DB_PATH
+    noticias = _generar_noticias(args.noticias)
+    try:
+        t_fila = _medir("commit por fila", insert_por_fila, noticias, args.repeticiones)
+        t_lote = _medir("transacción única", database.insert_noticias_bulk, noticias, args.repeticiones)
+    finally:
+        database.DB_PATH = db_original
+    print(f"Speed-up: {t_fila / t_lote:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Benchmark del pre-filtro de keywords: un `in` por keyword vs KeywordMatcher.
+
+Uso:
+    python -m benchmarks.bench_keywords [--noticias 3000] [--db app/db/news.db]
+
+Toma título + subtítulo + cuerpo de las noticias guardadas (repitiéndolas
+hasta llegar a --noticias) y mide docs/seg y MB/seg de cada método, sobre
+textos que contienen keywords y sobre los mismos textos sin ellas (el caso
+más común al scrapear, y el peor para la búsqueda por keyword).
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+
+from app.db import database
+from app.utils.keyword_matcher import KeywordMatcher
+from config.sources import KEYWORDS
+
+
+def contiene_keywords_anterior(texto: str) -> bool:
+    """Implementación anterior: un recorrido completo del texto por keyword."""
+    texto = texto.lower()
+    for keyword in KEYWORDS:
+        if keyword.lower() in texto:
+            return True
+    return False
+
+
+def _cargar_textos(db_path: Path, n: int) -> list[str]:
+    """Lee las noticias guardadas y las repite hasta tener n textos."""
+    conn = sqlite3.connect(str(db_path))
+    textos = [
+        f"{title} {subtitle or ''} {body}"
+        for title, subtitle, body in conn.execute("SELECT title, subtitle, body FROM news")
+    ]
+    conn.close()
+    if not textos:
+        raise SystemExit(f"No hay noticias en {db_path}")
+    return (textos * (n // len(textos) + 1))[:n]
+
+
+def _sin_keywords(texto: str, matcher: KeywordMatcher) -> str:
+    """Borra las keywords del texto (mismo largo aproximado, sin matches)."""
+    texto = texto.lower()
+    while matches := matcher.buscar(texto):
+        m = matches[0]
+        texto = texto[:m.start] + "x" * (m.end - m.start) + texto[m.end:]
+    return texto
+
+
+def _medir(fn, textos: list[str]) -> tuple[list, float]:
+    """Aplica fn a todos los textos y retorna (resultados, segundos)."""
+    inicio = time.perf_counter()
+    resultados = [fn(texto) for texto in textos]
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--noticias", type=int, default=3000)
+    parser.add_argument("--db", type=Path, default=database.DB_PATH)
+    args = parser.parse_args()
+
+    compilacion = time.perf_counter()
+    matcher = KeywordMatcher(KEYWORDS)
+    compilacion = time.perf_counter() - compilacion
+
+    con_keywords = _cargar_textos(args.db, args.noticias)
+    sin_keywords = [_sin_keywords(texto, matcher) for texto in con_keywords]
+    mb = sum(len(texto) for texto in con_keywords) / 1e6
+
+    print(f"{len(con_keywords)} textos ({mb:.1f} MB), {len(matcher.keywords)} keywords, "
+          f"backend {matcher.backend} (compilado en {compilacion * 1000:.1f} ms)")
+    print(f"{'método':<28} {'textos':<14} {'docs/s':>9} {'MB/s':>7}")
+
+    metodos = [
+        ("anterior (in por keyword)", contiene_keywords_anterior),
+        ("KeywordMatcher.contiene", matcher.contiene),
+        ("KeywordMatcher.buscar", matcher.buscar),
+    ]
+    for etiqueta, textos in (("con keywords", con_keywords), ("sin keywords", sin_keywords)):
+        referencia, _ = _medir(contiene_keywords_anterior, textos)
+        for nombre, fn in metodos:
+            resultados, segundos = _medir(fn, textos)
+            print(f"{nombre:<28} {etiqueta:<14} {len(textos) / segundos:>9.0f} {mb / segundos:>7.1f}")
+            if [bool(r) for r in resultados] != referencia:
+                print(f"   ⚠️ {nombre}: resultados distintos a la implementación anterior")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark de backends de parseo HTML (docs/seg y paridad de resultados).
+
+Uso:
+    python -m benchmarks.corpus                 # una vez, para guardar páginas
+    python -m benchmarks.bench_parser_backends [--dir benchmarks/corpus]
+
+Para cada backend instalado corre el pipeline completo (ArticleFinder en
+portadas, ContentParser + DateParser en noticias) y compara la salida
+contra html.parser, que es la referencia.
+"""
+import argparse
+import time
+from pathlib import Path
+
+from app.extractors.article_finder import ArticleFinder
+from app.parsers.backend import PARSER_BACKENDS, crear_soup
+from app.parsers.content_parser import ContentParser
+from app.parsers.date_parser import DateParser
+from app.utils.text_utils import decodificar_html
+from benchmarks.corpus import CORPUS_DIR, cargar_corpus
+
+
+def _backend_instalado(backend: str) -> bool:
+    """Verifica si la librería del backend está disponible."""
+    try:
+        from bs4 import BeautifulSoup
+        BeautifulSoup("<p></p>", backend)
+        return True
+    except Exception:
+        return False
+
+
+def _procesar(backend: str, paginas: list[dict]) -> tuple[list, float]:
+    """Parsea todas las páginas con un backend y retorna (resultados, segundos)."""
+    article_finder = ArticleFinder()
+    content_parser = ContentParser()
+    resultados = []
+
+    inicio = time.perf_counter()
+    for pagina in paginas:
+        soup = crear_soup(pagina['html'], backend)
+        if pagina['tipo'] == 'portada':
+            articles = article_finder.encontrar_articulos(soup)
+            resultados.append(article_finder.extraer_urls(articles, pagina['url']) if articles else [])
+        else:
+            contenido = content_parser.extraer_todo(soup)
+            contenido['published_at'] = DateParser.extraer(soup, pagina['url'])
+            resultados.append(contenido)
+    return resultados, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    args = parser.parse_args()
+
+    paginas = cargar_corpus(args.dir)
+    # Decodificar una sola vez: se mide solo el parseo
+    for pagina in paginas:
+        pagina['html'] = decodificar_html(pagina['content'], pagina['encoding'])
+
+    referencia = None
+    print(f"{'backend':<12} {'docs/s':>8} {'seg':>8}  paridad vs html.parser")
+    for backend in PARSER_BACKENDS:
+        if not _backend_instalado(backend):
+            print(f"{backend:<12} {'-':>8} {'-':>8}  (no instalado)")
+            continue
+
+        resultados, segundos = _procesar(backend, paginas)
+        if referencia is None:
+            referencia = resultados
+
+        distintos = [p['archivo'] for p, r, ref in zip(paginas, resultados, referencia) if r != ref]
+        paridad = "idéntica" if not distintos else f"{len(distintos)} distintas: {', '.join(distintos[:5])}"
+        print(f"{backend:<12} {len(paginas) / segundos:8.1f} {segundos:8.2f}  {paridad}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+"""
+Microbenchmark de la validación de URLs de artículos.
+
+Uso:
+    python -m benchmarks.bench_url_validator [--dir benchmarks/corpus] [--repeticiones 5]
+
+Junta todos los href de las portadas del corpus (en orden, con sus
+repeticiones) y los valida con la implementación anterior de
+ArticleFinder._validar_url (dos urlparse por href, lista de exclusiones
+armada en cada llamada y re.match sin compilar) y con UrlValidator, y
+verifica que ambas den el mismo resultado para cada href.
+
+UrlValidator se mide con la cache de urljoin vacía al empezar cada
+portada (como en una corrida real, donde cada portada se parsea una vez)
+y con la cache caliente (todos los href ya vistos).
+"""
+import argparse
+import re
+import time
+from pathlib import Path
+from urllib.parse import urljoin, urlparse
+
+from app.extractors.article_finder import ArticleFinder, UrlValidator, _resolver_url
+from app.extractors.front_page_scanner import FrontPageScanner
+from app.utils.text_utils import decodificar_html
+from benchmarks.corpus import CORPUS_DIR, cargar_corpus
+
+
+def validar_url_anterior(href: str, source_url: str, source_domain: str) -> str | None:
+    """Implementación anterior de ArticleFinder._validar_url."""
+    normalizar = lambda domain: domain.lower().removeprefix('www.')
+    url_completa = urljoin(source_url, href)
+    news_domain = urlparse(url_completa).netloc
+    if '{{' in url_completa:
+        return None
+    if normalizar(source_domain) != normalizar(news_domain):
+        return None
+    path = urlparse(url_completa).path.lower()
+    excluded_patterns = [
+        '/category/', '/tag/', '/author/', '/page/', '/secciones/',
+        '/wp-content/', '/wp-admin/', '/feed/',
+        '/#', '/search', '/contacto', '/quienes-somos',
+        '/politica-de-privacidad', '/terminos',
+    ]
+    if any(pattern in path for pattern in excluded_patterns):
+        return None
+    if re.match(r'^/\d{4}/\d{2}/\d{2}/?$', path):
+        return None
+    if path in ['/', '']:
+        return None
+    if len(path) < 5:
+        return None
+    return url_completa
+
+
+def _con_anterior(paginas: list) -> list:
+    resultados = []
+    for source_url, hrefs in paginas:
+        source_domain = urlparse(source_url).netloc
+        resultados.append([validar_url_anterior(href, source_url, source_domain) for href in hrefs])
+    return resultados
+
+
+def _con_validador(paginas: list, cache_fria: bool) -> list:
+    resultados = []
+    for source_url, hrefs in paginas:
+        if cache_fria:
+            _resolver_url.cache_clear()
+        validador = UrlValidator(source_url)
+        resultados.append([validador.validar(href) for href in hrefs])
+    return resultados
+
+
+def _medir(fn, repeticiones: int) -> tuple[list, float]:
+    """Ejecuta fn; retorna el resultado y el mejor tiempo."""
+    mejor = float('inf')
+    resultados = None
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        resultados = fn()
+        mejor = min(mejor, time.perf_counter() - inicio)
+    return resultados, mejor
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    args = parser.parse_args()
+
+    finder = ArticleFinder()
+    scanner = FrontPageScanner(finder.selector_matcher, None)
+    paginas = []
+    for portada in cargar_corpus(args.dir, tipo="portada"):
+        scanner.escanear(decodificar_html(portada['content'], portada['encoding']))
+        paginas.append((portada['url'], [enlace.href for enlace in scanner.enlaces]))
+
+    total = sum(len(hrefs) for _, hrefs in paginas)
+    distintos = sum(len(set(hrefs)) for _, hrefs in paginas)
+    print(f"{len(paginas)} portadas, {total} href ({distintos} distintos por portada)")
+
+    anteriores, t_anterior = _medir(lambda: _con_anterior(paginas), args.repeticiones)
+    frios, t_frio = _medir(lambda: _con_validador(paginas, cache_fria=True), args.repeticiones)
+    calientes, t_caliente = _medir(lambda: _con_validador(paginas, cache_fria=False), args.repeticiones)
+
+    print(f"{'método':<34} {'µs/href':>8} {'mejora':>7}")
+    print(f"{'anterior (_validar_url)':<34} {t_anterior / total * 1e6:>8.2f} {'':>7}")
+    print(f"{'UrlValidator, cache fría':<34} {t_frio / total * 1e6:>8.2f} {t_anterior / t_frio:>6.1f}x")
+    print(f"{'UrlValidator, cache caliente':<34} {t_caliente / total * 1e6:>8.2f} {t_anterior / t_caliente:>6.1f}x")
+
+    for (source_url, hrefs), anterior, frio, caliente in zip(paginas, anteriores, frios, calientes):
+        distintas = sum(a != f or a != c for a, f, c in zip(anterior, frio, caliente))
+        if distintas:
+            print(f"   ⚠️ {source_url}: {distintas} href validados distinto")
+
+
+if __name__ == "__main__":
+    main()
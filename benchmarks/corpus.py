@@ -0,0 +1,105 @@
+"""
+Corpus de páginas guardadas para los benchmarks de parseo.
+
+Uso:
+    python -m benchmarks.corpus [--dir benchmarks/corpus] [--noticias 10]
+
+Descarga la portada de cada fuente habilitada y las primeras N noticias
+de cada una, y las guarda como bytes crudos junto a un index.json. Los
+benchmarks leen ese directorio con cargar_corpus() para trabajar siempre
+sobre el mismo HTML, sin red.
+"""
+import argparse
+import asyncio
+import json
+import re
+from pathlib import Path
+
+from app.http import AsyncHTTPClient
+from app.parsers.parse_executor import parsear_portada
+from config.sources import get_enabled_sources
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+
+
+def _slug(texto: str) -> str:
+    """Convierte un nombre de fuente en un nombre de archivo."""
+    return re.sub(r'[^a-z0-9]+', '-', texto.lower()).strip('-')
+
+
+async def guardar_corpus(directorio: Path = CORPUS_DIR, noticias_por_fuente: int = 10) -> list[dict]:
+    """
+    Descarga portadas y noticias y las guarda en el directorio.
+
+    Returns:
+        Lista de entradas del índice
+    """
+    directorio.mkdir(parents=True, exist_ok=True)
+    http_client = AsyncHTTPClient()
+    indice = []
+
+    async with http_client.sesion(10) as session:
+        for source in get_enabled_sources():
+            slug = _slug(source['name'])
+            portada = await http_client.fetch_bytes(session, source['url'])
+            if not portada:
+                print(f"✗ {source['name']}: sin portada")
+                continue
+
+            archivo = f"portada-{slug}.html"
+            (directorio / archivo).write_bytes(portada.content)
+            indice.append({'archivo': archivo, 'tipo': 'portada', 'fuente': source['name'],
+                           'url': source['url'], 'encoding': portada.encoding})
+
+            _, urls = parsear_portada(portada.content, portada.encoding, source['url'])
+            respuestas = await asyncio.gather(*[
+                http_client.fetch_bytes(session, url) for url in urls[:noticias_por_fuente]
+            ])
+            for i, respuesta in enumerate(respuestas):
+                if not respuesta:
+                    continue
+                archivo = f"noticia-{slug}-{i}.html"
+                (directorio / archivo).write_bytes(respuesta.content)
+                indice.append({'archivo': archivo, 'tipo': 'noticia', 'fuente': source['name'],
+                               'url': respuesta.url, 'encoding': respuesta.encoding})
+            print(f"✓ {source['name']}: portada + {sum(1 for r in respuestas if r)} noticias")
+
+    (directorio / "index.json").write_text(json.dumps(indice, indent=2, ensure_ascii=False), encoding='utf-8')
+    return indice
+
+
+def cargar_corpus(directorio: Path = CORPUS_DIR, tipo: str = None) -> list[dict]:
+    """
+    Carga el corpus guardado.
+
+    Args:
+        directorio: Directorio del corpus
+        tipo: "portada", "noticia" o None para todo
+
+    Returns:
+        Lista de dicts con url, fuente, encoding y content (bytes)
+    """
+    indice_path = directorio / "index.json"
+    if not indice_path.exists():
+        raise SystemExit(f"No hay corpus en {directorio}. Generalo con: python -m benchmarks.corpus")
+
+    entradas = json.loads(indice_path.read_text(encoding='utf-8'))
+    return [
+        {**entrada, 'content': (directorio / entrada['archivo']).read_bytes()}
+        for entrada in entradas
+        if tipo is None or entrada['tipo'] == tipo
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--dir", type=Path, default=CORPUS_DIR)
+    parser.add_argument("--noticias", type=int, default=10)
+    args = parser.parse_args()
+
+    indice = asyncio.run(guardar_corpus(args.dir, args.noticias))
+    print(f"Corpus guardado en {args.dir} ({len(indice)} páginas)")
+
+
+if __name__ == "__main__":
+    main()
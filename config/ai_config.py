@@ -28,6 +28,60 @@ AI_CONFIG = {
     # Solo se guardarán noticias con score >= este valor
     "relevance_threshold": 0.6,
     
+    # Llamadas simultáneas a la API de Groq
+    "max_concurrent": 5,
+    
+    # Límites de la cuenta (ver https://console.groq.com/settings/limits).
+    # Las llamadas se espacian para no superarlos; None = sin límite.
+    # - rpm: requests por minuto
+    # - tpm: tokens por minuto (prompt + respuesta)
+    "rpm": 30,
+    "tpm": 12000,
+    
+    # Noticias por request al filtrar una lista (filter_noticias):
+    # - 1: un request por noticia (comportamiento original)
+    # - 5-10: el contexto, los topics y las instrucciones se envían una vez
+    #   por lote, gastando muchos menos tokens. Si la respuesta de un lote no
+    #   es un JSON válido, esas noticias se reanalizan de a una.
+    "batch_size": 1,
+    
+    # Clasificador local (Naive Bayes) antes de llamar a Groq. Se entrena
+    # con las decisiones previas del LLM: python train_classifier.py
+    # - auto_reject: descartar sin consultar las claramente irrelevantes
+    #   (umbral elegido para el recall pedido al entrenar). Apagado hasta
+    #   validar el clasificador con datos reales (ver train_classifier.py).
+    # - auto_accept: aceptar sin consultar las claramente relevantes. Esas
+    #   noticias quedan sin sentiment, tono ni topics.
+    "local_classifier": {
+        "enabled": True,
+        "auto_reject": False,
+        "auto_accept": False,
+    },
+    
+    # Reutilizar resultados ya analizados (app/db/ai_cache.db). Se invalida
+    # sola si cambia el context_prompt o ALLOWED_TOPICS.
+    "cache": True,
+    
+    # Proveedor del LLM:
+    # - "groq": API de Groq (requiere api_key)
+    # - "fake": simulador local, sin red ni API key, para benchmarks y
+    #   pruebas de carga (benchmarks/bench_ai_stage.py). Sus decisiones son
+    #   inventadas: no usarlo para guardar noticias reales.
+    "provider": "groq",
+    
+    # Parámetros del simulador (solo con provider = "fake"),
+    # ver app/utils/fake_llm.py
+    "fake": {
+        "latency": (0.3, 1.2),
+        "error_rate": 0.0,
+        "rate_limit_rate": 0.0,
+        "rpm_limit": None,
+        "invalid_json_rate": 0.0,
+        "relevant_rate": 0.3,
+        "max_retries": 2,
+        "seed": 0,
+    },
+    
     # Prompt del contexto de filtrado
     # Este es el criterio que la IA usará para determinar relevancia
     "context_prompt": """
@@ -17,9 +17,124 @@ SCRAPING_CONFIG = {
     # Límite de conexiones por host (evita saturar un mismo servidor)
     "limit_per_host": 5,
     
+    # Manejo de conexiones HTTP:
+    # - "keepalive": reutiliza conexiones por host (un handshake TCP/TLS por conexión)
+    # - "force_close": una conexión nueva por request (comportamiento anterior)
+    "connection_mode": "keepalive",
+    
+    # Segundos que una conexión ociosa queda en el pool (modo keepalive)
+    "keepalive_timeout": 15,
+    
+    # Segundos que se cachean las resoluciones DNS (modo keepalive)
+    "ttl_dns_cache": 300,
+    
+    # Concurrencia adaptativa por host (AIMD): arranca en limit_per_host,
+    # sube mientras las respuestas son rápidas y sin errores, y se reduce a
+    # la mitad ante timeouts, 429 o 5xx. Los límites aprendidos se guardan
+    # en app/db/host_limits.json y se reutilizan en la siguiente ejecución.
+    "adaptive_concurrency": {
+        "enabled": True,
+        "min_per_host": 1,
+        "max_per_host": 15,
+        "decrease_factor": 0.5,
+        # Respuestas exitosas más lentas que esto (s) no amplían el límite
+        "slow_latency": 5.0,
+    },
+    
     # Timeout en segundos para cada request HTTP
     "request_timeout": 15,
     
+    # Dónde parsear el HTML (trabajo de CPU) para no frenar las descargas:
+    # - "process": pool de procesos (RECOMENDADO, usa todos los núcleos)
+    # - "thread": pool de threads
+    # - "inline": dentro del event loop (comportamiento original)
+    "parse_executor": "process",
+    
+    # Workers del pool de parseo (None = cantidad de núcleos)
+    "parse_workers": None,
+    
+    # Parser HTML usado por BeautifulSoup:
+    # - "html.parser": librería estándar (sin dependencias, el más lento)
+    # - "lxml": en C, varias veces más rápido (pip install lxml)
+    # - "html5lib": igual que un navegador, el más lento
+    # Validar con benchmarks/bench_parser_backends.py antes de cambiarlo
+    "parser_backend": "html.parser",
+    
+    # Extraer los enlaces de las portadas en un solo recorrido en streaming,
+    # sin construir el árbol de BeautifulSoup (mismo resultado, menos CPU y
+    # memoria). Solo aplica con parser_backend = "html.parser".
+    "front_page_streaming": True,
+    
+    # Perfiles de extracción por host: recordar qué selector dio el cuerpo,
+    # el subtítulo y la fecha de cada diario y probarlo primero la próxima
+    # vez (la cascada completa solo corre si falla). Se guardan en
+    # app/db/extraction_profiles.json y se reutilizan entre ejecuciones.
+    "extraction_profiles": {
+        "enabled": True,
+        # Noticias seguidas en las que un selector debe ganar la cascada
+        # completa para aprenderlo (una página atípica no cambia el perfil)
+        "confirmations": 3,
+    },
+    
+    # Omitir URLs que ya están en la base de datos antes de descargarlas
+    "skip_known_urls": True,
+    
+    # Pre-filtro por keywords (config/sources.py) durante el scraping
+    "keyword_prefilter": {
+        # Descartar cada noticia apenas se extrae el cuerpo si no tiene
+        # keywords (en el worker de parseo, antes de armar la Noticia)
+        "early_reject": True,
+        # Descartar desde la portada, sin descargar la noticia, si el texto
+        # del enlace (o su atributo title) no tiene keywords. Ahorra la
+        # mayoría de las descargas pero pierde las noticias cuyo titular
+        # no menciona ninguna keyword.
+        "front_page": False,
+    },
+    
+    # Agrupar noticias casi idénticas entre fuentes (la misma gacetilla en
+    # varios diarios) después del filtro por keywords. La IA analiza una
+    # noticia por grupo y copia el resultado al resto; el cluster_id queda
+    # en la BD para que los reportes muestren cada historia una sola vez.
+    "near_duplicates": {
+        "enabled": True,
+        # Bits distintos (de 64) de la huella SimHash para considerar dos
+        # noticias la misma. Notas distintas suelen estar a más de 20.
+        "max_distance": 10,
+        # Palabras mínimas (título + cuerpo) para agrupar una noticia. Con
+        # menos, la huella no distingue notas distintas y queda sin grupo.
+        "min_words": 20,
+    },
+    
+    # Cache HTTP persistente (ETag / Last-Modified) en app/db/http_cache.db
+    "http_cache": {
+        "enabled": True,
+        # Qué hacer ante un 304 (página sin cambios):
+        # - "cached_body": reutilizar el cuerpo guardado y procesarlo igual
+        # - "skip": saltear la página (no se vuelve a parsear)
+        "on_not_modified": "cached_body",
+        # Entradas más viejas que esto se descartan
+        "max_age_days": 7,
+    },
+    
+    # Pipeline por etapas (descubrir → descargar → parsear → keywords → IA → guardar)
+    # conectadas con colas acotadas. Si está deshabilitado, main.py usa el
+    # flujo por lotes (scrapear todo, después filtrar, después guardar).
+    "pipeline": {
+        "enabled": True,
+        # Tamaño máximo de cada cola entre etapas (backpressure)
+        "queue_size": 100,
+        # Workers por etapa (None = valor por defecto de la etapa)
+        "discover_workers": 4,
+        # Descargas: workers por host (None = limit_per_host, el techo AIMD);
+        # el total de requests simultáneos lo limita max_concurrent_requests
+        "fetch_workers_per_host": None,
+        "parse_workers": None,   # None = workers del ParseExecutor
+        "ai_workers": None,      # None = AI_CONFIG["max_concurrent"]
+        # Guardar en la BD cada N noticias o cada N segundos
+        "persist_batch_size": 20,
+        "persist_interval": 5.0,
+    },
+    
     # User-Agent para las peticiones HTTP
     "user_agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36",
 }
@@ -2,6 +2,7 @@
 Configuración de fuentes de noticias.
 Define las URLs y configuración para cada diario a scrapear.
 """
+from app.utils.keyword_matcher import KeywordMatcher, KeywordMatch
 
 SOURCES = [
     {
@@ -90,11 +91,13 @@ SOURCES = [
 #     "susy.laciar"
 # ]
 
+# Cada keyword se escribe una sola vez: la búsqueda ignora mayúsculas y
+# tildes ("gestión" también encuentra "gestion" y "GESTION").
 KEYWORDS = [
     # Intendenta / gestión
     "susana laciar", "susana e. laciar", "susy laciar", "laciar",
     "intendenta susana laciar", "intendenta de la ciudad de san juan",
-    "gestion susana laciar", "gestión susana laciar",
+    "gestión susana laciar",
     "administración laciar", "equipo de gobierno municipal",
 
     # Municipalidad
@@ -104,14 +107,14 @@ KEYWORDS = [
     "concejo deliberante de capital", "concejo deliberante de san juan",
 
     # Cargo / función
-    "intendenta de san juan", "intendente capital", "intendente de san juan"
+    "intendenta de san juan", "intendente capital", "intendente de san juan",
     "ejecutivo municipal", "autoridades municipales",
 
     # Ciudad / capital
     "ciudad de san juan", "capital sanjuanina", "departamento capital",
 
     # Barrios
-    "trinidad", "desamparados", "concepción", "concepcion",
+    "trinidad", "desamparados", "concepción",
     "microcentro", "plaza 25 de mayo",
 
     # Temas municipales
@@ -136,14 +139,32 @@ def get_source_by_name(name):
     return None
 
 
+_keyword_matcher = None
+
+
+def get_keyword_matcher() -> KeywordMatcher:
+    """Retorna el matcher de KEYWORDS (se compila una sola vez)."""
+    global _keyword_matcher
+    if _keyword_matcher is None:
+        _keyword_matcher = KeywordMatcher(KEYWORDS)
+    return _keyword_matcher
+
+
+def texto_para_keywords(title, subtitle, body):
+    """Concatena título, subtítulo y cuerpo para buscar keywords."""
+    return f"{title} {subtitle or ''} {body}"
+
+
+def texto_contiene_keywords(texto):
+    """Verifica si un texto contiene alguna de las keywords configuradas."""
+    return get_keyword_matcher().contiene(texto)
+
+
 def noticia_contiene_keywords(noticia):
     """Verifica si una noticia contiene alguna de las keywords configuradas."""
-    # Concatenar título, subtítulo y cuerpo para buscar
-    texto_completo = f"{noticia.title} {noticia.subtitle or ''} {noticia.body}".lower()
-    
-    # Verificar si alguna keyword está presente
-    for keyword in KEYWORDS:
-        if keyword.lower() in texto_completo:
-            return True
-    
-    return False
+    return texto_contiene_keywords(texto_para_keywords(noticia.title, noticia.subtitle, noticia.body))
+
+
+def keywords_en_noticia(noticia) -> list[KeywordMatch]:
+    """Retorna todas las keywords encontradas en la noticia, con su posición."""
+    return get_keyword_matcher().buscar(texto_para_keywords(noticia.title, noticia.subtitle, noticia.body))
@@ -39,31 +39,53 @@ def get_noticia_with_relations(news_id: int, cursor) -> dict:
     return noticia
 
 
+def agrupar_por_cluster(noticias: list) -> list:
+    """
+    Agrupa las noticias casi idénticas (mismo cluster_id) manteniendo el
+    orden: cada grupo aparece donde aparece su primera noticia.
+    
+    Returns:
+        Lista de grupos (listas de filas); el último campo de cada fila
+        es el cluster_id (None = noticia sin agrupar)
+    """
+    grupos = {}
+    for row in noticias:
+        cluster_id = row[-1]
+        clave = cluster_id if cluster_id is not None else ('id', row[0])
+        grupos.setdefault(clave, []).append(row)
+    return list(grupos.values())
+
+
 def generate_report():
     """Genera reporte de todas las noticias."""
     
     conn = sqlite3.connect(str(DB_PATH))
     cursor = conn.cursor()
     
+    # BDs anteriores a la columna cluster_id (la agrega init_database)
+    cursor.execute("PRAGMA table_info(news)")
+    tiene_cluster = any(col[1] == 'cluster_id' for col in cursor.fetchall())
+    
     # Obtener todas las noticias relevantes
-    cursor.execute("""
+    cursor.execute(f"""
         SELECT id, url, source, title,
                ai_relevance_score, ai_decision, ai_reasoning,
                ai_sentiment, ai_sentiment_score, ai_sentiment_confidence,
-               ai_tone, ai_main_topic
+               ai_tone, ai_main_topic, {'cluster_id' if tiene_cluster else 'NULL'}
         FROM news
         WHERE ai_decision = 1
         ORDER BY ai_relevance_score DESC
     """)
     
     noticias = cursor.fetchall()
+    grupos = agrupar_por_cluster(noticias)
     
     # Generar reporte
     with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
         f.write("=" * 100 + "\n")
         f.write("REPORTE DE NOTICIAS FILTRADAS - MUNICIPALIDAD DE SAN JUAN\n")
         f.write(f"Generado: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"Total de noticias relevantes: {len(noticias)}\n")
+        f.write(f"Total de noticias relevantes: {len(noticias)} ({len(grupos)} historias distintas)\n")
         f.write("=" * 100 + "\n\n")
         
         # Explicación compacta de campos
@@ -77,11 +99,11 @@ def generate_report():
         f.write("• Keywords: Nombres propios, lugares, programas mencionados\n")
         f.write("=" * 100 + "\n\n\n")
         
-        for idx, row in enumerate(noticias, 1):
+        for idx, grupo in enumerate(grupos, 1):
             (news_id, url, source, title,
              ai_score, ai_decision, ai_reasoning,
              ai_sentiment, ai_sentiment_score, ai_sentiment_confidence,
-             ai_tone, ai_main_topic) = row
+             ai_tone, ai_main_topic, cluster_id) = grupo[0]
             
             # Obtener relaciones
             noticia_full = get_noticia_with_relations(news_id, cursor)
@@ -90,7 +112,12 @@ def generate_report():
             f.write(f"[{idx}] {title}\n")
             f.write(f"{'─' * 100}\n")
             f.write(f"Fuente: {source}\n")
-            f.write(f"URL: {url}\n\n")
+            f.write(f"URL: {url}\n")
+            if len(grupo) > 1:
+                f.write(f"También publicada en ({len(grupo) - 1}):\n")
+                for copia in grupo[1:]:
+                    f.write(f"   • {copia[2]}: {copia[1]}\n")
+            f.write("\n")
             
             f.write(f"Relevancia: {ai_score:.3f} | Sentimiento: {ai_sentiment or 'N/A'} ({ai_sentiment_score or 'N/A'}) | Tono: {ai_tone or 'N/A'}\n")
             f.write(f"Razonamiento IA: {ai_reasoning or 'N/A'}\n\n")
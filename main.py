@@ -3,12 +3,15 @@ Script principal para ejecutar los scrapers del proyecto.
 Scrapea noticias de múltiples diarios configurados en config/sources.py
 """
 
-from app.scrapers import AsyncNewsScraper
+import asyncio
+
+from app.scrapers import AsyncNewsScraper, ScrapePipeline
 from app.db.database import init_database, insert_noticias_bulk, get_noticias_count
 from config.sources import get_enabled_sources
 from config.ai_config import get_ai_config
 from config.settings import get_scraping_config
 from app.utils.ai_filter import AIFilter, get_ai_filter
+from app.utils.near_duplicates import agrupar_duplicados
 from config.logging_config import setup_logging, get_logger
 from config.settings import get_logging_config
 
@@ -23,16 +26,31 @@ def filtrar_con_ia(noticias, ai_filter: AIFilter):
     logger.info(f"   Analizando {len(noticias)} noticias...")
     
     noticias_relevantes = ai_filter.filter_noticias(noticias)
+    imprimir_stats_ia(ai_filter)
     
+    return noticias_relevantes
+
+
+def imprimir_stats_ia(ai_filter: AIFilter):
+    """Imprime las estadísticas del filtrado con IA."""
     stats = ai_filter.get_stats()
     logger.info(f"   📊 Resultados IA:")
     logger.info(f"      Total analizadas: {stats['total_analyzed']}")
     logger.info(f"      Relevantes: {stats['relevant']}")
     logger.info(f"      No relevantes: {stats['not_relevant']}")
+    if stats['cluster_copies']:
+        logger.info(f"      Copiadas de una noticia casi idéntica: {stats['cluster_copies']}")
+    if stats['cache_hits'] or stats['cache_misses']:
+        logger.info(f"      Cache: {stats['cache_hits']} aciertos, {stats['cache_misses']} sin cache")
+    if stats['local_rejected'] or stats['local_accepted']:
+        logger.info(f"      Clasificador local: {stats['local_rejected']} descartadas, "
+                    f"{stats['local_accepted']} aceptadas sin llamar a la API")
+    if stats['prompt_tokens']:
+        logger.info(f"      Tokens: {stats['prompt_tokens']} de prompt "
+                    f"({stats['cached_tokens']} en cache del proveedor), "
+                    f"{stats['completion_tokens']} de respuesta")
     if stats['errors'] > 0:
         logger.warning(f"      Errores: {stats['errors']}")
-    
-    return noticias_relevantes
 
 
 if __name__ == "__main__":
@@ -56,7 +74,7 @@ if __name__ == "__main__":
     max_concurrent = scraping_config['max_concurrent_requests']
     
     if ai_filter:
-        logger.info(f"🤖 Filtrado IA habilitado: Groq ({ai_config['model']})")
+        logger.info(f"🤖 Filtrado IA habilitado: {ai_filter.provider.NOMBRE} ({ai_filter.provider.model})")
     else:
         logger.info("🤖 Filtrado IA deshabilitado (solo keywords)")
 
@@ -71,8 +89,19 @@ if __name__ == "__main__":
     
     logger.info(f"Fuentes habilitadas: {', '.join([s['name'] for s in sources])}")
     
-    # Ejecutar scraping
     scraper = AsyncNewsScraper(max_concurrent_requests=max_concurrent)
+    
+    # Modo pipeline: scraping, filtrado y guardado en paralelo por etapas
+    if scraping_config.get('pipeline', {}).get('enabled', False):
+        pipeline = ScrapePipeline(scraper, ai_filter=ai_filter)
+        asyncio.run(pipeline.run(sources))
+        if ai_filter:
+            imprimir_stats_ia(ai_filter)
+        logger.info(f"📊 Total de noticias en BD: {get_noticias_count()}")
+        logger.info(f"✓ Proceso completado exitosamente")
+        exit(0)
+    
+    # Ejecutar scraping
     noticias = scraper.scrape(sources)
     
 
@@ -89,6 +118,14 @@ if __name__ == "__main__":
         
         noticias = noticias_filtradas
         
+        # Agrupar copias de la misma noticia en distintas fuentes
+        dedup_config = scraping_config.get('near_duplicates', {})
+        if dedup_config.get('enabled', False) and noticias:
+            indice = agrupar_duplicados(noticias, dedup_config.get('max_distance', 10),
+                                        dedup_config.get('min_words', 20))
+            logger.info(f"🧬 Noticias casi idénticas: {len(indice.clusters)} historias distintas, "
+                        f"{indice.duplicadas} copias")
+        
         # Filtrar con IA (si está habilitado)
         if ai_filter and noticias:
             noticias = filtrar_con_ia(noticias, ai_filter)
@@ -0,0 +1,50 @@
+"""
+Tests de la cache de IA y de los ejemplos para el clasificador local.
+"""
+import sqlite3
+
+from app.utils.ai_cache import AICache, cargar_ejemplos
+
+RELEVANTE = {'is_relevant': True, 'relevance_score': 0.9}
+NO_RELEVANTE = {'is_relevant': False, 'relevance_score': 0.1}
+
+
+def test_invalidar_la_cache_conserva_los_ejemplos(tmp_path):
+    path = tmp_path / "ai_cache.db"
+    cache = AICache("prompt", "modelo", ["economía"], path)
+    cache.guardar(cache.clave("Título", None, "Cuerpo"), "Título", None, "Cuerpo", NO_RELEVANTE)
+    cache.cerrar()
+
+    cache = AICache("otro prompt", "modelo", ["economía"], path)
+    assert cache.obtener(cache.clave("Título", None, "Cuerpo")) is None
+    cache.cerrar()
+
+    assert cargar_ejemplos("modelo", path) == [("Título", None, "Cuerpo", NO_RELEVANTE)]
+
+
+def test_ejemplos_filtrados_por_modelo(tmp_path):
+    path = tmp_path / "ai_cache.db"
+    for model, resultado in (("modelo", RELEVANTE), ("fake/modelo", NO_RELEVANTE)):
+        cache = AICache("prompt", model, ["economía"], path)
+        cache.guardar(cache.clave("Título", None, "Cuerpo"), "Título", None, "Cuerpo", resultado)
+        cache.cerrar()
+
+    assert cargar_ejemplos("modelo", path) == [("Título", None, "Cuerpo", RELEVANTE)]
+    assert cargar_ejemplos("otro", path) == []
+
+
+def test_cache_anterior_pasa_a_ejemplos(tmp_path):
+    path = tmp_path / "ai_cache.db"
+    conn = sqlite3.connect(str(path))
+    conn.execute(
+        "CREATE TABLE ai_cache (key TEXT PRIMARY KEY, model TEXT, title TEXT, subtitle TEXT, "
+        "body TEXT, result TEXT, created_at REAL)"
+    )
+    conn.execute(
+        "INSERT INTO ai_cache VALUES ('k', 'modelo', 'Título', NULL, 'Cuerpo', "
+        "'{\"is_relevant\": true, \"relevance_score\": 0.9}', 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    assert cargar_ejemplos("modelo", path) == [("Título", None, "Cuerpo", RELEVANTE)]
@@ -0,0 +1,71 @@
+"""
+Tests del filtro de IA contra el LLM simulado (sin red ni API key).
+"""
+import threading
+
+import pytest
+
+from app.models.noticia import Noticia
+from app.utils.ai_filter import AIFilter
+
+
+def _noticias(n: int) -> list[Noticia]:
+    return [
+        Noticia(url=f"https://example.com/nota-{i}", source="Diario", title=f"Noticia de prueba número {i}",
+                body="Cuerpo de la noticia sobre la gestión municipal. " * 10)
+        for i in range(n)
+    ]
+
+
+def _filtro(tmp_path, **kwargs) -> AIFilter:
+    opciones = {'latency': (0, 0), **kwargs.pop('provider_options', {})}
+    return AIFilter(api_key="", model="test", context_prompt="Noticias de la Municipalidad.",
+                    provider="fake", provider_options=opciones, cache_path=tmp_path / "ai_cache.db", **kwargs)
+
+
+@pytest.mark.parametrize("batch_size", [1, 4])
+def test_la_cache_se_usa_fuera_del_event_loop(tmp_path, batch_size):
+    ai_filter = _filtro(tmp_path, batch_size=batch_size)
+    threads = []
+    for nombre in ('obtener', 'guardar_varios'):
+        original = getattr(ai_filter.cache, nombre)
+
+        def anotando(*args, original=original):
+            threads.append(threading.get_ident())
+            return original(*args)
+
+        setattr(ai_filter.cache, nombre, anotando)
+
+    relevantes = ai_filter.filter_noticias(_noticias(10))
+
+    assert threads and threading.get_ident() not in threads
+    assert ai_filter.provider.server.stats['requests'] == 10 // batch_size + (10 % batch_size > 0)
+
+    # Segunda corrida: todo sale de la cache
+    otra = _filtro(tmp_path, batch_size=batch_size)
+    assert [n.url for n in otra.filter_noticias(_noticias(10))] == [n.url for n in relevantes]
+    assert otra.provider.server.stats['requests'] == 0
+    assert otra.get_stats()['cache_hits'] == 10
+
+
+def test_lote_invalido_se_analiza_de_a_una(tmp_path):
+    esperadas = _filtro(tmp_path, cache=False).filter_noticias(_noticias(6))
+
+    ai_filter = _filtro(tmp_path, batch_size=3)
+    lotes = []
+
+    async def lote_invalido(noticias, context_prompt):
+        lotes.append(len(noticias))
+        return None
+
+    ai_filter.provider.analyze_batch_async = lote_invalido
+    relevantes = ai_filter.filter_noticias(_noticias(6))
+
+    assert lotes == [3, 3]
+    assert ai_filter.provider.server.stats['requests'] == 6
+    assert [n.url for n in relevantes] == [n.url for n in esperadas]
+    assert ai_filter.get_stats()['errors'] == 0
+    # Los resultados de las noticias analizadas de a una quedan en la cache
+    otra = _filtro(tmp_path, batch_size=3)
+    otra.filter_noticias(_noticias(6))
+    assert otra.get_stats()['cache_hits'] == 6
@@ -0,0 +1,65 @@
+"""
+Tests de la inserción de noticias en lote.
+"""
+import pytest
+
+from app.db import database
+from app.models.noticia import Noticia
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_PATH', tmp_path / "news.db")
+    database.init_database()
+
+
+def _noticia(n: int, keywords: list[str]) -> Noticia:
+    return Noticia(url=f"https://diario.com.ar/nota/{n}", source="Diario", title=f"Nota {n}",
+                   body="Cuerpo", ai_keywords_found=keywords)
+
+
+def _keywords_por_url() -> dict[str, list[str]]:
+    conn = database.get_connection()
+    filas = conn.execute("""
+        SELECT n.url, k.name FROM news n
+        JOIN news_keywords nk ON nk.news_id = n.id
+        JOIN keywords k ON k.id = nk.keyword_id
+        ORDER BY n.url, k.name
+    """).fetchall()
+    conn.close()
+    por_url = {}
+    for url, nombre in filas:
+        por_url.setdefault(url, []).append(nombre)
+    return por_url
+
+
+def test_lote_completo(db):
+    noticias = [_noticia(1, ['obra']), _noticia(2, ['obra', 'salud']), _noticia(1, ['obra'])]
+
+    assert database.insert_noticias_bulk(noticias) == {'insertadas': 2, 'duplicadas': 1, 'errores': 0}
+    assert database.insert_noticias_bulk(noticias[:1]) == {'insertadas': 0, 'duplicadas': 1, 'errores': 0}
+    assert _keywords_por_url() == {
+        "https://diario.com.ar/nota/1": ['obra'],
+        "https://diario.com.ar/nota/2": ['obra', 'salud'],
+    }
+
+
+def test_fila_invalida_no_deshace_las_demas(db):
+    # Falla después de insertar sus keywords (sqlite no sabe guardar una
+    # tupla como topic): la keyword nueva se revierte y la cache de ids
+    # tiene que olvidarla para que la fila siguiente la vuelva a crear
+    invalida = _noticia(2, ['obra', 'nueva', 'solo-invalida'])
+    invalida.ai_topics = [('no', 'soportado')]
+    noticias = [_noticia(1, ['obra']), invalida, _noticia(3, ['obra', 'nueva'])]
+
+    assert database.insert_noticias_bulk(noticias) == {'insertadas': 2, 'duplicadas': 0, 'errores': 1}
+    assert database.get_noticias_count() == 2
+    assert _keywords_por_url() == {
+        "https://diario.com.ar/nota/1": ['obra'],
+        "https://diario.com.ar/nota/3": ['nueva', 'obra'],
+    }
+
+    # Las keywords de la fila revertida no quedan en la BD
+    conn = database.get_connection()
+    assert conn.execute("SELECT COUNT(*) FROM keywords WHERE name = 'solo-invalida'").fetchone()[0] == 0
+    conn.close()
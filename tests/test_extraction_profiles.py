@@ -0,0 +1,101 @@
+"""
+Tests de los perfiles de extracción por host.
+"""
+import json
+
+import pytest
+from bs4 import BeautifulSoup
+
+from app.parsers.date_parser import DateParser
+from app.parsers.extraction_profiles import ExtractionProfiles, en_cascada
+
+URL = "https://www.diario.com.ar/2025/03/04/nota"
+
+
+def _opciones(resultados: dict, llamadas: list):
+    """Opciones de cascada que devuelven resultados[clave] y anotan la llamada."""
+    def extractor(clave):
+        llamadas.append(clave)
+        return resultados.get(clave)
+    return [(clave, lambda clave=clave: extractor(clave)) for clave in ('a', 'b', 'c', 'url')]
+
+
+@pytest.mark.parametrize("resultados, preferida, esperado, llamadas_esperadas", [
+    ({'b': 'B', 'c': 'C'}, None, ('B', 'b', None), ['a', 'b']),
+    ({'b': 'B', 'c': 'C'}, 'c', ('C', 'c', True), ['c']),
+    ({'b': 'B'}, 'c', ('B', 'b', False), ['c', 'a', 'b']),
+    ({}, 'c', (None, None, False), ['c', 'a', 'b', 'url']),
+    ({}, None, (None, None, None), ['a', 'b', 'c', 'url']),
+    ({'b': 'B', 'url': 'U'}, 'url', ('B', 'b', None), ['a', 'b']),  # último recurso: se ignora
+    ({'b': 'B'}, 'inexistente', ('B', 'b', False), ['a', 'b']),
+])
+def test_en_cascada(resultados, preferida, esperado, llamadas_esperadas):
+    llamadas = []
+    assert en_cascada(_opciones(resultados, llamadas), preferida) == esperado
+    assert llamadas == llamadas_esperadas
+
+
+@pytest.fixture
+def perfiles(tmp_path):
+    return ExtractionProfiles(tmp_path / "perfiles.json", confirmaciones=3)
+
+
+def _registrar(perfiles, subtitulo, acierto=None, fecha=None):
+    perfiles.registrar(
+        URL,
+        {'subtitle': subtitulo, 'body': None, 'date': fecha},
+        {'subtitle': acierto, 'body': None, 'date': None},
+    )
+
+
+def test_se_aprende_tras_ganar_varias_veces_seguidas(perfiles):
+    _registrar(perfiles, 'h2')
+    _registrar(perfiles, 'h2')
+    assert perfiles.perfil(URL) == {}
+    _registrar(perfiles, 'h2')
+    assert perfiles.perfil(URL) == {'subtitle': 'h2'}
+
+
+def test_una_pagina_atipica_no_cambia_el_perfil(perfiles):
+    for _ in range(3):
+        _registrar(perfiles, 'h2')
+    # Una página sin h2: falla el perfil y gana h3 en la cascada
+    _registrar(perfiles, 'h3', acierto=False)
+    _registrar(perfiles, 'h2', acierto=True)
+    _registrar(perfiles, 'h3', acierto=False)
+    _registrar(perfiles, 'h3', acierto=False)
+    assert perfiles.perfil(URL) == {'subtitle': 'h2'}
+    # Si el perfil falla en varias noticias seguidas (el diario cambió), se reemplaza
+    _registrar(perfiles, 'h3', acierto=False)
+    assert perfiles.perfil(URL) == {'subtitle': 'h3'}
+
+
+def test_fuentes_de_ultimo_recurso_no_se_aprenden(perfiles):
+    for _ in range(5):
+        perfiles.registrar(URL, {'body': 'article', 'subtitle': None, 'date': 'url'},
+                           {'body': None, 'subtitle': None, 'date': None})
+    assert perfiles.perfil(URL) == {}
+
+
+def test_perfiles_persisten_y_cargan_formato_anterior(perfiles, tmp_path):
+    for _ in range(3):
+        _registrar(perfiles, 'h2', fecha='time')
+    _registrar(perfiles, 'p.lead', acierto=False)
+    perfiles.guardar()
+    otro = ExtractionProfiles(perfiles.path, confirmaciones=3)
+    assert otro.perfil(URL) == {'subtitle': 'h2', 'date': 'time'}
+    _registrar(otro, 'p.lead', acierto=False)
+    _registrar(otro, 'p.lead', acierto=False)
+    assert otro.perfil(URL)['subtitle'] == 'p.lead'
+
+    anterior = tmp_path / "anterior.json"
+    anterior.write_text(json.dumps({"www.diario.com.ar": {"subtitle": "h3", "date": "url"}}))
+    assert ExtractionProfiles(anterior).perfil(URL) == {'subtitle': 'h3'}
+
+
+def test_fecha_de_la_url_no_tapa_la_hora_del_json_ld():
+    html = ('<html><head><script type="application/ld+json">{"datePublished": "2025-03-04T15:42:00"}'
+            '</script></head><body><p>x</p></body></html>')
+    soup = BeautifulSoup(html, 'html.parser')
+    fecha, clave, _ = DateParser.extraer_con_perfil(soup, URL, 'url')
+    assert (fecha.hour, fecha.minute, clave) == (15, 42, 'json_ld')
@@ -0,0 +1,100 @@
+"""
+Paridad entre el recorrido en streaming de portadas (FrontPageScanner) y
+el árbol de html.parser.
+
+FrontPageScanner usa el parser interno de bs4 (BeautifulSoupHTMLParser):
+estos casos fallan si una versión de bs4 cambia esa interfaz.
+"""
+import pytest
+
+from app.extractors.article_finder import ArticleFinder
+from app.parsers.backend import crear_soup
+
+SOURCE_URL = "https://www.diario.com.ar/"
+
+PORTADAS = {
+    'selectores': """
+        <html><body>
+        <article class="news-article"><a href="/2025/03/nota-uno">Nota <b>uno</b></a></article>
+        <article class="card"><a href="/2025/03/nota-dos" title="Dos"><img src="x.jpg"></a>
+            <h2><a href="/2025/03/nota-dos">Titular dos</a></h2></article>
+        <div class="post-item extra"><a href="https://diario.com.ar/2025/03/nota-tres">Tres</a></div>
+        <li class="post"><a href="https://otro.com/2025/nota">Externa</a>
+            <a href="/category/politica">Categoría</a></li>
+        </body></html>
+    """,
+    'anidados_y_vacios': """
+        <div class="td_module_1"><article><a href="/nota/a">A</a>
+            <div class="nota"><a href="/nota/b">B</a></div></article></div>
+        <a href="/nota/c"><div class="article"><span>C</span></div></a>
+        <div><div class="news-item"></div><p><a href="/nota/d">D</a></p></div>
+        <article class="post"></article>
+    """,
+    'mal_formado': """
+        <div class="single_post"><a href="/nota/1">Uno <i>en cursiva</div>
+        <div class="single_post"><p><a href="/nota/2">Dos</p></a></span></div>
+        <li class="post"><a href="/nota/3">Tres<li class="post"><a href="/nota/4">Cuatro
+        <article><a href='/nota/5' >Cinco &amp; medio &ntilde; &#8220;x&#8221;</a>
+    """,
+    'textos_especiales': """
+        <article><a href="/nota/s">Visible<script>var oculto = 1;</script>
+            <style>.x{}</style><!-- comentario --> final</a></article>
+        <article><a href="/nota/t">Con <ruby>kanji<rp>(</rp><rt>k</rt><rp>)</rp></ruby></a></article>
+        <article><a href="/nota/u"><template>oculto</template>Plantilla<br>sigue</a></article>
+        <article><a href="/nota/v">  espacios
+            y saltos  </a><a href="/nota/v">repetida</a></article>
+    """,
+    'fallback_por_url': """
+        <div><a href="/noticia/1">Uno</a></div>
+        <div><a href="/noticia/2">Dos</a><a href="/noticia/2b">Dos b</a></div>
+        <li><a href="/nota/3">Tres</a></li>
+        <section><a href="/nota/4">Cuatro sin contenedor</a></section>
+        <article class="x"><p><a href="/2025/5">Cinco</a></p></article>
+    """,
+    'pocos_articulos': """
+        <article><a href="/nota/1">Uno</a></article>
+        <p><a href="/nota/2">Dos</a></p>
+    """,
+    'templates_y_fechas': """
+        <article><a href="/nota/{{slug}}">Template</a></article>
+        <article><a href="/2025/03/04/">Solo fecha</a></article>
+        <article><a href="/nota/ok">Ok</a></article>
+        <article><a href="/wp-content/x.pdf">PDF</a></article>
+    """,
+}
+
+
+def _con_arbol(finder: ArticleFinder, html: str) -> tuple[int, dict[str, str]]:
+    """Mismo resultado que enlaces_de_portada() construyendo el árbol."""
+    articles = finder.encontrar_articulos(crear_soup(html, 'html.parser'))
+    if not articles:
+        return 0, {}
+    return len(articles), finder.extraer_enlaces(articles, SOURCE_URL)
+
+
+@pytest.mark.parametrize("nombre", PORTADAS)
+def test_streaming_igual_al_arbol(nombre):
+    finder = ArticleFinder()
+    html = PORTADAS[nombre]
+
+    cantidad, enlaces = finder.enlaces_de_portada(html, SOURCE_URL)
+
+    assert (cantidad, enlaces) == _con_arbol(finder, html)
+    # El orden de las URLs también se respeta
+    assert list(enlaces) == list(_con_arbol(finder, html)[1])
+
+
+def test_casos_no_triviales():
+    """Los casos cubren lo que interesa comparar (no dan vacío por accidente)."""
+    finder = ArticleFinder()
+    cantidad, enlaces = finder.enlaces_de_portada(PORTADAS['selectores'], SOURCE_URL)
+    assert cantidad == 4
+    assert enlaces["https://www.diario.com.ar/2025/03/nota-dos"] == "Dos Titular dos"
+
+    _, enlaces = finder.enlaces_de_portada(PORTADAS['textos_especiales'], SOURCE_URL)
+    assert "oculto" not in " ".join(enlaces.values())
+
+    cantidad, _ = finder.enlaces_de_portada(PORTADAS['fallback_por_url'], SOURCE_URL)
+    assert cantidad > 1
+
+    assert finder.enlaces_de_portada(PORTADAS['pocos_articulos'], SOURCE_URL) == (0, {})
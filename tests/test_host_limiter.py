@@ -0,0 +1,176 @@
+"""
+Tests del limitador adaptativo por host (AIMD) y de su uso en las descargas.
+"""
+import asyncio
+import time
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from app.http.async_client import AsyncHTTPClient
+from app.http.host_limiter import AdaptiveHostLimiter
+from app.scrapers.pipeline import ScrapePipeline
+
+
+@pytest.fixture
+def limiter(tmp_path):
+    return AdaptiveHostLimiter(min_limit=1, max_limit=8, initial_limit=4, path=tmp_path / "limits.json")
+
+
+async def _request(limiter, host, status=200, error=None, neutral=False):
+    try:
+        async with limiter.slot(host) as medicion:
+            medicion['neutral'] = neutral
+            if error:
+                raise error
+            medicion['status'] = status
+    except Exception:
+        pass
+
+
+def test_respuestas_sanas_amplian_el_limite(limiter):
+    async def main():
+        for _ in range(4):
+            await _request(limiter, "h")
+    asyncio.run(main())
+    # +1/límite por respuesta: una ventana completa de 4 suma ~1
+    assert 4.8 < limiter.limites()["h"] < 5.0
+
+
+@pytest.mark.parametrize("kwargs", [{'status': 503}, {'status': 429}, {'error': asyncio.TimeoutError()}])
+def test_errores_recortan_el_limite(limiter, kwargs):
+    asyncio.run(_request(limiter, "h", **kwargs))
+    assert limiter.limites()["h"] == 2
+
+
+def test_un_solo_recorte_por_ventana(limiter):
+    async def main():
+        for _ in range(3):
+            await _request(limiter, "h", status=500)
+    asyncio.run(main())
+    assert limiter.limites()["h"] == 2
+
+
+def test_limites_minimo_y_maximo(tmp_path):
+    limiter = AdaptiveHostLimiter(min_limit=2, max_limit=3, initial_limit=3, path=tmp_path / "l.json")
+
+    async def main():
+        for _ in range(10):
+            await _request(limiter, "a")
+        await _request(limiter, "b", status=500)
+    asyncio.run(main())
+    assert limiter.limites() == {"a": 3, "b": 2}
+
+
+def test_fallas_neutrales_no_recortan(limiter):
+    asyncio.run(_request(limiter, "h", error=aiohttp.ServerDisconnectedError(), neutral=True))
+    assert limiter.limites()["h"] == 4
+
+
+def test_limites_persisten_entre_ejecuciones(limiter):
+    asyncio.run(_request(limiter, "h", status=500))
+    limiter.guardar()
+    otro = AdaptiveHostLimiter(min_limit=1, max_limit=8, initial_limit=4, path=limiter.path)
+    asyncio.run(_request(otro, "h"))
+    assert otro.limites()["h"] == pytest.approx(2.5)
+
+
+def test_reiniciar_permite_otro_event_loop(tmp_path):
+    limiter = AdaptiveHostLimiter(initial_limit=1, max_limit=1, path=tmp_path / "l.json")
+
+    async def ejecucion():
+        limiter.reiniciar()
+        await asyncio.gather(*[_request(limiter, "h") for _ in range(3)])
+
+    asyncio.run(ejecucion())
+    asyncio.run(ejecucion())
+    assert limiter.limites() == {"h": 1}
+
+
+# Un host lento (límite 1) y uno rápido servidos por el mismo servidor
+# local: 127.0.0.1:puerto y localhost:puerto son dos hosts distintos.
+
+DEMORA_LENTO = 0.3
+
+
+async def _servidor():
+    async def handler(request):
+        if request.host.startswith("127.0.0.1"):
+            await asyncio.sleep(DEMORA_LENTO)
+        return web.Response(text="<html></html>")
+
+    app = web.Application()
+    app.router.add_get("/{nota}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    puerto = runner.addresses[0][1]
+    return runner, f"http://127.0.0.1:{puerto}", f"http://localhost:{puerto}"
+
+
+def _cliente(tmp_path) -> AsyncHTTPClient:
+    cliente = AsyncHTTPClient()
+    cliente.response_cache = None
+    cliente.host_limiter = AdaptiveHostLimiter(initial_limit=4, max_limit=4, path=tmp_path / "l.json")
+    return cliente
+
+
+def test_host_lento_no_frena_al_rapido(tmp_path):
+    cliente = _cliente(tmp_path)
+
+    async def main():
+        runner, lento, rapido = await _servidor()
+        cliente.host_limiter._aprendidos = {lento.removeprefix("http://"): 1}
+        semaphore = asyncio.Semaphore(2)
+        inicio = time.monotonic()
+        terminadas = {}
+
+        async def bajar(url):
+            assert await cliente.fetch_bytes(session, url, semaphore) is not None
+            terminadas[url] = time.monotonic() - inicio
+
+        try:
+            async with aiohttp.ClientSession() as session:
+                await asyncio.gather(
+                    *[bajar(f"{lento}/{i}") for i in range(5)],
+                    *[bajar(f"{rapido}/{i}") for i in range(5)],
+                )
+        finally:
+            await runner.cleanup()
+        return terminadas, rapido
+
+    terminadas, rapido = asyncio.run(main())
+    rapidas = [t for url, t in terminadas.items() if url.startswith(rapido)]
+    lentas = [t for url, t in terminadas.items() if not url.startswith(rapido)]
+    # Las del host lento salen de a pocas; las del rápido no las esperan
+    assert max(lentas) >= 2 * DEMORA_LENTO
+    assert max(rapidas) < DEMORA_LENTO
+
+
+def test_pipeline_descarga_con_cola_por_host():
+    """Un worker esperando al host lento no frena las descargas del rápido."""
+    pipeline = ScrapePipeline.__new__(ScrapePipeline)
+    salidas = []
+
+    async def descargar(item):
+        host, _ = item
+        await asyncio.sleep(DEMORA_LENTO if host == "lento" else 0)
+        return item
+
+    async def main():
+        entrada, salida = asyncio.Queue(), asyncio.Queue()
+        for i in range(4):
+            entrada.put_nowait(("lento", i))
+        for i in range(4):
+            entrada.put_nowait(("rapido", i))
+        etapa = asyncio.create_task(pipeline._etapa_por_host(
+            'descargar', entrada, salida, descargar, lambda item: item[0], 1, 1,
+        ))
+        while len(salidas) < 4:
+            salidas.append(await salida.get())
+        etapa.cancel()
+
+    asyncio.run(asyncio.wait_for(main(), timeout=DEMORA_LENTO * 2))
+    assert [host for host, _ in salidas] == ["rapido"] * 4
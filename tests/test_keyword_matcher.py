@@ -0,0 +1,73 @@
+"""
+KeywordMatcher contra la búsqueda con `in` de cada keyword (la de antes).
+"""
+import random
+
+import pytest
+
+from app.utils import keyword_matcher
+from app.utils.keyword_matcher import KeywordMatcher
+from app.utils.text_utils import normalizar_busqueda
+
+KEYWORDS = ["Susana Laciar", "laciar", "Concepción", "CONCEPCION", "Rawson", "san juan",
+            "juan", "obra pública", "", "Ñandú", "AÑO"]
+
+TEXTOS = [
+    "La intendenta Susana Laciar recorrió la obra pública en Concepción.",
+    "SUSANA LACIAR Y EL INTENDENTE DE RAWSON",
+    "concepcion, Rawson y San Juan",
+    "sanjuanino",  # keywords dentro de palabras: también cuentan
+    "Un ñandú en la plaza; el año próximo",
+    "Nada que ver: fútbol y clima",
+    "",
+    "İstanbul, Ærø, straße y emojis 🎉 junto a Laciar",
+]
+
+
+def _textos_al_azar(n: int) -> list[str]:
+    """Textos armados con pedazos de keywords, tildes y mayúsculas al azar."""
+    rng = random.Random(0)
+    piezas = ["san", " ", "juan", "lacia", "r", "Laciar", "CONCEP", "ción", "cion", "ñan", "dú",
+              "obra", " pública", "raw", "son", "año", "x", "É", "\n"]
+    return ["".join(rng.choice(piezas) for _ in range(rng.randint(0, 30))) for _ in range(n)]
+
+
+@pytest.fixture(params=["ahocorasick", "str.find"])
+def matcher(request, monkeypatch):
+    if request.param == "str.find":
+        monkeypatch.setattr(keyword_matcher, 'ahocorasick', None)
+    elif keyword_matcher.ahocorasick is None:
+        pytest.skip("pyahocorasick no instalado")
+    matcher = KeywordMatcher(KEYWORDS)
+    assert matcher.backend == request.param
+    return matcher
+
+
+def _comparar_con_in(matcher: KeywordMatcher, texto: str):
+    normalizado = normalizar_busqueda(texto)
+    esperadas = [k for k in dict.fromkeys(normalizar_busqueda(k) for k in KEYWORDS if k) if k in normalizado]
+
+    assert matcher.contiene(texto) == bool(esperadas)
+    assert sorted(matcher.encontradas(texto)) == sorted(esperadas)
+
+    matches = matcher.buscar(texto)
+    assert all(normalizado[m.start:m.end] == m.keyword for m in matches)
+    assert matches == sorted(matches, key=lambda m: (m.start, m.end))
+    for keyword in esperadas:
+        apariciones = sum(normalizado.startswith(keyword, i) for i in range(len(normalizado)))
+        assert sum(m.keyword == keyword for m in matches) == apariciones
+
+
+@pytest.mark.parametrize("texto", TEXTOS)
+def test_igual_a_buscar_cada_keyword_con_in(matcher, texto):
+    _comparar_con_in(matcher, texto)
+
+
+def test_igual_a_buscar_con_in_en_textos_al_azar(matcher):
+    for texto in _textos_al_azar(300):
+        _comparar_con_in(matcher, texto)
+
+
+def test_keywords_normalizadas_sin_repetir(matcher):
+    assert matcher.keywords == ["susana laciar", "laciar", "concepcion", "rawson", "san juan",
+                                "juan", "obra publica", "nandu", "ano"]
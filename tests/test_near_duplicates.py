@@ -0,0 +1,45 @@
+"""
+Tests del agrupamiento de noticias casi idénticas.
+"""
+from app.models.noticia import Noticia
+from app.utils.near_duplicates import NearDuplicateIndex, agrupar_duplicados, simhash
+
+CUERPO = (
+    "El gobierno provincial anunció hoy la apertura de la licitación para la obra de "
+    "ampliación del hospital, que demandará una inversión de dos mil millones de pesos "
+    "y estará terminada a fines del año próximo según informó el ministerio de salud."
+)
+
+
+def _noticia(n: int, title: str, body: str) -> Noticia:
+    return Noticia(url=f"https://diario{n}.com.ar/nota", source=f"Diario {n}", title=title, body=body)
+
+
+def test_copias_de_una_gacetilla_en_un_cluster():
+    noticias = [
+        _noticia(1, "Licitan la ampliación del hospital", CUERPO),
+        _noticia(2, "Licitan la ampliación del hospital", CUERPO + " Fuente: prensa."),
+        _noticia(3, "Ganó el club local", "El equipo venció por dos a cero en el estadio " * 3),
+    ]
+    indice = agrupar_duplicados(noticias)
+
+    assert noticias[0].cluster_id == noticias[1].cluster_id
+    assert noticias[2].cluster_id != noticias[0].cluster_id
+    assert indice.duplicadas == 1
+
+
+def test_noticias_sin_texto_no_se_agrupan():
+    noticias = [
+        _noticia(1, "   ", "  \n "),
+        _noticia(2, " ", "—"),
+        _noticia(3, "Último momento", " "),
+        _noticia(4, "Último momento", "📷"),
+    ]
+    assert simhash(" ") == 0
+
+    indice = NearDuplicateIndex(min_palabras=5)
+    assert [indice.agregar(noticia) for noticia in noticias] == [None] * 4
+    assert all(noticia.cluster_id is None for noticia in noticias)
+    assert indice.clusters == {}
+    assert indice.sin_agrupar == 4
+    assert indice.duplicadas == 0
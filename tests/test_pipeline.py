@@ -0,0 +1,56 @@
+"""
+Tests de la etapa de guardado del pipeline (lotes por tamaño y por tiempo).
+"""
+import asyncio
+
+from app.scrapers.pipeline import _FIN, ScrapePipeline
+
+
+def _pipeline(batch_size: int, interval: float) -> tuple[ScrapePipeline, list]:
+    """Pipeline sin scraper, con un persist que anota cada lote."""
+    lotes = []
+
+    def persist(lote):
+        lotes.append(list(lote))
+        return {'insertadas': len(lote), 'duplicadas': 0, 'errores': 0}
+
+    pipeline = ScrapePipeline.__new__(ScrapePipeline)
+    pipeline.config = {'persist_batch_size': batch_size, 'persist_interval': interval}
+    pipeline.stats = {'insertadas': 0, 'duplicadas': 0, 'errores': 0}
+    pipeline.persist = persist
+    return pipeline, lotes
+
+
+def test_lotes_por_cantidad():
+    pipeline, lotes = _pipeline(batch_size=3, interval=60)
+
+    async def main():
+        entrada = asyncio.Queue()
+        for i in range(7):
+            entrada.put_nowait(i)
+        entrada.put_nowait(_FIN)
+        await pipeline._guardar(entrada)
+
+    asyncio.run(asyncio.wait_for(main(), timeout=5))
+    assert lotes == [[0, 1, 2], [3, 4, 5], [6]]
+    assert pipeline.stats['insertadas'] == 7
+
+
+def test_lote_incompleto_se_guarda_al_vencer_el_intervalo():
+    pipeline, lotes = _pipeline(batch_size=100, interval=0.05)
+
+    async def main():
+        entrada = asyncio.Queue()
+        guardar = asyncio.create_task(pipeline._guardar(entrada))
+        entrada.put_nowait(0)
+        entrada.put_nowait(1)
+        await asyncio.sleep(0.3)
+        # Se guardó sin esperar más noticias ni el fin del flujo
+        assert lotes == [[0, 1]]
+        entrada.put_nowait(2)
+        entrada.put_nowait(_FIN)
+        await guardar
+
+    asyncio.run(asyncio.wait_for(main(), timeout=5))
+    assert lotes == [[0, 1], [2]]
+    assert pipeline.stats['insertadas'] == 3
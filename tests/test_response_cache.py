@@ -0,0 +1,80 @@
+"""
+Tests de la cache HTTP (escrituras en lote, fuera del event loop).
+"""
+import asyncio
+import threading
+
+import aiohttp
+from aiohttp import web
+
+from app.http.async_client import AsyncHTTPClient
+from app.http.response_cache import ResponseCache
+
+
+def test_escrituras_en_lote_y_fuera_del_loop(tmp_path):
+    cache = ResponseCache(tmp_path / "http_cache.db", flush_every=2)
+    cache.abrir()
+    threads = []
+    escribir = cache._escribir
+
+    def escribir_anotando(*args):
+        threads.append(threading.get_ident())
+        escribir(*args)
+
+    cache._escribir = escribir_anotando
+
+    async def main():
+        cache.guardar("https://a/1", '"e1"', None, b"uno", "utf-8")
+        assert not cache.escritura_pendiente
+        # Lo pendiente ya se puede leer antes de escribirlo
+        assert await cache.obtener_async("https://a/1") == (b"uno", "utf-8")
+        cache.guardar("https://a/2", None, "Mon, 01 Jan 2024 00:00:00 GMT", b"dos", None)
+        cache.guardar("https://a/3", None, None, b"sin validadores", None)
+        assert cache.escritura_pendiente
+        await cache.flush_async()
+        assert not cache.escritura_pendiente
+        return threading.get_ident()
+
+    loop_thread = asyncio.run(main())
+    assert threads and loop_thread not in threads
+    assert cache.obtener("https://a/2") == (b"dos", None)
+    assert cache.obtener("https://a/3") is None
+    cache.cerrar()
+
+    cache = ResponseCache(tmp_path / "http_cache.db")
+    cache.abrir()
+    assert cache.headers_condicionales("https://a/1") == {'If-None-Match': '"e1"'}
+    assert cache.obtener("https://a/1") == (b"uno", "utf-8")
+    cache.cerrar()
+
+
+def test_304_reutiliza_el_cuerpo_guardado(tmp_path):
+    cliente = AsyncHTTPClient()
+    cliente.host_limiter = None
+    cliente.on_not_modified = 'cached_body'
+    cliente.response_cache = ResponseCache(tmp_path / "http_cache.db", flush_every=1)
+
+    async def handler(request):
+        if request.headers.get('If-None-Match') == '"v1"':
+            return web.Response(status=304)
+        return web.Response(body=b"<html>nota</html>", headers={'ETag': '"v1"'})
+
+    async def main():
+        app = web.Application()
+        app.router.add_get("/nota", handler)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        url = f"http://127.0.0.1:{runner.addresses[0][1]}/nota"
+        try:
+            async with cliente.sesion(4) as session:
+                primera = await cliente.fetch_bytes(session, url)
+                segunda = await cliente.fetch_bytes(session, url)
+        finally:
+            await runner.cleanup()
+        return primera, segunda
+
+    primera, segunda = asyncio.run(main())
+    assert primera.content == segunda.content == b"<html>nota</html>"
+    assert cliente.response_cache.stats['not_modified'] == 1
@@ -0,0 +1,163 @@
+"""
+Entrena y evalúa el clasificador local de relevancia.
+
+Uso:
+    python train_classifier.py                   # evaluar, entrenar y guardar
+    python train_classifier.py --solo-evaluar    # solo el reporte
+    python train_classifier.py --recall 0.99 --precision 0.95
+
+Datos: las noticias guardadas en news.db (con decisión de IA) y los
+ejemplos etiquetados de app/db/ai_cache.db por el modelo configurado,
+que incluyen las no relevantes (no los del simulador "fake/...", y se
+conservan aunque la cache se invalide).
+
+La evaluación usa validación cruzada: cada noticia se puntúa con un
+modelo que no la vio al entrenar. Con esos puntajes se eligen los
+umbrales (rechazo para el recall pedido, aceptación para la precisión
+pedida) y se reporta cuántas llamadas al LLM se evitarían.
+"""
+import argparse
+import random
+import sqlite3
+
+from app.db.database import DB_PATH
+from app.utils.ai_cache import cargar_ejemplos as cargar_ejemplos_ia
+from app.utils.local_classifier import (
+    CLASSIFIER_PATH, NaiveBayesClassifier, texto_clasificable,
+    umbral_para_precision, umbral_para_recall,
+)
+from config.ai_config import get_ai_config
+
+# Mínimo de ejemplos por clase para entrenar
+MIN_POR_CLASE = 10
+
+
+def cargar_ejemplos() -> tuple[list[str], list[bool]]:
+    """
+    Junta los ejemplos etiquetados de news.db y de la cache de IA (solo
+    los del modelo configurado).
+
+    Returns:
+        Tupla (textos, etiquetas)
+    """
+    ejemplos = {}  # texto -> etiqueta (sin repetir noticias)
+
+    if DB_PATH.exists():
+        conn = sqlite3.connect(str(DB_PATH))
+        for title, subtitle, body, decision in conn.execute(
+            "SELECT title, subtitle, body, ai_decision FROM news WHERE ai_decision IS NOT NULL"
+        ):
+            texto = texto_clasificable(title, subtitle, body)
+            ejemplos[texto] = bool(decision)
+        conn.close()
+
+    # La cache tiene la decisión del LLM para todo lo analizado (y pisa a news.db)
+    config = get_ai_config()
+    umbral = config.get('relevance_threshold', 0.6)
+    for title, subtitle, body, data in cargar_ejemplos_ia(config.get('model', 'llama-3.3-70b-versatile')):
+        decision = bool(data.get('is_relevant')) and (data.get('relevance_score') or 0) >= umbral
+        texto = texto_clasificable(title, subtitle, body)
+        ejemplos[texto] = decision
+
+    return list(ejemplos.keys()), list(ejemplos.values())
+
+
+def puntajes_validacion_cruzada(textos: list[str], etiquetas: list[bool], folds: int) -> list[float]:
+    """Puntaje de cada ejemplo con un modelo entrenado sin él (k-fold)."""
+    indices = list(range(len(textos)))
+    random.Random(0).shuffle(indices)
+    puntajes = [0.0] * len(textos)
+
+    for fold in range(folds):
+        prueba = set(indices[fold::folds])
+        entrenamiento = [i for i in indices if i not in prueba]
+        modelo = NaiveBayesClassifier()
+        modelo.entrenar([textos[i] for i in entrenamiento], [etiquetas[i] for i in entrenamiento])
+        for i in prueba:
+            puntajes[i] = modelo.puntaje(textos[i])
+    return puntajes
+
+
+def evaluar(puntajes: list[float], etiquetas: list[bool], recall: float, precision: float) -> dict:
+    """
+    Elige los umbrales y mide su efecto.
+
+    Returns:
+        Dict con umbrales, cantidades y recall/precisión obtenidos
+    """
+    relevantes = [p for p, e in zip(puntajes, etiquetas) if e]
+    umbral_rechazo = umbral_para_recall(relevantes, recall)
+    umbral_aceptacion = umbral_para_precision(list(zip(puntajes, etiquetas)), precision)
+
+    rechazadas = [e for p, e in zip(puntajes, etiquetas) if p < umbral_rechazo]
+    aceptadas = [e for p, e in zip(puntajes, etiquetas)
+                 if umbral_aceptacion is not None and p > umbral_aceptacion and p >= umbral_rechazo]
+    total = len(puntajes)
+
+    return {
+        'total': total,
+        'relevantes': len(relevantes),
+        'umbral_rechazo': umbral_rechazo,
+        'umbral_aceptacion': umbral_aceptacion,
+        'rechazadas': len(rechazadas),
+        'relevantes_perdidas': sum(rechazadas),
+        'recall': 1 - sum(rechazadas) / len(relevantes),
+        'aceptadas': len(aceptadas),
+        'precision_aceptadas': sum(aceptadas) / len(aceptadas) if aceptadas else None,
+    }
+
+
+def imprimir_reporte(m: dict, recall: float, precision: float):
+    """Imprime el reporte de evaluación."""
+    total = m['total']
+    print(f"📊 Evaluación (validación cruzada) sobre {total} noticias ({m['relevantes']} relevantes)")
+    print(f"   Recall objetivo: {recall:.2f} → umbral de rechazo {m['umbral_rechazo']:.2f}")
+    print(f"      Rechazadas sin LLM: {m['rechazadas']} ({m['rechazadas'] / total:.1%})")
+    print(f"      Relevantes perdidas: {m['relevantes_perdidas']} (recall obtenido {m['recall']:.3f})")
+    if m['umbral_aceptacion'] is None:
+        print(f"   Precisión objetivo: {precision:.2f} → ningún umbral la alcanza")
+    else:
+        print(f"   Precisión objetivo: {precision:.2f} → umbral de aceptación {m['umbral_aceptacion']:.2f}")
+        precision_txt = f"{m['precision_aceptadas']:.3f}" if m['precision_aceptadas'] is not None else "-"
+        print(f"      Aceptadas sin LLM: {m['aceptadas']} ({m['aceptadas'] / total:.1%}), precisión {precision_txt}")
+    print(f"   🤖 Llamadas al LLM evitadas:")
+    print(f"      Solo rechazo (auto_reject): {m['rechazadas'] / total:.1%}")
+    print(f"      Rechazo + aceptación (auto_accept): {(m['rechazadas'] + m['aceptadas']) / total:.1%}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--recall", type=float, default=0.98, help="Recall mínimo de las relevantes")
+    parser.add_argument("--precision", type=float, default=0.98, help="Precisión mínima de las aceptadas")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--solo-evaluar", action="store_true", help="No guardar el modelo")
+    args = parser.parse_args()
+
+    textos, etiquetas = cargar_ejemplos()
+    positivos = sum(etiquetas)
+    negativos = len(etiquetas) - positivos
+    print(f"Ejemplos: {len(textos)} ({positivos} relevantes, {negativos} no relevantes)")
+    if positivos < MIN_POR_CLASE or negativos < MIN_POR_CLASE:
+        raise SystemExit(
+            f"Se necesitan al menos {MIN_POR_CLASE} ejemplos de cada clase. "
+            f"Las no relevantes salen de la cache de IA: ejecutá main.py con AI_CONFIG['cache'] activo."
+        )
+
+    puntajes = puntajes_validacion_cruzada(textos, etiquetas, args.folds)
+    metricas = evaluar(puntajes, etiquetas, args.recall, args.precision)
+    imprimir_reporte(metricas, args.recall, args.precision)
+
+    if args.solo_evaluar:
+        return
+
+    modelo = NaiveBayesClassifier()
+    modelo.entrenar(textos, etiquetas)
+    modelo.umbral_rechazo = metricas['umbral_rechazo']
+    modelo.umbral_aceptacion = metricas['umbral_aceptacion']
+    modelo.metricas = {'recall_objetivo': args.recall, 'precision_objetivo': args.precision, **metricas}
+    modelo.guardar(CLASSIFIER_PATH)
+    print(f"✓ Modelo guardado en {CLASSIFIER_PATH}")
+
+
+if __name__ == "__main__":
+    main()